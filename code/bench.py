@@ -0,0 +1,657 @@
+# Les imports
+import os
+import sys
+import timeit
+import tempfile
+import subprocess
+import tracemalloc
+import numpy as np
+
+from mod import bateaux, index_placements, occupation, peut_placer_bateau, compter_placements, generer_grille_aleatoire, \
+    compter_placements_bateaux, generer_grilles_aleatoires, EchantillonneurUniforme, \
+    placer_bateau, findLambda, TiragesParLots, tirages_defaut, Grille, ConfigurationJeu
+from prob import Bataille, Joueur, CarteProbabilites, simuler_parties, estimation_de_la_distribution_parallele
+from journal import EcrivainJournal, Journal
+from sco import generate_grid, scorpion
+
+# Micro-benchmarks des chemins critiques (les tests de non-régression sont dans 'test_battleship.py').
+
+def peut_placer_bateau_naif(grille: np.array, indice_bateau: int, position: tuple[int, int], est_vertical: bool) -> bool:
+    """
+    Ancienne version de 'peut_placer_bateau' (parcours case par case avec vérification des bornes),
+    conservée comme référence pour mesurer le gain apporté par l'index des placements.
+    """
+    x, y = position
+    taille_bateau = bateaux[indice_bateau]
+
+    while taille_bateau > 0:
+        if not (0 <= x <= 9 and 0 <= y <= 9) or grille[x][y] != 0:
+            return False
+        if est_vertical:
+            x += 1
+        else:
+            y += 1
+        taille_bateau -= 1
+
+    return True
+
+def create_prob_naif(joueur: Joueur, shape: tuple[int, int], ensemble_positions: set[tuple[int, int]], ensemble_positions_bateaux: set[tuple[int, int]], coules: set[int] = frozenset()) -> np.array:
+    """
+    Ancienne version de 'Joueur.create_prob' (appels à 'update_prob' case par case, pour chaque bateau),
+    conservée comme référence pour vérifier et mesurer le noyau vectorisé.
+    """
+    prob = np.zeros(shape)
+    interdites = ensemble_positions - ensemble_positions_bateaux
+
+    for x in joueur.config.bateaux:
+        if x in coules:
+            continue
+        tmp = np.zeros(shape)
+        for i in range(shape[0]):
+            for j in range(shape[1]):
+                if (i, j) not in interdites:
+                    joueur.update_prob(tmp, x, (i, j), True, interdites)
+                    joueur.update_prob(tmp, x, (i, j), False, interdites)
+        prob += tmp
+
+    for x, y in ensemble_positions:
+        prob[x, y] = 0
+
+    return prob
+
+class BatailleNaive(Bataille):
+    """
+    Ancienne version de 'Bataille.victoire' (comparaison de toute la grille à une grille vide après chaque coup),
+    conservée comme référence pour mesurer le gain apporté par les compteurs de cases restantes.
+    """
+    def victoire(self) -> bool:
+        return np.array_equal(self.grille, np.zeros((10, 10)))
+
+def debit(fonction, nombre: int, duree_min: float = 0.2, repetitions: int = 5) -> float:
+    """
+    Retourne le nombre d'appels par seconde de 'fonction' (médiane de 'repetitions' répétitions). Comme
+    'timeit.Timer.autorange', le nombre d'appels par répétition part de 'nombre' et est doublé jusqu'à ce
+    qu'une répétition dure au moins 'duree_min' secondes, pour que les mesures courtes ne soient pas
+    dominées par le bruit de l'horloge et de l'ordonnanceur.
+    """
+    minuteur = timeit.Timer(fonction)
+    while minuteur.timeit(nombre) < duree_min:
+        nombre *= 2
+
+    return nombre / float(np.median(minuteur.repeat(repeat=repetitions, number=nombre)))
+
+def bench_placements(nombre: int = 20000) -> dict[str, float]:
+    """
+    Mesure le nombre de vérifications de placement par seconde, avant et après l'index des placements.
+
+    Quatre mesures sont effectuées sur une grille aléatoire complète, en parcourant les 200 couples
+    (position, direction) d'un porte-avions :
+    - 'naif' : l'ancienne vérification case par case ;
+    - 'peut_placer_bateau' : la version indexée, appelée sur un tableau NumPy (cases précalculées, sans test de bornes) ;
+    - 'masque' : le test 'masque & occupation' seul, tel qu'utilisé dans les boucles de comptage ;
+    - 'compter_placements' : le comptage complet, ramené au nombre de placements vérifiés.
+
+    Returns
+    -------
+    dict[str, float]
+        Le nombre de vérifications par seconde pour chaque variante.
+    """
+    grille = generer_grille_aleatoire()
+    cles = [(x, y, v) for x in range(10) for y in range(10) for v in (False, True)]
+    index = index_placements(grille.shape, bateaux[5])
+    occupees = occupation(grille)
+
+    def naif():
+        for x, y, v in cles:
+            peut_placer_bateau_naif(grille, 5, (x, y), v)
+
+    def indexe():
+        for x, y, v in cles:
+            peut_placer_bateau(grille, 5, (x, y), v)
+
+    def masque():
+        for cle in cles:
+            placement = index.get(cle)
+            placement is not None and not placement[0] & occupees
+
+    tours = max(1, nombre // len(cles))
+    return {
+        'naif': debit(naif, tours) * len(cles),
+        'peut_placer_bateau': debit(indexe, tours) * len(cles),
+        'masque': debit(masque, tours) * len(cles),
+        'compter_placements': debit(lambda: compter_placements(5, grille), tours) * len(cles),
+    }
+
+def bench_compter_placements_bateaux() -> dict[str, float]:
+    """
+    Mesure le temps (en secondes) du comptage exact de la flotte complète.
+    """
+    debut = timeit.default_timer()
+    total = compter_placements_bateaux(list(bateaux))
+    return {'flotte_complete': timeit.default_timer() - debut, 'nombre_grilles': total}
+
+def bench_generer_grilles(tailles: tuple[int, ...] = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6), graine: int = 0) -> dict[int, float]:
+    """
+    Mesure le nombre de grilles générées par seconde par 'generer_grilles_aleatoires', pour chaque taille de lot,
+    et par 'generer_grille_aleatoire' (clé 1) comme référence.
+
+    Returns
+    -------
+    dict[int, float]
+        Le nombre de grilles par seconde pour chaque taille de lot.
+    """
+    rng = np.random.default_rng(graine)
+    resultat = {1: debit(generer_grille_aleatoire, 200)}
+
+    for n in tailles:
+        debut = timeit.default_timer()
+        generer_grilles_aleatoires(n, rng)
+        resultat[n] = n / (timeit.default_timer() - debut)
+
+    return resultat
+
+def bench_echantillonneur(n: int = 10 ** 5, graine: int = 0) -> dict[str, float]:
+    """
+    Mesure le coût de construction des tables de 'EchantillonneurUniforme' (en secondes)
+    et le nombre de configurations uniformes tirées par seconde dans un tableau préalloué.
+    """
+    debut = timeit.default_timer()
+    echantillonneur = EchantillonneurUniforme()
+    construction = timeit.default_timer() - debut
+
+    sortie = np.empty((n, 10, 10), dtype=np.int8)
+    debut = timeit.default_timer()
+    echantillonneur.tirer(n, np.random.default_rng(graine), sortie)
+
+    return {'construction': construction, 'tirages_par_seconde': n / (timeit.default_timer() - debut)}
+
+def memoire_par_grille(construire, n: int) -> float:
+    """
+    Retourne la mémoire (en octets) occupée par grille lorsque 'construire(n)' stocke n grilles.
+    """
+    tracemalloc.start()
+    grilles = construire(n)
+    memoire = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del grilles
+    return memoire / n
+
+def bench_grille(n: int = 10 ** 5, graine: int = 0) -> dict[str, dict[str, float]]:
+    """
+    Compare la 'Grille' compacte aux tableaux NumPy float64 (représentation historique) et int8.
+
+    La mémoire est mesurée en stockant n grilles aléatoires indépendantes (une liste d'objets, comme dans
+    les simulations), puis ramenée à un million de grilles. Les opérations mesurées sont celles d'une partie :
+    lecture et écriture d'une case, copie et test de victoire.
+
+    Returns
+    -------
+    dict[str, dict[str, float]]
+        Pour chaque représentation, les mégaoctets par million de grilles et le nombre d'opérations par seconde.
+    """
+    lots = generer_grilles_aleatoires(n, np.random.default_rng(graine))
+    constructeurs = {
+        'float64': lambda n: [grille.astype(np.float64) for grille in lots[:n]],
+        'int8': lambda n: [grille.copy() for grille in lots[:n]],
+        'Grille': lambda n: [Grille.depuis_tableau(grille) for grille in lots[:n]],
+    }
+
+    resultat = {}
+    for nom, construire in constructeurs.items():
+        grille = construire(1)[0]
+        vide = Grille() if nom == 'Grille' else np.zeros((10, 10), dtype=grille.dtype)
+
+        def ecriture():
+            grille[3, 4] = grille[3, 4]
+
+        resultat[nom] = {
+            'Mo_par_million': memoire_par_grille(construire, n) * 10 ** 6 / 2 ** 20,
+            'lecture': debit(lambda: grille[3, 4], 100000),
+            'ecriture': debit(ecriture, 100000),
+            'copie': debit(grille.copy, 100000),
+            'victoire': debit(lambda: occupation(vide) == 0, 100000),
+        }
+
+    return resultat
+
+def bench_parties(nombres: dict[str, int] = None, graine: int = 0) -> dict[str, dict[str, float]]:
+    """
+    Mesure le nombre de parties jouées par seconde par chaque stratégie de 'Joueur', avec l'ancienne
+    victoire ('BatailleNaive') puis avec les compteurs tenus à jour par 'Bataille.joue'.
+
+    Les deux versions jouent exactement les mêmes parties (même générateur, même graine) ; le nombre total de coups est vérifié.
+
+    Parameters
+    ----------
+    nombres : dict[str, int], optional
+        Le nombre de parties jouées pour chaque stratégie.
+    graine : int, optional
+        La graine du générateur des parties.
+
+    Returns
+    -------
+    dict[str, dict[str, float]]
+        Pour chaque stratégie, le nombre de parties par seconde de chaque version.
+    """
+    nombres = nombres or {'jouer_alea': 2000, 'jouer_heuristique': 2000, 'jouer_probabiliste_simple': 20}
+    joueur = Joueur()
+    resultat = {}
+
+    for strategie, nombre in nombres.items():
+        resultat[strategie] = {}
+        coups = {}
+        for nom, classe in (('naif', BatailleNaive), ('compteurs', Bataille)):
+            tirages = TiragesParLots(np.random.default_rng(graine))
+            parties = [classe(rng=tirages) for _ in range(nombre)]
+
+            debut = timeit.default_timer()
+            coups[nom] = sum(getattr(joueur, strategie)(partie) for partie in parties)
+            resultat[strategie][nom] = nombre / (timeit.default_timer() - debut)
+
+        assert coups['naif'] == coups['compteurs'], f"{strategie} : les deux versions ne jouent pas les mêmes parties"
+
+    return resultat
+
+def bench_carte_probabilites(nombre: int = 20, graine: int = 0, config: ConfigurationJeu = ConfigurationJeu()) -> dict[str, float]:
+    """
+    Mesure 'CarteProbabilites' : des parties de 'jouer_probabiliste_simple' sont rejouées en calculant, avant
+    chaque coup, la carte incrémentale et celle de 'create_prob'. Retourne le temps (en secondes) passé par
+    partie dans chacune des deux méthodes.
+    """
+    tirages_defaut.initialiser(graine)
+    joueur = Joueur(config)
+    temps = {'create_prob': 0.0, 'incrementale': 0.0}
+
+    for _ in range(nombre):
+        b = Bataille(config=config)
+        ensemble_positions, ensemble_positions_bateaux, touches = set(), set(), {}
+        carte = CarteProbabilites(config, b.grille.shape)
+
+        while not b.victoire():
+            coules = {bateau for bateau, cases in touches.items() if len(cases) == config.taille(bateau)}
+
+            debut = timeit.default_timer()
+            prob = carte.mettre_a_jour(ensemble_positions, ensemble_positions_bateaux, coules)
+            milieu = timeit.default_timer()
+            joueur.create_prob(b.grille.shape, ensemble_positions, ensemble_positions_bateaux, coules)
+            temps['incrementale'] += milieu - debut
+            temps['create_prob'] += timeit.default_timer() - milieu
+
+            x, y = joueur.select_max_prob(prob)
+            i = b.joue((x, y))
+            if i and not joueur.enregistrer_touche(i, (x, y), ensemble_positions_bateaux, touches):
+                joueur.shoot_probabiliste(b, prob, ensemble_positions, ensemble_positions_bateaux, (x, y), i.bateau, touches)
+            ensemble_positions.add((x, y))
+
+    return {nom: duree / nombre for nom, duree in temps.items()}
+def bench_create_prob(cotes: tuple[int, ...] = (10, 20, 50), graine: int = 0) -> dict[int, dict[str, float]]:
+    """
+    Mesure la durée (en secondes) d'un appel à 'create_prob' et à sa référence 'create_prob_naif'
+    sur des grilles carrées de côtés croissants, dont un quart des cases ont été jouées.
+    """
+    rng = np.random.default_rng(graine)
+    resultat = {}
+
+    for cote in cotes:
+        joueur = Joueur(ConfigurationJeu((cote, cote)))
+        jouees = rng.random((cote, cote)) < 0.25
+        ensemble_positions = {(int(i), int(j)) for i, j in np.argwhere(jouees)}
+        ensemble_positions_bateaux = set(list(ensemble_positions)[::5])
+        arguments = ((cote, cote), ensemble_positions, ensemble_positions_bateaux)
+
+        resultat[cote] = {
+            'naif': 1 / debit(lambda: create_prob_naif(joueur, *arguments), 1),
+            'vectorise': 1 / debit(lambda: joueur.create_prob(*arguments), 20),
+        }
+
+    return resultat
+
+def bench_monte_carlo(nombre: int = 10, nb_echantillons: int = 10000, graine: int = 0) -> dict[str, float]:
+    """
+    Mesure la stratégie 'jouer_monte_carlo' : nombre moyen de coups par partie et temps moyen par coup
+    (en secondes), pour 'nb_echantillons' configurations tirées avant chaque coup.
+    """
+    tirages_defaut.initialiser(graine)
+    rng = np.random.default_rng(graine)
+    joueur = Joueur()
+    parties = [Bataille() for _ in range(nombre)]
+
+    debut = timeit.default_timer()
+    coups = sum(joueur.jouer_monte_carlo(partie, nb_echantillons, rng=rng) for partie in parties)
+
+    return {'coups_par_partie': coups / nombre, 'temps_par_coup': (timeit.default_timer() - debut) / coups}
+
+def bench_exact(nombre: int = 20, graine: int = 0, config: ConfigurationJeu = ConfigurationJeu((8, 8), (2, 3, 3, 4))) -> dict[str, float]:
+    """
+    Mesure la stratégie 'jouer_exact' sur 'nombre' parties : nombre moyen de coups, temps moyen par coup
+    (en secondes) et taux de succès de la table de transposition, qui se remplit au fil des parties.
+    """
+    tirages_defaut.initialiser(graine)
+    joueur = Joueur(config)
+    parties = [Bataille(config=config) for _ in range(nombre)]
+
+    debut = timeit.default_timer()
+    coups = sum(joueur.jouer_exact(partie) for partie in parties)
+
+    return {'coups_par_partie': coups / nombre, 'temps_par_coup': (timeit.default_timer() - debut) / coups,
+            'taux_succes': joueur.table.taux_succes()}
+
+def bench_simulation_lot(nombre: int = 1000, nombre_lot: int = 100000, graine: int = 0) -> dict[str, dict[str, float]]:
+    """
+    Mesure le débit (parties/s) des stratégies 'jouer_alea' et 'jouer_heuristique' jouées une à une
+    ('scalaire') et par le simulateur par lots ('lot').
+    """
+    tirages_defaut.initialiser(graine)
+    rng = np.random.default_rng(graine)
+    joueur = Joueur()
+    partie = Bataille()
+    resultats = {}
+
+    for strategie, jouer in (('alea', joueur.jouer_alea), ('heuristique', joueur.jouer_heuristique)):
+        debut = timeit.default_timer()
+        for _ in range(nombre):
+            jouer(partie)
+            partie.reset()
+        scalaire = nombre / (timeit.default_timer() - debut)
+
+        debut = timeit.default_timer()
+        simuler_parties(nombre_lot, strategie, rng)
+        resultats[strategie] = {'scalaire': scalaire, 'lot': nombre_lot / (timeit.default_timer() - debut)}
+
+    return resultats
+
+def bench_estimation_parallele(nombre: int = 1000000, graine: int = 0, taille_bloc: int = 50000) -> dict[int, float]:
+    """
+    Mesure le débit (parties/s) de 'estimation_de_la_distribution_parallele' avec le simulateur par lots
+    ('heuristique'), sur un processus puis sur tous les cœurs de la machine.
+    """
+    resultats = {}
+    for nb_processus in sorted({1, os.cpu_count() or 1}):
+        debut = timeit.default_timer()
+        estimation_de_la_distribution_parallele(nombre, 'heuristique', graine, nb_processus, taille_bloc)
+        resultats[nb_processus] = nombre / (timeit.default_timer() - debut)
+
+    return resultats
+
+def bench_journal(nombre: int = 1000000, graine: int = 0) -> dict[str, float]:
+    """
+    Mesure le débit d'écriture (parties/s) d'un journal de 'nombre' parties jouées par le simulateur par lots
+    ('heuristique', coups tirés au hasard), sa taille par partie (octets), et la durée (en secondes) des requêtes
+    sur le fichier projeté : histogramme, premiers coups touchants et comparaison des stratégies.
+    """
+    rng = np.random.default_rng(graine)
+    nb_coups = simuler_parties(1000, 'heuristique', rng)
+    parties = [(rng.integers(0, 100, size=5).tolist(), [divmod(int(case), 10) for case in rng.permutation(100)[:n]])
+               for n in nb_coups]
+
+    resultats = {}
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, 'parties.bin')
+        debut = timeit.default_timer()
+        with EcrivainJournal(chemin) as ecrivain:
+            for i in range(nombre):
+                ecrivain.ecrire(*parties[i % len(parties)], strategie=('a', 'b')[i % 2])
+        resultats['ecriture'] = nombre / (timeit.default_timer() - debut)
+        resultats['octets_par_partie'] = os.path.getsize(chemin) / nombre
+
+        journal = Journal(chemin)
+        resultats['distribution'] = latence(journal.distribution, 1)
+        resultats['premiers_touches'] = latence(journal.premiers_touches, 1)
+        resultats['comparer_strategies'] = latence(journal.comparer_strategies, 1)
+        del journal
+
+    return resultats
+
+def temps_import(module: str) -> tuple[float, set[str]]:
+    """
+    Mesure le temps d'import à froid (en secondes) de 'module' par python -X importtime, dans un nouveau
+    processus (comme le menu ou un processus du pool de 'estimation_de_la_distribution_parallele'), et
+    retourne aussi les noms des modules chargés.
+    """
+    sortie = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True).stderr
+
+    # Lignes "import time: propre | cumulé | module", en microsecondes ; le module importé n'est pas indenté
+    lignes = [ligne.split('|') for ligne in sortie.splitlines() if ligne.startswith('import time:') and ligne.count('|') == 2]
+    charges = {nom.strip() for _, _, nom in lignes}
+    cumul = next(int(duree) for _, duree, nom in lignes if nom.strip() == module and not nom.startswith('  '))
+
+    return cumul / 1e6, charges
+
+def bench_temps_import(modules: tuple[str, ...] = ('main', 'prob', 'sco')) -> dict[str, float]:
+    """
+    Mesure le temps d'import à froid (en secondes) de chaque module ('temps_import').
+    """
+    return {module: temps_import(module)[0] for module in modules}
+# Suite de référence : une mesure par chemin critique, graines fixes, sortie JSON et comparaison à une
+# référence enregistrée. Lancement : python bench.py [--rapide] [--json FICHIER] [--reference FICHIER] [--seuil S]
+# ('python bench.py --complet' affiche en plus les comparaisons avant / après).
+
+def latence(fonction, nombre: int, duree_min: float = 0.2, repetitions: int = 5) -> float:
+    """
+    Retourne la durée (en secondes) d'un appel à 'fonction' (médiane des répétitions de 'debit').
+    """
+    return 1 / debit(fonction, nombre, duree_min, repetitions)
+
+def parties_par_seconde(jouer, nombre: int, config: ConfigurationJeu = ConfigurationJeu(), duree_min: float = 0.2) -> float:
+    """
+    Retourne le nombre de parties jouées par seconde par la stratégie 'jouer', par lots de 'nombre' grilles
+    générées à l'avance (la génération n'est pas mesurée), jusqu'à au moins 'duree_min' secondes de jeu.
+    """
+    jouees, duree = 0, 0.0
+    while duree < duree_min:
+        parties = [Bataille(config=config) for _ in range(nombre)]
+        debut = timeit.default_timer()
+        for partie in parties:
+            jouer(partie)
+        duree += timeit.default_timer() - debut
+        jouees += nombre
+
+    return jouees / duree
+
+def suite_benchmarks(rapide: bool = False, graine: int = 0, seulement: set[str] = None) -> dict[str, dict]:
+    """
+    Mesure chaque chemin critique du projet. Les générateurs ('tirages_defaut' et les générateurs NumPy
+    passés explicitement) sont réinitialisés par 'graine' avant chaque mesure.
+
+    Parameters
+    ----------
+    rapide : bool, optional
+        Réduit la taille des mesures (chaque répétition dure toutefois au moins 0,2 s, voir 'debit') et omet les
+        mesures les plus longues (flotte complète, grille 50x50).
+    graine : int, optional
+        La graine des générateurs aléatoires.
+    seulement : set[str], optional
+        Les noms des mesures à faire. Par défaut, toutes.
+
+    Returns
+    -------
+    dict[str, dict]
+        Pour chaque mesure, sa valeur, son unité et son sens ('haut' si une valeur plus grande est meilleure,
+        'bas' sinon).
+    """
+    echelle = 0.2 if rapide else 1.0
+    nombre = lambda n: max(1, int(n * echelle))
+    mesures = {}
+
+    def mesurer(nom: str, unite: str, sens: str, calcul) -> None:
+        if seulement is not None and nom not in seulement:
+            return
+        tirages_defaut.initialiser(graine)
+        mesures[nom] = {'valeur': float(calcul()), 'unite': unite, 'sens': sens}
+
+    # Placements (la grille, dont dépend la durée des comptages, est la même d'une exécution à l'autre)
+    tirages_defaut.initialiser(graine)
+    grille = generer_grille_aleatoire()
+    cles = [(x, y, v) for x in range(10) for y in range(10) for v in (False, True)]
+    for nom, plateau in (('tableau', grille), ('compacte', Grille.depuis_tableau(grille))):
+        mesurer(f'peut_placer_bateau.{nom}', 'appels/s', 'haut',
+                lambda: debit(lambda: [peut_placer_bateau(plateau, 5, (x, y), v) for x, y, v in cles], nombre(100)) * len(cles))
+    mesurer('placer_bateau', 'appels/s', 'haut', lambda: debit(lambda: placer_bateau(np.zeros((10, 10)), 5, (2, 3), True), nombre(20000)))
+
+    # Comptages
+    for indice in bateaux:
+        mesurer(f'compter_placements.{indice}', 's', 'bas', lambda: latence(lambda: compter_placements(indice, grille), nombre(2000)))
+    for k in range(1, len(bateaux) + (0 if rapide else 1)):
+        liste = list(bateaux)[:k]
+        mesurer(f'compter_placements_bateaux.{k}', 's', 'bas', lambda: latence(lambda: compter_placements_bateaux(liste), 1))
+
+    # Génération de grilles et lambda
+    mesurer('generer_grille_aleatoire', 'grilles/s', 'haut', lambda: debit(generer_grille_aleatoire, nombre(5000)))
+    mesurer('generer_grille_aleatoire.compacte', 'grilles/s', 'haut', lambda: debit(lambda: generer_grille_aleatoire(compacte=True), nombre(5000)))
+    mesurer('generer_grilles_aleatoires', 'grilles/s', 'haut',
+            lambda: debit(lambda: generer_grilles_aleatoires(10 ** 5, np.random.default_rng(graine)), 1) * 10 ** 5)
+    mesurer('findLambda', 's', 'bas', lambda: latence(lambda: findLambda(10 ** 6), 1))
+
+    # Stratégies (parties par seconde)
+    joueur = Joueur()
+    petite = ConfigurationJeu((8, 8), (2, 3, 3, 4))
+    strategies = {
+        'jouer_alea': (joueur.jouer_alea, 1000, ConfigurationJeu()),
+        'jouer_heuristique': (joueur.jouer_heuristique, 1000, ConfigurationJeu()),
+        'jouer_probabiliste_simple': (joueur.jouer_probabiliste_simple, 100, ConfigurationJeu()),
+        'jouer_monte_carlo': (lambda b: joueur.jouer_monte_carlo(b, 1000, rng=np.random.default_rng(graine)), 5, ConfigurationJeu()),
+        'jouer_exact.8x8': (Joueur(petite).jouer_exact, 10, petite),
+    }
+    for nom, (jouer, n, config) in strategies.items():
+        mesurer(f'{nom}', 'parties/s', 'haut', lambda: parties_par_seconde(jouer, nombre(n), config))
+    for strategie in ('alea', 'heuristique'):
+        mesurer(f'simuler_parties.{strategie}', 'parties/s', 'haut',
+                lambda: nombre(50000) / latence(lambda: simuler_parties(nombre(50000), strategie, np.random.default_rng(graine)), 1))
+
+    # Carte de probabilités : un quart des cases jouées
+    rng = np.random.default_rng(graine)
+    jouees = {(int(i), int(j)) for i, j in np.argwhere(rng.random((10, 10)) < 0.25)}
+    touchees = set(list(jouees)[::5])
+    mesurer('create_prob', 's', 'bas', lambda: latence(lambda: joueur.create_prob((10, 10), jouees, touchees), nombre(2000)))
+
+    # Scorpion : une recherche complète, à plusieurs tailles de grille. Sa durée varie beaucoup d'une grille à
+    # l'autre : les tirages sont réinitialisés avant chaque recherche, pour que toutes les répétitions mesurent la même
+    def recherche(cote: int) -> int:
+        tirages_defaut.initialiser(graine)
+        return scorpion(generate_grid(cote))
+
+    for cote in (10, 20) if rapide else (10, 20, 50):
+        mesurer(f'scorpion.{cote}x{cote}', 's', 'bas', lambda: latence(lambda: recherche(cote), max(1, nombre(100) // cote)))
+
+    return mesures
+
+def comparer(mesures: dict[str, dict], reference: dict[str, dict], seuil: float = 0.2) -> list[str]:
+    """
+    Compare des mesures à une référence et retourne les noms des mesures en régression, c'est-à-dire
+    dégradées de plus de 'seuil' (en proportion) dans leur sens. Les mesures absentes de l'une ou l'autre
+    sont ignorées.
+    """
+    regressions = []
+    for nom, mesure in mesures.items():
+        if nom not in reference:
+            continue
+        rapport = mesure['valeur'] / reference[nom]['valeur']
+        if (mesure['sens'] == 'haut' and rapport < 1 - seuil) or (mesure['sens'] == 'bas' and rapport > 1 + seuil):
+            regressions.append(nom)
+
+    return regressions
+
+def rapport_complet() -> None:
+    """
+    Affiche les comparaisons avant / après de chaque optimisation.
+    """
+    for nom, valeur in bench_placements().items():
+        print(f"{nom:<20} : {valeur:>14,.0f} vérifications/s")
+
+    resultat = bench_compter_placements_bateaux()
+    print(f"{'flotte complète':<20} : {resultat['nombre_grilles']:,} grilles en {resultat['flotte_complete']:.2f} s")
+
+    for n, valeur in bench_generer_grilles().items():
+        print(f"{'grilles (n = ' + str(n) + ')':<20} : {valeur:>14,.0f} grilles/s")
+
+    resultat = bench_echantillonneur()
+    print(f"{'tirage uniforme':<20} : {resultat['tirages_par_seconde']:>14,.0f} grilles/s (tables : {resultat['construction']:.2f} s)")
+
+    for nom, mesures in bench_grille().items():
+        print(f"{'grille ' + nom:<20} : {mesures['Mo_par_million']:>10,.0f} Mo / million de grilles, "
+              + ", ".join(f"{operation} {valeur:,.0f}/s" for operation, valeur in mesures.items() if operation != 'Mo_par_million'))
+
+    for strategie, mesures in bench_parties().items():
+        print(f"{strategie:<26} : {mesures['naif']:>10,.1f} -> {mesures['compteurs']:>10,.1f} parties/s")
+
+    resultat = bench_carte_probabilites()
+    print(f"{'carte (par partie)':<20} : create_prob {resultat['create_prob'] * 1000:.1f} ms -> incrémentale {resultat['incrementale'] * 1000:.2f} ms")
+
+    for cote, mesures in bench_create_prob().items():
+        print(f"{'create_prob ' + str(cote) + 'x' + str(cote):<20} : {mesures['naif'] * 1000:>10.2f} ms -> {mesures['vectorise'] * 1000:.3f} ms")
+
+    resultat = bench_monte_carlo()
+    print(f"{'monte-carlo (10k)':<20} : {resultat['coups_par_partie']:.1f} coups/partie, {resultat['temps_par_coup'] * 1000:.1f} ms/coup")
+
+    resultat = bench_exact()
+    print(f"{'exact (8x8)':<20} : {resultat['coups_par_partie']:.1f} coups/partie, {resultat['temps_par_coup'] * 1000:.1f} ms/coup, "
+          f"table {resultat['taux_succes']:.0%} de succès")
+
+    for strategie, mesures in bench_simulation_lot().items():
+        print(f"{'lot ' + strategie:<20} : {mesures['scalaire']:>10,.0f} -> {mesures['lot']:>10,.0f} parties/s")
+
+    for nb_processus, valeur in bench_estimation_parallele().items():
+        print(f"{'parallèle (' + str(nb_processus) + ' proc.)':<20} : {valeur:>14,.0f} parties/s")
+
+    resultat = bench_journal()
+    print(f"{'journal (écriture)':<20} : {resultat['ecriture']:>14,.0f} parties/s, {resultat['octets_par_partie']:.0f} octets/partie")
+    print(f"{'journal (requêtes)':<20} : histogramme {resultat['distribution'] * 1000:.0f} ms, premiers touchés "
+          f"{resultat['premiers_touches']:.2f} s, comparaison {resultat['comparer_strategies']:.2f} s")
+
+    for module, duree in bench_temps_import().items():
+        print(f"{'import ' + module:<20} : {duree * 1000:>10.0f} ms")
+
+if __name__ == "__main__":
+    import json
+    import platform
+    import argparse
+    import contextlib
+
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de la bataille navale.")
+    parser.add_argument('--rapide', action='store_true', help="moins de répétitions, sans les mesures les plus longues")
+    parser.add_argument('--graine', type=int, default=0, help="graine des générateurs aléatoires")
+    parser.add_argument('--json', metavar='FICHIER', help="enregistre les mesures au format JSON ('-' pour la sortie standard)")
+    parser.add_argument('--reference', metavar='FICHIER', help="fichier JSON de référence : échec en cas de régression")
+    parser.add_argument('--seuil', type=float, default=0.2, help="dégradation tolérée par rapport à la référence (0.2 = 20 %%)")
+    parser.add_argument('--complet', action='store_true', help="affiche aussi les comparaisons avant / après")
+    arguments = parser.parse_args()
+    sortie = sys.stderr if arguments.json == '-' else sys.stdout  # La sortie standard est alors réservée au JSON
+
+    if arguments.complet:
+        with contextlib.redirect_stdout(sortie):
+            rapport_complet()
+
+    mesures = suite_benchmarks(arguments.rapide, arguments.graine)
+    reference = None
+    if arguments.reference:
+        with open(arguments.reference) as fichier:
+            reference = json.load(fichier)['mesures']
+
+    for nom, mesure in mesures.items():
+        ligne = f"{nom:<36} : {mesure['valeur']:>14.6g} {mesure['unite']:<10}"
+        if reference and nom in reference:
+            ligne += f" ({mesure['valeur'] / reference[nom]['valeur']:>6.2f} x la référence)"
+        print(ligne, file=sortie)
+
+    if arguments.json:
+        document = {
+            'meta': {'python': platform.python_version(), 'numpy': np.__version__, 'machine': platform.machine(),
+                     'processeurs': os.cpu_count(), 'graine': arguments.graine, 'rapide': arguments.rapide},
+            'mesures': mesures,
+        }
+        if arguments.json == '-':
+            json.dump(document, sys.stdout, indent=2)
+        else:
+            with open(arguments.json, 'w') as fichier:
+                json.dump(document, fichier, indent=2)
+
+    if reference:
+        # Une régression n'est retenue que si elle se confirme à deux nouvelles mesures
+        regressions = comparer(mesures, reference, arguments.seuil)
+        for _ in range(2):
+            if regressions:
+                regressions = comparer(suite_benchmarks(arguments.rapide, arguments.graine, set(regressions)), reference, arguments.seuil)
+        if regressions:
+            print(f"Régressions (au-delà de {arguments.seuil:.0%}) : {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
@@ -0,0 +1,42 @@
+# Les imports
+import numpy as np
+import matplotlib.pyplot as plt
+
+# Tracés. Ce module est le seul à importer matplotlib, dont le chargement coûte à lui seul l'essentiel
+# du temps de démarrage : 'mod', 'prob' et 'sco' ne l'importent qu'au premier tracé demandé.
+
+def afficher_grille(grille: np.array):
+    """
+    Affiche la grille de jeu avec des couleurs pour différencier les cases vides et les bateaux.
+
+    Parameters
+    ----------
+    grille : np.array
+        Un tableau 2D représentant la grille de jeu, où les valeurs non nulles représentent les bateaux 
+        et les 0 représentent les cases vides.
+    """
+    plt.figure(figsize=(6, 6))  # Définir la taille de la figure
+    plt.imshow(grille, cmap='ocean', interpolation='nearest')  # Choisir un colormap pour représenter la mer et les bateaux
+    plt.colorbar(label="Indice du bateau")  # Ajouter une barre de couleurs pour identifier les bateaux
+    plt.title("Grille de jeu")  # Ajouter un titre
+    plt.grid(False)  # Désactiver la grille
+    plt.show()  # Afficher la grille
+
+def afficher_distribution(res: dict[int, int], N: int, grandeur: str = "nombre de coups joués") -> None:
+    """
+    Affiche l'histogramme d'une distribution sur N simulations.
+
+    Parameters
+    ----------
+    res : dict[int, int]
+        Un dictionnaire associant à chaque valeur sa fréquence d'apparition.
+    N : int
+        Le nombre de simulations.
+    grandeur : str, optional
+        Le nom de la grandeur mesurée, pour l'axe et le titre.
+    """
+    plt.bar(res.keys(), res.values(), color='blue')
+    plt.xlabel(grandeur[0].upper() + grandeur[1:])
+    plt.ylabel('Fréquence')
+    plt.title(f'Distribution du {grandeur} sur {N} simulations')
+    plt.show()
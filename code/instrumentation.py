@@ -0,0 +1,186 @@
+# Les imports
+import json
+import time
+import pstats
+import cProfile
+import tracemalloc
+from collections import Counter
+
+import prob
+from prob import Bataille, Joueur, CarteProbabilites
+from mod import EchantillonneurConditionnel
+
+# Instrumentation des stratégies, à la demande. Rien n'est modifié tant qu'elle n'est pas utilisée : les méthodes
+# mesurées ne sont remplacées par des versions chronométrées que le temps d'une partie jouée par
+# 'Instrumentation.jouer' (sur les instances du joueur et de la partie, et sur les classes ou le module 'prob'
+# pour les objets créés pendant la partie), puis restaurées. Hors instrumentation, le coût est donc nul.
+
+# Méthodes chronométrées, par cible
+PHASES_JOUEUR = ('create_prob', 'select_max_prob', 'shoot_probabiliste', 'shout', 'update_prob', 'enregistrer_touche')
+PHASES_BATAILLE = ('victoire', 'joue')
+PHASES_CLASSES = {CarteProbabilites: ('mettre_a_jour',), EchantillonneurConditionnel: ('frequences',)}
+PHASES_MODULE = ('probabilites_exactes',)
+
+# Phases de ciblage : un coup joué pendant l'une d'elles est compté en ciblage, sinon en chasse
+PHASES_CIBLAGE = ('shout', 'shoot_probabiliste')
+
+class Instrumentation:
+    """
+    Mesures agrégées sur des parties jouées une à une : durée cumulée et nombre d'appels de chaque phase,
+    coups de chasse et de ciblage, et, si 'memoire' est vrai, pic de mémoire et nombre de blocs retenus
+    par partie (tracemalloc, qui ralentit nettement l'exécution).
+
+    Les blocs retenus sont ceux alloués pendant la partie et encore vivants à sa fin (caches remplis, objets
+    conservés) : les allocations temporaires libérées en cours de partie n'y figurent pas, tracemalloc ne
+    gardant que les blocs vivants ; le pic de mémoire en rend compte. Les caches étant remplis par la
+    première partie, c'est elle qui retient le plus de blocs.
+
+    Les durées sont inclusives : le temps de 'joue' appelé depuis 'shout' est compté dans les deux phases.
+    """
+
+    # Attributs
+    memoire: bool
+    durees: Counter
+    appels: Counter
+    coups: Counter
+    parties: list[dict]
+
+    # Constructeur
+    def __init__(self, memoire: bool = False) -> None:
+        self.memoire = memoire
+        self.durees = Counter()
+        self.appels = Counter()
+        self.coups = Counter()
+        self.parties = []
+        self._ciblage = 0  # Profondeur d'imbrication des phases de ciblage en cours
+
+    # Méthodes
+    def _chronometrer(self, nom: str, fonction):
+        """
+        Retourne une version de 'fonction' qui cumule sa durée et son nombre d'appels sous le nom 'nom'.
+        """
+        ciblage = nom in PHASES_CIBLAGE
+
+        def chronometree(*args, **kwargs):
+            if nom == 'joue':
+                self.coups['ciblage' if self._ciblage else 'chasse'] += 1
+            self._ciblage += ciblage
+            debut = time.perf_counter()
+            try:
+                return fonction(*args, **kwargs)
+            finally:
+                self.durees[nom] += time.perf_counter() - debut
+                self.appels[nom] += 1
+                self._ciblage -= ciblage
+
+        return chronometree
+
+    def jouer(self, strategie, b: Bataille) -> int:
+        """
+        Joue une partie avec la stratégie 'strategie' (une méthode d'un 'Joueur', par exemple
+        'joueur.jouer_probabiliste_simple') en mesurant chaque phase, et retourne le nombre de coups.
+        """
+        joueur: Joueur = strategie.__self__
+        remplacees = []  # (objet, attribut, valeur d'origine ou None si l'attribut venait de la classe)
+
+        def remplacer(objet, attribut: str) -> None:
+            remplacees.append((objet, attribut, vars(objet).get(attribut)))
+            setattr(objet, attribut, self._chronometrer(attribut, getattr(objet, attribut)))
+
+        for attribut in PHASES_JOUEUR:
+            remplacer(joueur, attribut)
+        for attribut in PHASES_BATAILLE:
+            remplacer(b, attribut)
+        for classe, attributs in PHASES_CLASSES.items():
+            for attribut in attributs:
+                remplacer(classe, attribut)
+        for attribut in PHASES_MODULE:
+            remplacer(prob, attribut)
+        strategie = getattr(joueur, strategie.__name__)
+
+        if self.memoire:
+            tracemalloc.start()
+        debut = time.perf_counter()
+        try:
+            coups = strategie(b)
+        finally:
+            duree = time.perf_counter() - debut
+            for objet, attribut, origine in reversed(remplacees):
+                if origine is None:
+                    delattr(objet, attribut)
+                else:
+                    setattr(objet, attribut, origine)
+
+        partie = {'strategie': strategie.__name__, 'coups': coups, 'duree': duree}
+        if self.memoire:
+            partie['pic_memoire'] = tracemalloc.get_traced_memory()[1]  # Avant l'instantané, qui n'y compte pas
+            apres = tracemalloc.take_snapshot()
+            partie['blocs_retenus'] = sum(stat.count for stat in apres.statistics('filename'))  # Tracés depuis 'start'
+            tracemalloc.stop()
+        self.parties.append(partie)
+
+        return coups
+
+    def resume(self) -> dict:
+        """
+        Retourne les mesures agrégées : nombre de parties, coups moyens, coups de chasse et de ciblage, et
+        pour chaque phase le nombre d'appels, la durée totale, la durée par appel et la part du temps de jeu.
+        """
+        n = len(self.parties)
+        temps_total = sum(partie['duree'] for partie in self.parties)
+        resume = {
+            'parties': n,
+            'coups_par_partie': sum(partie['coups'] for partie in self.parties) / n if n else 0.0,
+            'duree_par_partie': temps_total / n if n else 0.0,
+            'coups': dict(self.coups),
+            'phases': {
+                nom: {'appels': self.appels[nom], 'duree': duree, 'duree_par_appel': duree / self.appels[nom],
+                      'part': duree / temps_total if temps_total else 0.0}
+                for nom, duree in self.durees.most_common()
+            },
+        }
+        if self.memoire and n:
+            resume['pic_memoire_max'] = max(partie['pic_memoire'] for partie in self.parties)
+            resume['blocs_retenus_par_partie'] = sum(partie['blocs_retenus'] for partie in self.parties) / n
+
+        return resume
+
+    def exporter_json(self, chemin: str, parties: bool = False) -> None:
+        """
+        Enregistre le résumé au format JSON, avec le détail de chaque partie si 'parties' est vrai.
+        """
+        document = self.resume()
+        if parties:
+            document['detail'] = self.parties
+        with open(chemin, 'w') as fichier:
+            json.dump(document, fichier, indent=2)
+
+def profiler_partie(strategie, b: Bataille, sortie: str = None, lignes: int = 25) -> pstats.Stats:
+    """
+    Joue une partie sous cProfile et affiche les 'lignes' fonctions les plus coûteuses (temps cumulé).
+
+    Parameters
+    ----------
+    strategie : Bataille -> int
+        La stratégie à profiler (par exemple 'joueur.jouer_probabiliste_simple').
+    b : Bataille
+        La partie à jouer.
+    sortie : str, optional
+        Un fichier où enregistrer le profil brut (lisible par pstats ou snakeviz).
+    lignes : int, optional
+        Le nombre de fonctions affichées.
+
+    Returns
+    -------
+    pstats.Stats
+        Les statistiques du profil.
+    """
+    profil = cProfile.Profile()
+    profil.runcall(strategie, b)
+    if sortie is not None:
+        profil.dump_stats(sortie)
+
+    statistiques = pstats.Stats(profil)
+    statistiques.sort_stats('cumulative').print_stats(lignes)
+
+    return statistiques
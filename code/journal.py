@@ -0,0 +1,334 @@
+# Les imports
+import json
+import numpy as np
+
+from mod import ConfigurationJeu, tableau_placements, identifiants_placements
+
+# Journal binaire des parties simulées. Un fichier commence par un en-tête de taille fixe (signature, puis la
+# configuration et les noms des stratégies en JSON, complété par des espaces), suivi d'enregistrements de taille
+# fixe, un par partie :
+#   - 'strategie' : uint8, indice de la stratégie dans la liste de l'en-tête ;
+#   - 'placements' : uint16 par bateau, l'identifiant du placement (indice dans 'tableau_placements') ;
+#   - 'nb_coups' : uint16, le nombre de coups joués ;
+#   - 'coups' : une case par coup (x * colonnes + y), uint8 si la grille a au plus 255 cases (uint16 sinon),
+#     complété par la valeur maximale du type (voir 'aucun_coup'). Le nombre de coups d'une partie est borné par
+#     'max_coups' (enregistré dans l'en-tête) : par défaut, le nombre de cases plus un quart ('max_coups_defaut'),
+#     car le ciblage de 'jouer_heuristique' peut rejouer une case déjà jouée. Sur un million de parties de
+#     'jouer_heuristique' (10x10), la plus longue compte environ 105 coups, et 0,25 % des parties dépassent 100 coups.
+# Pour la grille 10x10 et la flotte standard, une partie occupe 138 octets. Les issues des coups (manqué, touché,
+# coulé) ne sont pas stockées : la flotte et les coups les déterminent, et 'Journal.etats' les recalcule.
+# Le fichier se relit par 'np.memmap' sans copie ni décodage : chaque champ est une vue sur le fichier.
+
+SIGNATURE = b'BATAILLE'
+TAILLE_ENTETE = 4096
+VERSION = 1
+
+def max_coups_defaut(config: ConfigurationJeu) -> int:
+    """
+    Retourne le nombre maximal de coups d'une partie par défaut : le nombre de cases, plus un quart pour les
+    cases rejouées par le ciblage.
+    """
+    cases = config.forme[0] * config.forme[1]
+    return cases + cases // 4
+
+def type_enregistrement(config: ConfigurationJeu, max_coups: int = None) -> np.dtype:
+    """
+    Retourne le type NumPy (structuré, sans alignement) d'un enregistrement pour la configuration donnée,
+    avec de la place pour 'max_coups' coups (par défaut, 'max_coups_defaut(config)').
+    """
+    cases = config.forme[0] * config.forme[1]
+    max_coups = max_coups or max_coups_defaut(config)
+
+    return np.dtype([
+        ('strategie', np.uint8),
+        ('placements', np.uint16, (len(config.tailles),)),
+        ('nb_coups', np.uint16),
+        ('coups', np.uint8 if cases <= 255 else np.uint16, (max_coups,)),
+    ])
+
+def aucun_coup(config: ConfigurationJeu) -> int:
+    """
+    Retourne la valeur de remplissage des coups non joués.
+    """
+    return np.iinfo(type_enregistrement(config)['coups'].base).max
+
+class EcrivainJournal:
+    """
+    Écriture d'un journal de parties, en flux : les enregistrements sont accumulés dans un tampon NumPy de
+    'taille_tampon' parties, écrit d'un bloc dans le fichier lorsqu'il est plein. L'en-tête (qui contient les
+    noms des stratégies rencontrées) est réécrit à la fermeture ; s'utilise de préférence avec 'with'.
+
+    Attributes
+    ----------
+    config : ConfigurationJeu
+        La configuration des parties enregistrées.
+    strategies : list[str]
+        Les noms des stratégies, dans l'ordre de leurs indices.
+    nb_parties : int
+        Le nombre de parties enregistrées.
+    max_coups : int
+        Le nombre maximal de coups d'une partie.
+    """
+
+    # Attributs
+    config: ConfigurationJeu
+    strategies: list[str]
+    nb_parties: int
+    max_coups: int
+
+    # Constructeur
+    def __init__(self, chemin: str, config: ConfigurationJeu = ConfigurationJeu(), taille_tampon: int = 1 << 14, max_coups: int = None) -> None:
+        self.config = config
+        self.max_coups = max_coups or max_coups_defaut(config)
+        self.strategies = []
+        self.nb_parties = 0
+        self._indices = {}  # Nom de stratégie -> indice
+        self._colonnes = config.forme[1]
+        self._tampon = np.zeros(taille_tampon, dtype=type_enregistrement(config, self.max_coups))
+        self._tampon['coups'] = aucun_coup(config)
+        self._remplis = 0
+        self._fichier = open(chemin, 'wb')
+        self._ecrire_entete()
+
+    # Méthodes
+    def ecrire(self, placements: list[int], coups: list[tuple[int, int]], strategie: str = '') -> None:
+        """
+        Enregistre une partie.
+
+        Parameters
+        ----------
+        placements : list[int]
+            L'identifiant du placement de chaque bateau (voir 'identifiants_placements').
+        coups : list[tuple[int, int]]
+            Les cases jouées, dans l'ordre.
+        strategie : str, optional
+            Le nom de la stratégie qui a joué la partie.
+        """
+        if len(coups) > self.max_coups:
+            raise ValueError(f"Partie de {len(coups)} coups : le journal en accepte au plus {self.max_coups}.")
+        if strategie not in self._indices:
+            if len(self.strategies) == 256:
+                raise ValueError("Un journal contient au plus 256 stratégies.")
+            self._indices[strategie] = len(self.strategies)
+            self.strategies.append(strategie)
+
+        enregistrement = self._tampon[self._remplis]
+        enregistrement['strategie'] = self._indices[strategie]
+        enregistrement['placements'] = placements
+        enregistrement['nb_coups'] = len(coups)
+        enregistrement['coups'][:len(coups)] = [x * self._colonnes + y for x, y in coups]
+
+        self._remplis += 1
+        self.nb_parties += 1
+        if self._remplis == len(self._tampon):
+            self.vider()
+
+    def ecrire_partie(self, grille: np.array, coups: list[tuple[int, int]], strategie: str = '') -> None:
+        """
+        Enregistre une partie à partir de sa grille initiale (avant le premier coup).
+        """
+        self.ecrire(identifiants_placements(grille, self.config), coups, strategie)
+
+    def vider(self) -> None:
+        """
+        Écrit le contenu du tampon dans le fichier, puis le remet à zéro.
+        """
+        if self._remplis:
+            self._fichier.write(self._tampon[:self._remplis].tobytes())
+            self._tampon[:self._remplis] = 0
+            self._tampon['coups'][:self._remplis] = aucun_coup(self.config)
+            self._remplis = 0
+
+    def fermer(self) -> None:
+        """
+        Vide le tampon, réécrit l'en-tête et ferme le fichier.
+        """
+        if self._fichier.closed:
+            return
+        self.vider()
+        self._fichier.seek(0)
+        self._ecrire_entete()
+        self._fichier.close()
+
+    def _ecrire_entete(self) -> None:
+        entete = json.dumps({'version': VERSION, 'forme': list(self.config.forme), 'tailles': list(self.config.tailles),
+                             'max_coups': self.max_coups, 'strategies': self.strategies, 'nb_parties': self.nb_parties}).encode()
+        if len(SIGNATURE) + len(entete) > TAILLE_ENTETE:
+            raise ValueError("En-tête du journal trop long (noms de stratégies).")
+        self._fichier.write(SIGNATURE + entete.ljust(TAILLE_ENTETE - len(SIGNATURE)))
+
+    def __enter__(self) -> 'EcrivainJournal':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+class Journal:
+    """
+    Lecture d'un journal de parties par 'np.memmap' : les champs ('strategies_parties', 'placements',
+    'nb_coups', 'coups') sont des vues sur le fichier, et les requêtes sont vectorisées sur tout le journal.
+    Un enregistrement incomplet en fin de fichier (écriture interrompue) est ignoré.
+
+    Attributes
+    ----------
+    config : ConfigurationJeu
+        La configuration des parties enregistrées.
+    strategies : list[str]
+        Les noms des stratégies, dans l'ordre de leurs indices.
+    enregistrements : np.memmap
+        Les enregistrements, un par partie.
+    """
+
+    # Attributs
+    config: ConfigurationJeu
+    strategies: list[str]
+    enregistrements: np.memmap
+
+    # Constructeur
+    def __init__(self, chemin: str) -> None:
+        with open(chemin, 'rb') as fichier:
+            entete = fichier.read(TAILLE_ENTETE)
+            fichier.seek(0, 2)
+            taille = fichier.tell()
+
+        if not entete.startswith(SIGNATURE):
+            raise ValueError(f"'{chemin}' n'est pas un journal de parties.")
+        description = json.loads(entete[len(SIGNATURE):])
+        if description['version'] != VERSION:
+            raise ValueError(f"Version de journal non prise en charge : {description['version']}.")
+
+        self.config = ConfigurationJeu(tuple(description['forme']), tuple(description['tailles']))
+        self.strategies = description['strategies']
+
+        type_ = type_enregistrement(self.config, description['max_coups'])
+        nombre = (taille - TAILLE_ENTETE) // type_.itemsize
+        self.enregistrements = np.memmap(chemin, dtype=type_, mode='r', offset=TAILLE_ENTETE, shape=(nombre,)) \
+            if nombre else np.zeros(0, dtype=type_)
+
+    # Champs (vues sans copie)
+    def __len__(self) -> int:
+        return len(self.enregistrements)
+
+    @property
+    def strategies_parties(self) -> np.array:
+        return self.enregistrements['strategie']
+
+    @property
+    def placements(self) -> np.array:
+        return self.enregistrements['placements']
+
+    @property
+    def nb_coups(self) -> np.array:
+        return self.enregistrements['nb_coups']
+
+    @property
+    def coups(self) -> np.array:
+        return self.enregistrements['coups']
+
+    # Requêtes
+    def selection(self, strategie: str = None) -> np.array:
+        """
+        Retourne le masque des parties jouées par la stratégie 'strategie' (toutes si 'None').
+        """
+        if strategie is None:
+            return np.ones(len(self), dtype=bool)
+        if strategie not in self.strategies:
+            return np.zeros(len(self), dtype=bool)
+        return self.strategies_parties == self.strategies.index(strategie)
+
+    def distribution(self, strategie: str = None) -> dict[int, int]:
+        """
+        Retourne l'histogramme du nombre de coups joués (nombre de coups -> fréquence), au format
+        de 'estimation_de_la_distribution'.
+        """
+        frequences = np.bincount(self.nb_coups[self.selection(strategie)])
+        return {int(c): int(f) for c, f in enumerate(frequences) if f}
+
+    def comparer_strategies(self) -> dict[str, dict[str, float]]:
+        """
+        Retourne, pour chaque stratégie du journal, le nombre de parties, la moyenne et l'écart-type du nombre
+        de coups joués, ainsi que la moyenne du coup du premier bateau touché.
+        """
+        premiers = self.premiers_touches()
+        resultats = {}
+
+        for indice, nom in enumerate(self.strategies):
+            masque = self.strategies_parties == indice
+            coups = self.nb_coups[masque].astype(np.float64)
+            if len(coups):
+                resultats[nom] = {'parties': len(coups), 'moyenne': float(coups.mean()), 'ecart_type': float(coups.std()),
+                                  'premier_touche': float(premiers[masque].mean())}
+
+        return resultats
+
+    def premiers_touches(self, taille_bloc: int = 1 << 16) -> np.array:
+        """
+        Retourne, pour chaque partie, le numéro (à partir de 1) du premier coup qui touche un bateau.
+        """
+        resultat = np.empty(len(self), dtype=np.int64)
+
+        for debut in range(0, len(self), taille_bloc):
+            # Un coup rejoué ne peut pas être le premier à toucher : les répétitions n'ont pas à être détectées
+            touches = self._bateaux_touches(debut, debut + taille_bloc, repetitions=False) > 0
+            resultat[debut:debut + taille_bloc] = touches.argmax(axis=1) + 1
+
+        return resultat
+
+    def etats(self, debut: int = 0, fin: int = None) -> np.array:
+        """
+        Retourne l'issue de chaque coup des parties 'debut' à 'fin' : MANQUE (0), TOUCHE (1) ou COULE (2),
+        et -1 au-delà du dernier coup de la partie.
+
+        Returns
+        -------
+        np.array
+            Un tableau d'entiers 8 bits de forme (parties, max_coups).
+        """
+        bateaux_touches = self._bateaux_touches(debut, fin)
+        etats = (bateaux_touches > 0).astype(np.int8)
+
+        # Un coup coule un bateau quand il en touche la dernière case intacte
+        for indice_bateau, taille in self.config.bateaux.items():
+            sur_bateau = bateaux_touches == indice_bateau
+            etats[sur_bateau & (np.cumsum(sur_bateau, axis=1) == taille)] = 2
+
+        etats[self._joues(debut, fin) == 0] = -1
+
+        return etats
+
+    def _joues(self, debut: int, fin: int) -> np.array:
+        """
+        Masque des coups joués (forme (parties, max_coups)) des parties 'debut' à 'fin'.
+        """
+        return np.arange(self.coups.shape[1]) < self.nb_coups[debut:fin, None]
+
+    def _bateaux_touches(self, debut: int, fin: int, repetitions: bool = True) -> np.array:
+        """
+        Indice du bateau touché par chaque coup (0 si manqué ou non joué) des parties 'debut' à 'fin',
+        en reconstituant les grilles à partir des placements. Avec 'repetitions=False', un coup rejoué sur une
+        case touchée est compté comme touché.
+        """
+        placements = self.placements[debut:fin]
+        cases = self.config.forme[0] * self.config.forme[1]
+        grilles = np.zeros((len(placements), cases), dtype=np.int8)
+        lignes = np.arange(len(placements))[:, None]
+
+        for k, (indice_bateau, taille) in enumerate(self.config.bateaux.items()):
+            grilles[lignes, tableau_placements(self.config.forme, taille)[placements[:, k]]] = indice_bateau
+
+        joues = self._joues(debut, fin)
+        coups = np.where(joues, self.coups[debut:fin], 0).astype(np.intp)
+        touches = np.where(joues, np.take_along_axis(grilles, coups, axis=1), 0)
+        if not repetitions:
+            return touches
+
+        # Un coup rejoué sur une case déjà jouée est manqué, comme dans 'Bataille.joue' : après un tri stable
+        # des cases de chaque partie, les répétitions suivent leur première occurrence
+        ordre = np.argsort(coups, axis=1, kind='stable')
+        tries = np.take_along_axis(coups, ordre, axis=1)
+        repetes = np.zeros(coups.shape, dtype=bool)
+        np.put_along_axis(repetes, ordre[:, 1:], tries[:, 1:] == tries[:, :-1], axis=1)
+
+        touches[repetes] = 0
+
+        return touches
@@ -38,10 +38,19 @@ def option_2():
                     except ValueError as e:
                         print(e)
             print(f"Liste : {liste}")
+            processus = int(input("Nombre de processus (1 pour un calcul séquentiel) : "))
+            if processus < 1:
+                raise ValueError
             break
         except ValueError:
             print("Erreur : Veuillez entrer un entier valide.")
-    print("Valeur de retour : ", compter_placements_bateaux(liste))
+
+    if processus == 1:
+        print("Valeur de retour : ", compter_placements_bateaux(liste))
+    else:
+        total, durees = compter_placements_bateaux_parallele(liste, nb_processus=processus)
+        print("Valeur de retour : ", total)
+        print("Durée de chaque morceau (s) : ", [round(d, 3) for d in durees])
 
 def option_3():
     # Récupérer un entier
@@ -138,5 +147,46 @@ def main():
             print("Option invalide. Le programme va se fermer.")
             sys.exit()
 
+def analyser(arguments):
+    # Profil (cProfile) d'une partie représentative, ou instrumentation de plusieurs parties
+    from instrumentation import Instrumentation, profiler_partie
+
+    rng = np.random.default_rng(arguments.graine)  # Grilles et coups aléatoires de toutes les parties analysées
+    j = Joueur()
+    strategie = getattr(j, arguments.strategie)
+
+    if arguments.profil:
+        profiler_partie(strategie, Bataille(rng=rng), arguments.sortie)
+        return
+
+    instrumentation = Instrumentation(memoire=arguments.memoire)
+    b = Bataille(rng=rng)
+    for _ in range(arguments.parties):
+        instrumentation.jouer(strategie, b)
+        b.reset()
+
+    resume = instrumentation.resume()
+    print(f"{resume['parties']} parties, {resume['coups_par_partie']:.1f} coups/partie, {resume['duree_par_partie'] * 1000:.2f} ms/partie, "
+          f"coups : {resume['coups']}")
+    for nom, phase in resume['phases'].items():
+        print(f"{nom:<22} : {phase['appels']:>8} appels, {phase['duree_par_appel'] * 1e6:>10.1f} µs/appel, {phase['part']:>6.1%} du temps")
+    if arguments.memoire:
+        print(f"Mémoire : pic {resume['pic_memoire_max'] / 1024:.0f} Kio, {resume['blocs_retenus_par_partie']:.0f} blocs retenus par partie")
+    if arguments.sortie:
+        instrumentation.exporter_json(arguments.sortie)
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        import argparse
+
+        parser = argparse.ArgumentParser(description="Bataille navale : menu interactif, ou analyse des performances d'une stratégie.")
+        parser.add_argument('strategie', choices=['jouer_alea', 'jouer_heuristique', 'jouer_probabiliste_simple', 'jouer_monte_carlo', 'jouer_exact'],
+                            help="la stratégie du joueur à analyser")
+        parser.add_argument('--profil', action='store_true', help="profile une partie avec cProfile (sinon : instrumentation par phase)")
+        parser.add_argument('--parties', type=int, default=100, help="nombre de parties instrumentées")
+        parser.add_argument('--memoire', action='store_true', help="mesure aussi les allocations (tracemalloc, plus lent)")
+        parser.add_argument('--graine', type=int, default=0, help="graine du générateur des parties")
+        parser.add_argument('--sortie', help="fichier du profil brut (--profil) ou du résumé JSON (instrumentation)")
+        analyser(parser.parse_args())
+    else:
+        main()
@@ -1,16 +1,264 @@
 # Les imports
-import random
+import os
+import math
+import time
 import numpy as np
-import matplotlib.pyplot as plt
-from functools import reduce
+from fractions import Fraction
+from statistics import NormalDist
+from typing import NamedTuple
+from collections import Counter, OrderedDict
+from functools import reduce, lru_cache
+from concurrent.futures import ProcessPoolExecutor
 
 # Variables globales
 bateaux: dict[int, int] = {1:2, 2:3, 3:3, 4:4, 5:5}
 bateaux_inv = {val: key for key, val in bateaux.items()}
 
+# Configuration d'une partie
+
+class ConfigurationJeu(NamedTuple):
+    """
+    Configuration d'une partie : les dimensions de la grille et les tailles des bateaux de la flotte.
+
+    Les bateaux sont numérotés à partir de 1 dans l'ordre de 'tailles' ; la configuration par défaut reproduit
+    la grille 10x10 et le dictionnaire global 'bateaux'. Une configuration est immuable et hachable : les tables
+    qui en dépendent (index des placements, codage du profil, carte de probabilités de la grille vide, ...)
+    sont construites au premier appel puis mises en cache, si bien que passer à une grille 20x20 ou 50x50
+    ne coûte qu'une fois.
+
+    Lorsqu'une fonction reçoit une grille et une configuration, les dimensions sont celles de la grille
+    et seule la flotte est lue dans la configuration.
+    """
+    forme: tuple[int, int] = (10, 10)
+    tailles: tuple[int, ...] = tuple(bateaux.values())
+
+    @property
+    def bateaux(self) -> dict[int, int]:
+        """
+        Le dictionnaire indice -> taille de la flotte, au format de la variable globale 'bateaux'.
+        """
+        return dict(enumerate(self.tailles, start=1))
+
+    def taille(self, indice_bateau: int) -> int:
+        """
+        Retourne la taille du bateau d'indice 'indice_bateau'.
+        """
+        return self.tailles[indice_bateau - 1]
+
+    def tailles_bateaux(self, indices: list[int]) -> tuple[int, ...]:
+        """
+        Retourne les tailles des bateaux dont les indices sont donnés.
+        """
+        return tuple(self.tailles[i - 1] for i in indices)
+
+    def placements(self, indice_bateau: int) -> dict:
+        """
+        Retourne l'index des placements du bateau sur la grille de la configuration (voir 'index_placements').
+        """
+        return index_placements(self.forme, self.taille(indice_bateau))
+
+    def carte_vide(self) -> np.array:
+        """
+        Retourne la carte de probabilités de la grille vide (voir 'carte_probabilites_vide').
+        """
+        return carte_probabilites_vide(self)
+
 # 1 Modélisation et fonctions simples
 
-def peut_placer_bateau(grille: np.array, indice_bateau: int, position: tuple[int, int], est_vertical: bool) -> bool:
+# Index des placements : pour une forme de grille et une taille de bateau données, chaque placement admissible
+# (position, direction) est précalculé une seule fois sous forme d'un masque de bits (bit x * colonnes + y).
+# Vérifier un placement revient alors à un seul test 'masque & occupation', et placer un bateau à un seul OU.
+
+@lru_cache(maxsize=None)
+def index_placements(forme: tuple[int, int], taille: int) -> dict[tuple[int, int, bool], tuple[int, tuple[tuple[int, int], ...]]]:
+    """
+    Construit (une seule fois par couple forme / taille) l'index de tous les placements admissibles d'un bateau.
+
+    Parameters
+    ----------
+    forme : tuple[int, int]
+        Les dimensions (lignes, colonnes) de la grille.
+    taille : int
+        La taille du bateau.
+
+    Returns
+    -------
+    dict[tuple[int, int, bool], tuple[int, tuple]]
+        Un dictionnaire associant à chaque placement (x, y, est_vertical) qui ne sort pas de la grille un couple
+        (masque, cases) : le masque de bits des cases couvertes et la liste des cases (i, j) couvertes.
+        L'ordre d'insertion suit l'ordre de parcours habituel (ligne, colonne, horizontal puis vertical).
+    """
+    lignes, colonnes = forme
+    index = {}
+
+    for x in range(lignes):
+        for y in range(colonnes):
+            for est_vertical in (False, True):
+                # Le bateau sort de la grille : placement non admissible
+                if (est_vertical and x + taille > lignes) or (not est_vertical and y + taille > colonnes):
+                    continue
+
+                if est_vertical:
+                    cases = tuple((x + k, y) for k in range(taille))
+                else:
+                    cases = tuple((x, y + k) for k in range(taille))
+
+                masque = 0
+                for i, j in cases:
+                    masque |= 1 << (i * colonnes + j)
+
+                index[(x, y, est_vertical)] = (masque, cases)
+
+    return index
+
+# Grille compacte : une alternative aux tableaux float64 10x10 (800 octets de données par grille).
+# Chaque bateau est représenté par un entier Python utilisé comme masque de bits (même numérotation
+# x * colonnes + y que 'index_placements'), et un masque supplémentaire réunit toutes les cases occupées.
+# Lire, poser ou effacer une case coûte un test ou une opération bit à bit, la victoire se lit sur un seul
+# entier, et une copie ne duplique qu'une petite liste d'entiers.
+
+class Grille:
+    """
+    Grille de jeu compacte, compatible avec les fonctions du module qui attendent un tableau NumPy
+    (lecture et écriture par 'grille[x, y]', attribut 'shape', conversion par 'np.asarray(grille)').
+
+    Attributes
+    ----------
+    shape : tuple[int, int]
+        Les dimensions (lignes, colonnes) de la grille.
+    occupees : int
+        Le masque de bits de toutes les cases occupées.
+    plateaux : list[int]
+        Le masque de bits de chaque bateau, indexé par l'indice du bateau (l'indice 0 n'est pas utilisé).
+    """
+    __slots__ = ('shape', 'occupees', 'plateaux')
+
+    def __init__(self, shape: tuple[int, int] = (10, 10), nb_bateaux: int = len(bateaux)) -> None:
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.occupees = 0
+        self.plateaux = [0] * (nb_bateaux + 1)
+
+    @classmethod
+    def depuis_tableau(cls, tableau: np.array) -> 'Grille':
+        """
+        Construit une grille compacte à partir d'un tableau 2D (0 pour une case vide, l'indice du bateau sinon).
+        """
+        grille = cls(tableau.shape)
+        valeurs = np.asarray(tableau).ravel()
+        indices = np.unique(valeurs[valeurs != 0]).astype(int)
+        if len(indices) and indices[-1] >= len(grille.plateaux):
+            grille.plateaux.extend([0] * (indices[-1] + 1 - len(grille.plateaux)))
+
+        for indice_bateau in indices:
+            masque = int.from_bytes(np.packbits(valeurs == indice_bateau, bitorder='little').tobytes(), 'little')
+            grille.plateaux[indice_bateau] = masque
+            grille.occupees |= masque
+
+        return grille
+
+    def _bateau(self, bit: int) -> int:
+        # Indice du bateau dont le plateau contient le bit (0 si la case est vide)
+        if self.occupees & bit:
+            for indice_bateau, plateau in enumerate(self.plateaux):
+                if plateau & bit:
+                    return indice_bateau
+        return 0
+
+    def __getitem__(self, position: tuple[int, int]) -> int:
+        # Retourne l'indice du bateau présent sur la case (0 si elle est vide)
+        return self._bateau(1 << int(position[0] * self.shape[1] + position[1]))
+
+    def __setitem__(self, position: tuple[int, int], indice_bateau: int) -> None:
+        # Vide la case (seul le plateau du bateau qui l'occupe est modifié), puis y pose 'indice_bateau' s'il est non nul
+        bit = 1 << int(position[0] * self.shape[1] + position[1])
+        ancien = self._bateau(bit)
+        if ancien:
+            self.plateaux[ancien] ^= bit
+            self.occupees ^= bit
+        if indice_bateau:
+            self.poser(bit, int(indice_bateau))
+
+    def poser(self, masque: int, indice_bateau: int) -> None:
+        """
+        Pose le bateau 'indice_bateau' sur toutes les cases du masque (un seul OU), sans vérification.
+        """
+        if indice_bateau >= len(self.plateaux):
+            self.plateaux.extend([0] * (indice_bateau + 1 - len(self.plateaux)))
+        self.plateaux[indice_bateau] |= masque
+        self.occupees |= masque
+
+    def effacer(self, masque: int) -> None:
+        """
+        Vide toutes les cases du masque, quel que soit le bateau qui les occupe.
+        """
+        self.occupees &= ~masque
+        self.plateaux = [plateau & ~masque for plateau in self.plateaux]
+
+    def restantes(self, indice_bateau: int = None) -> int:
+        """
+        Retourne le nombre de cases encore occupées (par un bateau donné, ou par toute la flotte), par popcount.
+        """
+        if indice_bateau is None:
+            return self.occupees.bit_count()
+        return self.plateaux[indice_bateau].bit_count() if indice_bateau < len(self.plateaux) else 0
+
+    def vide(self) -> bool:
+        """
+        Retourne `True` si plus aucune case n'est occupée.
+        """
+        return not self.occupees
+
+    def copy(self) -> 'Grille':
+        grille = Grille.__new__(Grille)
+        grille.shape = self.shape
+        grille.occupees = self.occupees
+        grille.plateaux = self.plateaux.copy()
+        return grille
+
+    def __array__(self, dtype=None, copy=None) -> np.array:
+        # Conversion en tableau NumPy (affichage, comparaisons, fonctions vectorisées)
+        cases = self.shape[0] * self.shape[1]
+        tableau = np.zeros(cases, dtype=np.int8 if dtype is None else dtype)
+        for indice_bateau, plateau in enumerate(self.plateaux):
+            if plateau:
+                bits = np.unpackbits(np.frombuffer(plateau.to_bytes((cases + 7) // 8, 'little'), dtype=np.uint8), count=cases, bitorder='little')
+                tableau[bits.astype(bool)] = indice_bateau
+        return tableau.reshape(self.shape)
+
+    def ravel(self) -> np.array:
+        return np.asarray(self).ravel()
+
+    # Comparaisons case par case, comme pour un tableau NumPy (par exemple 'grille != 0')
+    def __eq__(self, autre) -> np.array:
+        return np.asarray(self) == np.asarray(autre)
+
+    def __ne__(self, autre) -> np.array:
+        return np.asarray(self) != np.asarray(autre)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Grille({np.asarray(self)!r})"
+
+def occupation(grille: np.array) -> int:
+    """
+    Convertit une grille en masque de bits des cases occupées (bit x * colonnes + y à 1 si la case est non vide).
+
+    Parameters
+    ----------
+    grille : np.array | Grille
+        Un tableau 2D représentant la grille de jeu (ou une grille compacte, dont le masque est déjà tenu à jour).
+
+    Returns
+    -------
+    int
+        Le masque de bits des cases occupées.
+    """
+    if isinstance(grille, Grille):
+        return grille.occupees
+    return int.from_bytes(np.packbits(grille.ravel() != 0, bitorder='little').tobytes(), 'little')
+
+def peut_placer_bateau(grille: np.array, indice_bateau: int, position: tuple[int, int], est_vertical: bool, config: ConfigurationJeu = ConfigurationJeu()) -> bool:
     """
     Vérifie si un bateau peut être placé sur la grille à la position donnée et dans la direction spécifiée.
 
@@ -26,6 +274,8 @@ def peut_placer_bateau(grille: np.array, indice_bateau: int, position: tuple[int
     est_vertical : bool
         Si `True`, le bateau est placé verticalement (de haut en bas).
         Si `False`, le bateau est placé horizontalement (de gauche à droite).
+    config : ConfigurationJeu, optional
+        La configuration de la partie, qui donne la taille des bateaux. Par défaut, la configuration standard.
 
     Returns
     -------
@@ -34,26 +284,17 @@ def peut_placer_bateau(grille: np.array, indice_bateau: int, position: tuple[int
         avec un autre bateau, sinon retourne `False`.
     """
     
-    x, y = position  # Coordonnées initiales de placement du bateau
-    taille_bateau = bateaux[indice_bateau]  # Récupération de la taille du bateau
-
-    # Boucle pour vérifier chaque case où le bateau sera placé
-    while taille_bateau > 0:
-        # Vérifie si la position actuelle est hors de la grille ou si la case est déjà occupée
-        if not (0 <= x <= 9 and 0 <= y <= 9) or grille[x][y] != 0:
-            return False
-
-        # Déplacement des coordonnées selon la direction (verticale ou horizontale)
-        if est_vertical:
-            x += 1  # Déplacement vers le bas
-        else:
-            y += 1  # Déplacement vers la droite
-        
-        taille_bateau -= 1  # Réduction de la taille restante du bateau à placer
+    # Recherche du placement dans l'index (None si le bateau sort de la grille)
+    placement = index_placements(grille.shape, config.taille(indice_bateau)).get((position[0], position[1], bool(est_vertical)))
 
-    return True
+    # Le placement est possible s'il reste dans la grille et ne recouvre aucune case occupée.
+    # Une grille compacte se teste directement par masque ; pour un appel isolé sur un tableau, lire les cases précalculées coûte moins cher que de convertir
+    # toute la grille en masque ; les boucles de comptage, elles, testent directement les masques.
+    if isinstance(grille, Grille):
+        return placement is not None and not placement[0] & grille.occupees
+    return placement is not None and not any(grille[case] for case in placement[1])
 
-def placer_bateau(grille: np.array, indice_bateau: int, position: tuple[int, int], est_vertical: bool) -> np.array:
+def placer_bateau(grille: np.array, indice_bateau: int, position: tuple[int, int], est_vertical: bool, config: ConfigurationJeu = ConfigurationJeu()) -> np.array:
     """
     Place un bateau sur la grille à la position et dans la direction spécifiées.
     
@@ -72,6 +313,8 @@ def placer_bateau(grille: np.array, indice_bateau: int, position: tuple[int, int
     est_vertical : bool
         Si `True`, le bateau est placé verticalement (de haut en bas).
         Si `False`, le bateau est placé horizontalement (de gauche à droite).
+    config : ConfigurationJeu, optional
+        La configuration de la partie, qui donne la taille des bateaux. Par défaut, la configuration standard.
 
     Returns
     -------
@@ -79,27 +322,95 @@ def placer_bateau(grille: np.array, indice_bateau: int, position: tuple[int, int
         Retourne la grille mise à jour avec le bateau placé.
     """
     
-    x, y = position  # Coordonnées initiales du placement
-    taille_bateau = bateaux[indice_bateau]  # Récupère la taille du bateau
+    # Récupère les cases couvertes par le placement dans l'index
+    masque, cases = index_placements(grille.shape, config.taille(indice_bateau))[(position[0], position[1], bool(est_vertical))]
 
-    # Boucle pour placer le bateau sur la grille
-    while taille_bateau > 0:
-        grille[x][y] = indice_bateau  # Place l'indice du bateau dans la grille
+    # Sur une grille compacte, placer le bateau revient à un seul OU
+    if isinstance(grille, Grille):
+        grille.poser(masque, indice_bateau)
+        return grille
 
-        # Déplacement des coordonnées selon la direction (verticale ou horizontale)
-        if est_vertical:
-            x += 1  # Déplacement vers le bas
-        else:
-            y += 1  # Déplacement vers la droite
-        
-        taille_bateau -= 1  # Réduction de la taille restante à placer
+    # Place l'indice du bateau dans chaque case couverte
+    for case in cases:
+        grille[case] = indice_bateau
 
     return grille
 
-def placer_bateau_aleatoire(grille: np.array, indice_bateau: int) -> np.array:
+# Tirages aléatoires unitaires. Les chemins qui prennent une décision à la fois (placement d'un bateau, coup d'une
+# partie, capteur du scorpion) ne peuvent pas appeler un 'np.random.Generator' à chaque décision : un appel coûte
+# plusieurs microsecondes. 'TiragesParLots' tire les nombres uniformes par lots de 'taille' dans le générateur, puis
+# les sert un à un depuis une liste Python. Les tirages sont reproductibles dès que le générateur est initialisé.
+
+class TiragesParLots:
+    """
+    Tirages uniformes servis un à un depuis un tampon rempli par lots par un 'np.random.Generator'.
+
+    Attributes
+    ----------
+    rng : np.random.Generator
+        Le générateur sous-jacent, aussi utilisable directement pour les tirages vectorisés.
+    taille : int
+        Le nombre de tirages par lot.
+    """
+    __slots__ = ('rng', 'taille', '_tampon')
+
+    def __init__(self, rng: np.random.Generator = None, taille: int = 1024) -> None:
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.taille = taille
+        self._tampon = []
+
+    def random(self) -> float:
+        """
+        Retourne un nombre uniforme dans [0, 1).
+        """
+        if not self._tampon:
+            self._tampon = self.rng.random(self.taille).tolist()
+        return self._tampon.pop()
+
+    def entier(self, n: int) -> int:
+        """
+        Retourne un entier uniforme dans [0, n).
+        """
+        return int(self.random() * n)
+
+    def permutation(self, n: int) -> list[int]:
+        """
+        Retourne une permutation aléatoire de range(n), tirée en un seul appel au générateur.
+        """
+        return self.rng.permutation(n).tolist()
+
+    def initialiser(self, graine: int = None) -> None:
+        """
+        Remplace le générateur par 'np.random.default_rng(graine)' et vide le tampon.
+        """
+        self.rng = np.random.default_rng(graine)
+        self._tampon = []
+
+# Tirages par défaut, quand aucun générateur n'est fourni. Un processus fils (pool de processus) repart d'un
+# générateur neuf plutôt que de rejouer les tirages de son parent.
+tirages_defaut = TiragesParLots()
+os.register_at_fork(after_in_child=tirages_defaut.initialiser)
+
+def tirages_par_lots(rng: np.random.Generator | TiragesParLots = None) -> TiragesParLots:
+    """
+    Retourne les tirages à utiliser pour 'rng' : 'rng' lui-même s'il s'agit déjà de 'TiragesParLots',
+    'tirages_defaut' s'il vaut 'None', et sinon de nouveaux tirages par lots sur le générateur donné.
+    """
+    if isinstance(rng, TiragesParLots):
+        return rng
+    return tirages_defaut if rng is None else TiragesParLots(rng)
+
+@lru_cache(maxsize=None)
+def liste_placements(forme: tuple[int, int], taille: int) -> tuple[tuple[int, tuple[tuple[int, int], ...]], ...]:
+    """
+    Les couples (masque, cases) de 'index_placements', indexés par l'identifiant du placement (ordre de 'tableau_placements').
+    """
+    return tuple(index_placements(forme, taille).values())
+
+def placer_bateau_aleatoire(grille: np.array, indice_bateau: int, config: ConfigurationJeu = ConfigurationJeu(), rng: np.random.Generator | TiragesParLots = None) -> np.array:
     """
-    Place aléatoirement un bateau sur la grille. Une position et une direction sont 
-    tirées aléatoirement jusqu'à trouver un placement admissible.
+    Place aléatoirement un bateau sur la grille. Un placement est tiré uniformément parmi les placements
+    qui ne sortent pas de la grille, jusqu'à en trouver un qui ne chevauche aucun bateau.
 
     Parameters
     ----------
@@ -107,6 +418,10 @@ def placer_bateau_aleatoire(grille: np.array, indice_bateau: int) -> np.array:
         Tableau 2D représentant la grille de jeu.
     indice_bateau : int
         L'indice du bateau à placer dans la liste 'bateaux', représentant sa taille.
+    config : ConfigurationJeu, optional
+        La configuration de la partie, qui donne la taille des bateaux. Par défaut, la configuration standard.
+    rng : np.random.Generator | TiragesParLots, optional
+        Le générateur des tirages. Par défaut, 'tirages_defaut'.
 
     Returns
     -------
@@ -114,22 +429,23 @@ def placer_bateau_aleatoire(grille: np.array, indice_bateau: int) -> np.array:
         La grille mise à jour avec le bateau placé de manière aléatoire.
     """
 
-    # Tirage aléatoire d'une position (x, y) dans la grille
-    x = random.randint(0, grille.shape[0] - 1)
-    y = random.randint(0, grille.shape[1] - 1)
+    placements = liste_placements(grille.shape, config.taille(indice_bateau))
+    occupees = occupation(grille)  # Cases occupées, calculées une seule fois
+    tirages = tirages_par_lots(rng)
 
-    # Tirage aléatoire d'une direction (True pour vertical, False pour horizontal)
-    est_vertical = random.choice([True, False])
+    # Tirage d'un placement admissible, recommencé tant qu'il chevauche un bateau déjà posé
+    masque, cases = placements[tirages.entier(len(placements))]
+    while masque & occupees:
+        masque, cases = placements[tirages.entier(len(placements))]
 
-    # Vérifier jusqu'à obtenir un placement valide
-    while not peut_placer_bateau(grille, indice_bateau, (x, y), est_vertical):
-        # Tirage de nouvelles positions aléatoires si le placement n'est pas possible
-        x = random.randint(0, grille.shape[0] - 1)
-        y = random.randint(0, grille.shape[1] - 1)
-        est_vertical = random.choice([True, False])
+    # Placer le bateau une fois le placement valide trouvé
+    if isinstance(grille, Grille):
+        grille.poser(masque, indice_bateau)
+    else:
+        for case in cases:
+            grille[case] = indice_bateau
 
-    # Placer le bateau une fois la position et la direction valides trouvées
-    return placer_bateau(grille, indice_bateau, (x, y), est_vertical)
+    return grille
 
 def afficher_grille(grille: np.array):
     """
@@ -141,12 +457,8 @@ def afficher_grille(grille: np.array):
         Un tableau 2D représentant la grille de jeu, où les valeurs non nulles représentent les bateaux 
         et les 0 représentent les cases vides.
     """
-    plt.figure(figsize=(6, 6))  # Définir la taille de la figure
-    plt.imshow(grille, cmap='ocean', interpolation='nearest')  # Choisir un colormap pour représenter la mer et les bateaux
-    plt.colorbar(label="Indice du bateau")  # Ajouter une barre de couleurs pour identifier les bateaux
-    plt.title("Grille de jeu")  # Ajouter un titre
-    plt.grid(False)  # Désactiver la grille
-    plt.show()  # Afficher la grille
+    import graphiques  # Import paresseux : matplotlib n'est chargé qu'au premier tracé
+    graphiques.afficher_grille(grille)
 
 def grilles_egales(grilleA: np.array, grilleB: np.array) -> bool:
     """
@@ -166,193 +478,1669 @@ def grilles_egales(grilleA: np.array, grilleB: np.array) -> bool:
     """
     return np.array_equal(grilleA, grilleB)
 
-def generer_grille_aleatoire() -> np.array:
+def generer_grille_aleatoire(compacte: bool = False, config: ConfigurationJeu = ConfigurationJeu(), rng: np.random.Generator | TiragesParLots = None) -> np.array:
     """
     Génère une grille de jeu avec tous les bateaux disposés de manière aléatoire.
     
     La grille est initialisée avec des cases vides (0), puis cinq bateaux sont placés de manière aléatoire 
     avec des indices correspondant à leur taille (1 à 5).
 
+    Parameters
+    ----------
+    compacte : bool, optional
+        Si `True`, la grille est une 'Grille' compacte plutôt qu'un tableau NumPy (même loi de tirage).
+    config : ConfigurationJeu, optional
+        Les dimensions de la grille et la flotte à placer. Par défaut, la grille 10x10 et la flotte standard.
+    rng : np.random.Generator | TiragesParLots, optional
+        Le générateur des tirages. Par défaut, 'tirages_defaut'.
+
     Returns
     -------
-    np.array
+    np.array | Grille
         Une grille 10x10 avec les bateaux placés aléatoirement. Les cases vides sont marquées par des 0 
         et les cases avec un bateau sont marquées avec l'indice du bateau.
     """
     
-    # Initialiser une grille 10x10 avec des zéros (cases vides)
-    grille = np.zeros((10, 10))
+    # Initialiser une grille (10x10 par défaut) avec des zéros (cases vides)
+    grille = Grille(config.forme, len(config.tailles)) if compacte else np.zeros(config.forme)
+    tirages = tirages_par_lots(rng)  # Un seul tampon de tirages pour toute la flotte
 
-    # Boucle pour placer 5 bateaux sur la grille (indices 1 à 5)
-    for indice_bateau in range(1, 6):
-        grille = placer_bateau_aleatoire(grille, indice_bateau)
+    # Boucle pour placer les bateaux sur la grille (indices 1 à 5 par défaut)
+    for indice_bateau in config.bateaux:
+        grille = placer_bateau_aleatoire(grille, indice_bateau, config, tirages)
 
     return grille
 
+@lru_cache(maxsize=None)
+def tableau_placements(forme: tuple[int, int], taille: int) -> np.array:
+    """
+    Retourne les placements admissibles d'un bateau sous forme de tableau NumPy, dans l'ordre de 'index_placements'.
+
+    Parameters
+    ----------
+    forme : tuple[int, int]
+        Les dimensions (lignes, colonnes) de la grille.
+    taille : int
+        La taille du bateau.
+
+    Returns
+    -------
+    np.array
+        Un tableau d'entiers de forme (nombre de placements, taille) : la ligne p contient les indices
+        (x * colonnes + y) des cases couvertes par le placement p. Le tableau est en lecture seule.
+    """
+    colonnes = forme[1]
+    cases = np.array([[x * colonnes + y for x, y in c] for _, c in index_placements(forme, taille).values()], dtype=np.intp)
+    cases = cases.reshape(-1, taille)
+    cases.flags.writeable = False  # Le tableau est partagé par le cache
+
+    return cases
+
+@lru_cache(maxsize=None)
+def placements_par_case(forme: tuple[int, int], taille: int) -> tuple[np.array, ...]:
+    """
+    Index inverse de 'tableau_placements' : pour chaque case, les placements admissibles d'un bateau qui la recouvrent.
+
+    Parameters
+    ----------
+    forme : tuple[int, int]
+        Les dimensions (lignes, colonnes) de la grille.
+    taille : int
+        La taille du bateau.
+
+    Returns
+    -------
+    tuple[np.array, ...]
+        Un tableau d'identifiants de placements (indices dans 'tableau_placements') par case, dans l'ordre
+        x * colonnes + y. Les tableaux sont en lecture seule.
+    """
+    cases = tableau_placements(forme, taille)
+    identifiants = np.repeat(np.arange(len(cases)), taille)
+
+    # Tri des couples (case, placement) par case, puis découpage case par case
+    ordre = np.argsort(cases.ravel(), kind='stable')
+    bornes = np.cumsum(np.bincount(cases.ravel(), minlength=forme[0] * forme[1]))[:-1]
+    index = tuple(np.split(identifiants[ordre], bornes))
+    for placements in index:
+        placements.flags.writeable = False
+
+    return index
+
+def generer_grilles_aleatoires(n: int, rng: np.random.Generator = None, config: ConfigurationJeu = ConfigurationJeu()) -> np.array:
+    """
+    Génère 'n' grilles de jeu d'un coup, sous forme d'un seul tableau.
+
+    Les bateaux sont placés dans le même ordre et selon la même loi que 'generer_grille_aleatoire' : chaque bateau
+    est tiré uniformément parmi ses placements admissibles ('tableau_placements'), et seules les grilles où il
+    chevauche un bateau déjà posé refont un tirage. Tous les tirages d'une même étape sont faits en un seul appel
+    au générateur, pour toutes les grilles concernées.
+
+    Parameters
+    ----------
+    n : int
+        Le nombre de grilles à générer.
+    rng : np.random.Generator, optional
+        Le générateur aléatoire à utiliser. Par défaut, un nouveau générateur initialisé par le système.
+    config : ConfigurationJeu, optional
+        Les dimensions des grilles et la flotte à placer. Par défaut, la grille 10x10 et la flotte standard.
+
+    Returns
+    -------
+    np.array
+        Un tableau d'entiers 8 bits de forme (n, lignes, colonnes). Les cases vides valent 0 et les cases
+        occupées l'indice du bateau.
+    """
+    return _tirer_placements(n, rng if rng is not None else np.random.default_rng(), config)[1].reshape(n, *config.forme)
+
+def _tirer_placements(n: int, rng: np.random.Generator, config: ConfigurationJeu) -> tuple[np.array, np.array]:
+    """
+    Moteur de 'generer_grilles_aleatoires' : tire les placements de toute la flotte pour 'n' grilles.
+
+    Returns
+    -------
+    tuple[np.array, np.array]
+        Les identifiants des placements tirés (forme (n, nombre de bateaux), un indice dans 'tableau_placements'
+        par bateau, dans l'ordre de la flotte) et les grilles aplaties correspondantes (forme (n, lignes * colonnes)).
+    """
+    grilles = np.zeros((n, config.forme[0] * config.forme[1]), dtype=np.int8)
+    identifiants = np.empty((n, len(config.tailles)), dtype=np.int64)
+
+    for k, (indice_bateau, taille) in enumerate(config.bateaux.items()):
+        cases = tableau_placements(config.forme, taille)
+        a_placer = np.arange(n)  # Grilles où le bateau reste à placer
+
+        while a_placer.size:
+            # Un tirage par grille restante, puis test de chevauchement pour toutes à la fois
+            tirage = rng.integers(len(cases), size=a_placer.size)
+            libres = ~grilles[a_placer[:, None], cases[tirage]].any(axis=1)
+
+            # On pose le bateau dans les grilles où le placement est libre ; les autres refont un tirage
+            grilles[a_placer[libres, None], cases[tirage[libres]]] = indice_bateau
+            identifiants[a_placer[libres], k] = tirage[libres]
+            a_placer = a_placer[~libres]
+
+    return identifiants, grilles
+
 # 2 Combinatoire du jeu
 
 # Une borne supérieure simple du nombre de configurations possibles pour la liste complète de bateaux sur une grille de taille 10 serai = ∑ 220 - 40t
 
-def compter_placements(bateau: int, grille: np.array = np.zeros((10, 10))) -> int:
+def compter_placements(bateau: int, grille: np.array = None, couverture: bool = False, config: ConfigurationJeu = ConfigurationJeu()) -> int | tuple[int, np.array]:
     """
     Calcule le nombre de façons de placer un bateau dans une grille donnée.
 
-    La fonction itère sur chaque case de la grille et vérifie si le bateau peut y être placé
-    dans les deux orientations possibles (verticale et horizontale). 
+    Le calcul est vectorisé : les fenêtres libres de la longueur du bateau sont détectées le long des lignes
+    et des colonnes par sommes cumulées (voir 'fenetres_libres'). La grille peut avoir n'importe quelle forme.
 
     Parameters
     ----------
     bateau : int
         L'indice du bateau à placer, représentant sa taille.
     grille : np.array, optional
-        La grille sur laquelle le bateau doit être placé. Par défaut, une grille vide 10x10 est utilisée.
+        La grille sur laquelle le bateau doit être placé. Par défaut, la grille vide de la configuration.
+    couverture : bool, optional
+        Si `True`, retourne aussi la carte de couverture : pour chaque case, le nombre de placements
+        admissibles qui la recouvrent.
+    config : ConfigurationJeu, optional
+        La configuration de la partie, qui donne la taille des bateaux. Par défaut, la configuration standard.
 
     Returns
     -------
-    int
-        Le nombre total de façons de placer le bateau sur la grille.
+    int | tuple[int, np.array]
+        Le nombre total de façons de placer le bateau sur la grille, suivi de la carte de couverture
+        si 'couverture' vaut `True`.
     """
-    
-    res = 0  # Compteur pour le nombre de placements possibles
-    
-    # Itérer sur chaque case de la grille
-    for i in range(10):
-        for j in range(10):
-            # Vérifier le placement horizontal (direction = 0)
-            if peut_placer_bateau(grille, bateau, (i, j), 0):
-                res += 1
-            # Vérifier le placement vertical (direction = 1)
-            if peut_placer_bateau(grille, bateau, (i, j), 1):
-                res += 1
-                
-    return res
+    grille = np.zeros(config.forme) if grille is None else grille
+    taille = config.taille(bateau)
+    horizontaux, verticaux = fenetres_libres(grille != 0, taille)
+    total = int(horizontaux.sum() + verticaux.sum())
+
+    if not couverture:
+        return total
 
-def compter_placements_bateaux(bateaux: list[int], grille: np.array = np.zeros((10, 10))) -> int:
+    return total, etaler_fenetres(horizontaux, taille, 1, grille.shape) + etaler_fenetres(verticaux, taille, 0, grille.shape)
+
+def fenetres_libres(bloquees: np.array, taille: int) -> tuple[np.array, np.array]:
     """
-    Calcule le nombre de façons de placer une liste de bateaux sur une grille vide.
+    Détecte, par sommes cumulées, toutes les fenêtres de 'taille' cases libres consécutives d'une grille.
 
-    La fonction utilise la récursion pour essayer de placer chaque bateau dans toutes les 
-    positions et orientations possibles, puis continue avec le reste des bateaux.
+    Parameters
+    ----------
+    bloquees : np.array
+        Un tableau 2D de booléens, `True` pour les cases où aucun bateau ne peut passer.
+    taille : int
+        La longueur des fenêtres (la taille du bateau).
+
+    Returns
+    -------
+    tuple[np.array, np.array]
+        Deux tableaux de booléens indiquant les cases de départ des fenêtres libres : horizontales
+        (forme (lignes, colonnes - taille + 1)) puis verticales (forme (lignes - taille + 1, colonnes)).
+    """
+    # Les fenêtres verticales sont les fenêtres horizontales de la grille transposée
+    return _fenetres_lignes(bloquees, taille), _fenetres_lignes(bloquees.T, taille).T
+
+def _fenetres_lignes(bloquees: np.array, taille: int) -> np.array:
+    """
+    Fenêtres libres horizontales : le nombre de cases bloquées d'une fenêtre est la différence
+    des sommes cumulées de la ligne à 'taille' cases d'écart.
+    """
+    lignes, colonnes = bloquees.shape
+
+    cumul = np.zeros((lignes, colonnes + 1), dtype=np.int32)
+    np.cumsum(bloquees, axis=1, out=cumul[:, 1:])
+
+    return cumul[:, taille:] - cumul[:, :max(colonnes + 1 - taille, 0)] == 0
+
+def etaler_fenetres(debuts: np.array, taille: int, axe: int, forme: tuple[int, int]) -> np.array:
+    """
+    Répartit des fenêtres sur les cases qu'elles recouvrent : chaque case reçoit le nombre de fenêtres
+    (de longueur 'taille' le long de l'axe 'axe') qui la contiennent.
+
+    Parameters
+    ----------
+    debuts : np.array
+        Un tableau 2D donnant le nombre (ou la présence) de fenêtres commençant à chaque case de départ,
+        tel que retourné par 'fenetres_libres'.
+    taille : int
+        La longueur des fenêtres.
+    axe : int
+        L'axe des fenêtres : 1 pour horizontal, 0 pour vertical.
+    forme : tuple[int, int]
+        Les dimensions de la grille.
+
+    Returns
+    -------
+    np.array
+        La carte de couverture, de la forme de la grille.
+    """
+    # Les fenêtres verticales se traitent comme des fenêtres horizontales sur la grille transposée
+    if axe == 0:
+        return etaler_fenetres(debuts.T, taille, 1, forme[::-1]).T
+
+    lignes, colonnes = forme
+
+    # Sommes cumulées des départs, précédées d'un zéro : la case j est couverte par les départs
+    # d'indices max(j - taille + 1, 0) à min(j, nombre de départs - 1)
+    cumul = np.zeros((lignes, debuts.shape[1] + 1), dtype=np.int64)
+    np.cumsum(debuts, axis=1, out=cumul[:, 1:])
+
+    j = np.arange(colonnes)
+    fin = np.minimum(j + 1, debuts.shape[1])
+    debut = np.minimum(np.maximum(j - taille + 1, 0), fin)
+
+    return cumul[:, fin] - cumul[:, debut]
+
+def carte_couverture(bloquees: np.array, tailles: tuple[int, ...]) -> np.array:
+    """
+    Calcule, pour chaque case, le nombre de placements de tous les bateaux donnés qui la recouvrent sans
+    passer par une case bloquée. Les fenêtres libres sont détectées par sommes cumulées ('fenetres_libres')
+    puis étalées sur les cases ('etaler_fenetres') une seule fois par taille distincte : deux bateaux de
+    même taille ont la même couverture, comptée deux fois.
+
+    Parameters
+    ----------
+    bloquees : np.array
+        Un tableau 2D de booléens (de forme quelconque), `True` pour les cases où aucun bateau ne peut passer.
+    tailles : tuple[int, ...]
+        Les tailles des bateaux.
+
+    Returns
+    -------
+    np.array
+        La carte de couverture (entiers), de la forme de 'bloquees'.
+    """
+    carte = np.zeros(bloquees.shape, dtype=np.int64)
+
+    for taille, nombre in Counter(tailles).items():
+        horizontaux, verticaux = fenetres_libres(bloquees, taille)
+        carte += nombre * (etaler_fenetres(horizontaux, taille, 1, bloquees.shape) + etaler_fenetres(verticaux, taille, 0, bloquees.shape))
+
+    return carte
+
+@lru_cache(maxsize=None)
+def carte_probabilites_vide(config: ConfigurationJeu) -> np.array:
+    """
+    Retourne, pour chaque case de la grille vide, le nombre de placements de la flotte qui la recouvrent
+    (somme des cartes de couverture de chaque bateau). C'est la carte de départ de la stratégie probabiliste,
+    calculée une seule fois par configuration.
+
+    Parameters
+    ----------
+    config : ConfigurationJeu
+        La configuration de la partie.
+
+    Returns
+    -------
+    np.array
+        La carte de couverture, de la forme de la grille. Le tableau est en lecture seule.
+    """
+    carte = carte_couverture(np.zeros(config.forme, dtype=bool), config.tailles).astype(float)
+    carte.flags.writeable = False  # Le tableau est partagé par le cache
+
+    return carte
+
+def compter_placements_bateaux(bateaux: list[int], grille: np.array = None, config: ConfigurationJeu = ConfigurationJeu()) -> int:
+    """
+    Calcule le nombre exact de façons de placer une liste de bateaux sur une grille.
+
+    Le comptage se fait par programmation dynamique sur profil : les cases sont parcourues ligne par ligne et
+    l'état ne retient que ce qui influence la suite, à savoir la longueur restante du bateau vertical en cours
+    dans chaque colonne, la longueur restante du bateau horizontal en cours et l'ensemble des bateaux déjà posés.
+    Tous les états d'une case sont traités d'un coup avec NumPy, puis les états identiques sont fusionnés
+    en additionnant leurs effectifs. La flotte complète {1:2, 2:3, 3:3, 4:4, 5:5} se compte ainsi en quelques
+    secondes, là où l'énumération récursive ('compter_placements_bateaux_force_brute') est hors de portée.
 
     Parameters
     ----------
     bateaux : list[int]
         Une liste contenant les indices (tailles) des bateaux à placer.
     grille : np.array, optional
-        La grille sur laquelle les bateaux doivent être placés. Par défaut, une grille vide 10x10 est utilisée.
+        La grille sur laquelle les bateaux doivent être placés. Par défaut, la grille vide de la configuration.
+    config : ConfigurationJeu, optional
+        La configuration de la partie, qui donne la taille des bateaux. Par défaut, la configuration standard.
 
     Returns
     -------
     int
         Le nombre total de façons de placer tous les bateaux sur la grille.
     """
-    
-    # Si la liste ne contient qu'un seul bateau, on utilise la fonction pour compter les placements d'un seul bateau
-    if len(bateaux) == 1:
-        return compter_placements(bateaux[0], grille)
-    
-    res = 0  # Compteur pour le nombre de placements possibles
-    
-    # Itérer sur chaque case de la grille
-    for i in range(10):
-        for j in range(10):
-            # Vérifier le placement horizontal (direction = 0)
-            if peut_placer_bateau(grille, bateaux[0], (i, j), 0):
-                grille_tmp = grille.copy()  # Faire une copie de la grille pour ne pas affecter la grille originale
-                grille_tmp = placer_bateau(grille_tmp, bateaux[0], (i, j), 0)  # Placer le bateau
-                # Appel récursif pour le reste des bateaux
-                res += compter_placements_bateaux(bateaux[1:], grille_tmp)
-            
-            # Vérifier le placement vertical (direction = 1)
-            if peut_placer_bateau(grille, bateaux[0], (i, j), 1):
-                grille_tmp = grille.copy()  # Faire une copie de la grille
-                grille_tmp = placer_bateau(grille_tmp, bateaux[0], (i, j), 1)  # Placer le bateau
-                # Appel récursif pour le reste des bateaux
-                res += compter_placements_bateaux(bateaux[1:], grille_tmp)
-    
-    return res
-
-# Le nombre de grilles pour la liste complète de bateau est égale au nombre de façon de placer la liste de bateaux sur une grille vide.
-# Dans le cas où les grille sont equiprobables, le lien entre le nombre de grille "n" et la probabilité de tombé sur une grille donné est P = 1/n.
+    grille = np.zeros(config.forme) if grille is None else grille
+    return _compter_profil(grille != 0, config.tailles_bateaux(bateaux))
 
-def nombre_generations_grille(grille: np.array) -> int:
+def _compter_profil(bloquees: np.array, tailles: tuple[int, ...]) -> int:
     """
-    Retourne le nombre de grilles générées aléatoirement avant d'obtenir une grille identique 
-    à celle fournie en paramètre. Utilise une méthode de force brute.
+    Moteur de 'compter_placements_bateaux' : programmation dynamique sur profil, case par case.
 
-    La fonction génère des grilles aléatoires jusqu'à ce qu'une grille identique à celle donnée 
-    soit générée, en comptant le nombre d'essais.
+    Un état est codé par un entier en base 'max(tailles)' : un chiffre par colonne (longueur restante du bateau
+    vertical qui la traverse), un chiffre pour le bateau horizontal en cours, puis un bit par bateau déjà posé.
 
     Parameters
     ----------
-    grille : np.array
-        La grille de référence à laquelle on veut comparer les grilles générées.
+    bloquees : np.array
+        Un tableau 2D de booléens, `True` pour les cases déjà occupées.
+    tailles : tuple[int, ...]
+        Les tailles des bateaux à placer (deux bateaux de même taille restent distincts).
 
     Returns
     -------
     int
-        Le nombre de grilles générées avant d'obtenir une grille identique à celle fournie.
+        Le nombre de placements de tous les bateaux sans chevauchement.
     """
-    
-    res = 1  # Initialiser le compteur de générations
-    grille_tmp = generer_grille_aleatoire()  # Générer la première grille aléatoire
-    
-    # Boucle jusqu'à ce que la grille générée soit identique à la grille de référence
-    while not grilles_egales(grille, grille_tmp):
-        res += 1
-        grille_tmp = generer_grille_aleatoire()  # Générer une nouvelle grille
-    
-    return res
+    bloquees = _orienter_profil(bloquees)
+
+    etats, comptes = _profil_initial(bloquees.shape, tailles)
+    etats, comptes = _avancer_profil(bloquees, tailles, etats, comptes, 0, bloquees.shape[0])
 
-def findLambda(N: int) -> float:
+    return _total_profil(bloquees.shape, tailles, etats, comptes)
+
+def _orienter_profil(bloquees: np.array) -> np.array:
     """
-    Calcule la proportion de grilles valides où aucun des bateaux ne se chevauche après 
-    avoir placé 5 bateaux dans une grille 10x10.
+    Le profil suit la plus petite dimension : transpose la grille si elle est plus large que haute.
+    """
+    return bloquees.T if bloquees.shape[1] > bloquees.shape[0] else bloquees
 
-    La fonction génère N grilles aléatoires et place des bateaux sur chacune en s'assurant
-    que les bateaux sont placés soit horizontalement soit verticalement. Elle calcule ensuite
-    la proportion de grilles dans lesquelles les bateaux ne se chevauchent pas.
+@lru_cache(maxsize=None)
+def _codage_profil(forme: tuple[int, int], tailles: tuple[int, ...]) -> tuple:
+    """
+    Retourne les paramètres du codage des états du profil pour une forme de grille et une liste de tailles :
+    la base, le poids du chiffre de chaque colonne, celui du bateau horizontal, celui du premier bit des
+    bateaux posés, puis les types NumPy des états et des effectifs.
+    """
+    lignes, colonnes = forme
+
+    base = max(tailles, default=1)  # Les longueurs restantes vont de 0 à base - 1
+    poids_colonnes = tuple(base ** y for y in range(colonnes))  # Poids du chiffre de chaque colonne
+    poids_horizontal = base ** colonnes  # Poids du chiffre du bateau horizontal en cours
+    poids_poses = poids_horizontal * base  # Poids du premier bit des bateaux posés
+
+    # Entiers machine si les codes et les effectifs tiennent sur 63 bits, entiers Python sinon
+    borne_comptes = 1
+    for t in tailles:
+        borne_comptes *= 2 * lignes * colonnes
+    type_etats = np.int64 if poids_poses << len(tailles) < 2 ** 63 else object
+    type_comptes = np.int64 if borne_comptes < 2 ** 63 else object
+
+    return base, poids_colonnes, poids_horizontal, poids_poses, type_etats, type_comptes
+
+def _profil_initial(forme: tuple[int, int], tailles: tuple[int, ...]) -> tuple[np.array, np.array]:
+    """
+    Retourne l'état de départ du profil : aucun bateau posé, un seul état d'effectif 1.
+    """
+    *_, type_etats, type_comptes = _codage_profil(forme, tailles)
+    return np.zeros(1, dtype=type_etats), np.ones(1, dtype=type_comptes)
+
+def _avancer_profil(bloquees: np.array, tailles: tuple[int, ...], etats: np.array, comptes: np.array, premiere_ligne: int, derniere_ligne: int) -> tuple[np.array, np.array]:
+    """
+    Fait avancer le profil sur toutes les cases des lignes 'premiere_ligne' à 'derniere_ligne' (exclue).
+
+    Le calcul est linéaire en les états : avancer séparément deux sous-ensembles d'états puis additionner
+    les résultats donne le même total que les avancer ensemble.
+
+    Returns
+    -------
+    tuple[np.array, np.array]
+        Les états atteints (triés, sans doublon) et leurs effectifs.
+    """
+    # Un morceau vide reste vide (un état non vide a toujours au moins un successeur : la case vide)
+    if len(etats) == 0:
+        return etats, comptes
+
+    for x in range(premiere_ligne, derniere_ligne):
+        for y in range(bloquees.shape[1]):
+            etats, comptes = _avancer_case(bloquees, tailles, etats, comptes, x, y)
+
+    return etats, comptes
+
+def _avancer_case(bloquees: np.array, tailles: tuple[int, ...], etats: np.array, comptes: np.array, x: int, y: int, autorises: list[np.array] = None) -> tuple[np.array, np.array]:
+    """
+    Fait avancer le profil d'une case (x, y). Les départs de bateaux peuvent être restreints par 'autorises'
+    (cf. '_transitions_case').
+
+    Returns
+    -------
+    tuple[np.array, np.array]
+        Les états atteints (triés, sans doublon) et leurs effectifs.
+    """
+    sources, etats, _ = _transitions_case(bloquees, tailles, etats, x, y, autorises)
+    comptes = comptes[sources]
+
+    # Fusion des états identiques : tri puis somme des effectifs par groupe
+    ordre = np.argsort(etats, kind='stable')
+    etats, comptes = etats[ordre], comptes[ordre]
+    debuts = np.flatnonzero(np.r_[True, etats[1:] != etats[:-1]])
+
+    return etats[debuts], np.add.reduceat(comptes, debuts)
+
+def _transitions_case(bloquees: np.array, tailles: tuple[int, ...], etats: np.array, x: int, y: int, autorises: list[np.array] = None) -> tuple[np.array, np.array, np.array]:
+    """
+    Énumère les transitions du profil sur la case (x, y), sans fusionner les états atteints.
 
     Parameters
     ----------
-    - N (int): Le nombre de grilles à générer.
+    autorises : list[np.array], optional
+        Pour chaque bateau, un tableau booléen (lignes, colonnes, 2) des départs autorisés
+        (horizontal puis vertical). Par défaut, tout départ qui tient dans la grille est autorisé.
 
     Returns
     -------
-    - float: La proportion de grilles valides (sans chevauchement de bateaux).
+    tuple[np.array, np.array, np.array]
+        Pour chaque transition : l'indice de l'état de départ, l'état atteint et si la case est occupée.
     """
+    lignes, colonnes = bloquees.shape
+    base, poids_colonnes, poids_horizontal, poids_poses, *_ = _codage_profil(bloquees.shape, tailles)
 
-    # Compteur des grilles valides (sans chevauchement)
-    n: int = 0
-    
-    for _ in range(N):
-        # L'ensemble des cases occupée.
-        S: set[tuple[int, int]] = set()
-        valid: bool = True
-
-        for z in range(1, 6):
-            # Génération aléatoire des positions et direction du bateau
-            direction: int = random.randint(0, 1)
-
-            if direction == 0:  # Placement horizontal
-                x: int = random.randint(0, 9)
-                y: int = random.randint(0, 9)
-                while y + bateaux[z] - 1 > 9:  # Vérifier les limites de la grille
-                    y = random.randint(0, 9)
-                tmp = {(x, y + k) for k in range(bateaux[z])}
-            else:  # Placement vertical
-                x: int = random.randint(0, 9)
-                y: int = random.randint(0, 9)
-                while x + bateaux[z] - 1 > 9:  # Vérifier les limites de la grille
-                    x = random.randint(0, 9)
-                tmp = {(x + k, y) for k in range(bateaux[z])}
- 
-            # Vérification des chevauchements avec l'intersection
-            if len(S & tmp) != 0:
-                valid = False
-            S = S | tmp
-        # Incrémenter si aucune intersection (grille valide)
-        n += 1 if valid else 0
-
-    # Retourner la proportion de grilles valides
-    return n / N
\ No newline at end of file
+    libre = not bloquees[x, y]
+    vertical = (etats // poids_colonnes[y]) % base  # Bateau vertical traversant la case
+    horizontal = (etats // poids_horizontal) % base  # Bateau horizontal traversant la case
+
+    sources, nouveaux_etats = [], []
+
+    if libre:
+        # Prolongement d'un bateau vertical (impossible si un bateau horizontal occupe aussi la case)
+        s = np.flatnonzero((vertical > 0) & (horizontal == 0))
+        sources.append(s)
+        nouveaux_etats.append(etats[s] - poids_colonnes[y])
+
+        # Prolongement d'un bateau horizontal
+        s = np.flatnonzero((vertical == 0) & (horizontal > 0))
+        sources.append(s)
+        nouveaux_etats.append(etats[s] - poids_horizontal)
+
+    # Case laissée vide
+    s_vides = np.flatnonzero((vertical == 0) & (horizontal == 0))
+    vides = etats[s_vides]
+    sources.append(s_vides)
+    nouveaux_etats.append(vides)
+    occupees = sum(len(s) for s in sources) - len(s_vides)  # Transitions qui précèdent les cases vides
+
+    # Début d'un nouveau bateau, dans chaque direction où il tient dans la grille
+    if libre:
+        poses = vides // poids_poses
+        for i, t in enumerate(tailles):
+            m = (poses >> i) & 1 == 0
+            s, depart = s_vides[m], vides[m] + (poids_poses << i)
+            if y + t <= colonnes and (autorises is None or autorises[i][x, y, 0]):
+                sources.append(s)
+                nouveaux_etats.append(depart + (t - 1) * poids_horizontal)
+            if x + t <= lignes and (autorises is None or autorises[i][x, y, 1]):
+                sources.append(s)
+                nouveaux_etats.append(depart + (t - 1) * poids_colonnes[y])
+
+    sources = np.concatenate(sources)
+    occupe = np.ones(len(sources), dtype=bool)
+    occupe[occupees:occupees + len(s_vides)] = False
+
+    return sources, np.concatenate(nouveaux_etats), occupe
+
+def _total_profil(forme: tuple[int, int], tailles: tuple[int, ...], etats: np.array, comptes: np.array) -> int:
+    """
+    Retourne la somme des effectifs des états où tous les bateaux ont été posés.
+    """
+    poids_poses = _codage_profil(forme, tailles)[3]
+    return int(comptes[etats // poids_poses == (1 << len(tailles)) - 1].sum())
+
+def compter_placements_bateaux_parallele(bateaux: list[int], grille: np.array = None, nb_processus: int = None, nb_morceaux: int = None, lignes_communes: int = 3, config: ConfigurationJeu = ConfigurationJeu()) -> tuple[int, list[float]]:
+    """
+    Version multi-processus de 'compter_placements_bateaux'.
+
+    Les premières lignes de la grille, où se décident les placements de tête, sont traitées une seule fois ;
+    les états atteints sont alors répartis en morceaux (un état sur 'nb_morceaux' dans chacun, ce qui équilibre
+    la charge) et chaque morceau termine le calcul dans un processus du pool. Le calcul étant linéaire en les
+    états, la somme des résultats des morceaux est exactement le résultat séquentiel, quel que soit
+    le nombre de processus.
+
+    Parameters
+    ----------
+    bateaux : list[int]
+        Une liste contenant les indices (tailles) des bateaux à placer.
+    grille : np.array, optional
+        La grille sur laquelle les bateaux doivent être placés. Par défaut, la grille vide de la configuration.
+    config : ConfigurationJeu, optional
+        La configuration de la partie, qui donne la taille des bateaux. Par défaut, la configuration standard.
+    nb_processus : int, optional
+        Le nombre de processus du pool. Par défaut, le nombre de cœurs de la machine.
+    nb_morceaux : int, optional
+        Le nombre de morceaux. Par défaut, le nombre de processus.
+    lignes_communes : int, optional
+        Le nombre de lignes traitées avant le découpage en morceaux.
+
+    Returns
+    -------
+    tuple[int, list[float]]
+        Le nombre total de façons de placer tous les bateaux sur la grille, et la durée (en secondes)
+        du calcul de chaque morceau, pour repérer un déséquilibre de charge.
+    """
+    nb_processus = nb_processus or os.cpu_count() or 1
+    nb_morceaux = nb_morceaux or nb_processus
+
+    grille = np.zeros(config.forme) if grille is None else grille
+    tailles = config.tailles_bateaux(bateaux)  # Tailles des bateaux à placer
+    bloquees = _orienter_profil(grille != 0)
+    lignes_communes = min(lignes_communes, bloquees.shape[0])
+
+    # Partie commune, traitée une seule fois
+    etats, comptes = _profil_initial(bloquees.shape, tailles)
+    etats, comptes = _avancer_profil(bloquees, tailles, etats, comptes, 0, lignes_communes)
+
+    # Répartition des états en morceaux, puis calcul de chaque morceau dans le pool
+    morceaux = [(bloquees, tailles, etats[k::nb_morceaux], comptes[k::nb_morceaux], lignes_communes) for k in range(nb_morceaux)]
+    with ProcessPoolExecutor(max_workers=nb_processus) as pool:
+        resultats = list(pool.map(_compter_morceau, morceaux))
+
+    return sum(total for total, _ in resultats), [duree for _, duree in resultats]
+
+def _compter_morceau(morceau: tuple) -> tuple[int, float]:
+    """
+    Termine le calcul du profil pour un morceau d'états, dans un processus du pool.
+
+    Returns
+    -------
+    tuple[int, float]
+        Le nombre de placements issus de ce morceau et la durée du calcul en secondes.
+    """
+    bloquees, tailles, etats, comptes, premiere_ligne = morceau
+
+    debut = time.perf_counter()
+    etats, comptes = _avancer_profil(bloquees, tailles, etats, comptes, premiere_ligne, bloquees.shape[0])
+    total = _total_profil(bloquees.shape, tailles, etats, comptes)
+
+    return total, time.perf_counter() - debut
+
+def compter_placements_bateaux_force_brute(bateaux: list[int], grille: np.array = None, config: ConfigurationJeu = ConfigurationJeu()) -> int:
+    """
+    Calcule le nombre de façons de placer une liste de bateaux sur une grille vide, par énumération.
+
+    La fonction utilise la récursion pour essayer de placer chaque bateau dans toutes les 
+    positions et orientations possibles, puis continue avec le reste des bateaux. Elle sert de référence
+    pour valider 'compter_placements_bateaux' sur les petits cas.
+
+    Parameters
+    ----------
+    bateaux : list[int]
+        Une liste contenant les indices (tailles) des bateaux à placer.
+    grille : np.array, optional
+        La grille sur laquelle les bateaux doivent être placés. Par défaut, la grille vide de la configuration.
+    config : ConfigurationJeu, optional
+        La configuration de la partie, qui donne la taille des bateaux. Par défaut, la configuration standard.
+
+    Returns
+    -------
+    int
+        Le nombre total de façons de placer tous les bateaux sur la grille.
+    """
+    grille = np.zeros(config.forme) if grille is None else grille
+    return _compter_recursif(grille.shape, config.tailles_bateaux(bateaux), occupation(grille))
+
+def _compter_recursif(forme: tuple[int, int], tailles: tuple[int, ...], occupees: int) -> int:
+    """
+    Énumération récursive sur le masque des cases occupées : chaque placement libre du premier bateau
+    est posé par un OU, puis on compte les placements du reste de la liste.
+    """
+    placements = index_placements(forme, tailles[0]).values()
+
+    # Si la liste ne contient qu'un seul bateau, on compte directement ses placements libres
+    if len(tailles) == 1:
+        return sum(1 for masque, _ in placements if not masque & occupees)
+
+    res = 0  # Compteur pour le nombre de placements possibles
+
+    for masque, _ in placements:
+        if not masque & occupees:
+            # Appel récursif pour le reste des bateaux
+            res += _compter_recursif(forme, tailles[1:], occupees | masque)
+
+    return res
+
+class EchantillonneurUniforme:
+    """
+    Tirage exact et uniforme de configurations complètes de la flotte, sans rejet.
+
+    Le tirage s'appuie sur les tables de comptage de 'compter_placements_bateaux' : le profil est avancé une fois
+    sur toute la grille en conservant les états et effectifs au début de chaque ligne. Un tirage part alors d'un
+    état final complet choisi proportionnellement à son effectif, puis remonte la grille case par case en choisissant
+    chaque prédécesseur proportionnellement à son effectif. Chaque configuration correspond à exactement un chemin,
+    elle est donc tirée avec probabilité 1 / (nombre de configurations), pour un coût fixe par tirage.
+    """
+
+    # Attributs
+    forme: tuple[int, int]
+    indices: list[int]
+
+    # Constructeur
+    def __init__(self, indices: list[int] = None, grille: np.array = None, config: ConfigurationJeu = ConfigurationJeu()) -> None:
+        """
+        Construit les tables de comptage.
+
+        Parameters
+        ----------
+        indices : list[int], optional
+            Les indices des bateaux à placer. Par défaut, toute la flotte.
+        grille : np.array, optional
+            Une grille dont les cases non nulles sont interdites. Par défaut, la grille vide de la configuration.
+        config : ConfigurationJeu, optional
+            La configuration de la partie, qui donne la flotte. Par défaut, la configuration standard.
+        """
+        grille = np.zeros(config.forme) if grille is None else grille
+        self.forme = grille.shape
+        self.indices = list(config.bateaux) if indices is None else list(indices)
+
+        self._tailles = config.tailles_bateaux(self.indices)
+        self._transposee = grille.shape[1] > grille.shape[0]
+        self._bloquees = _orienter_profil(grille != 0)
+
+        if _codage_profil(self._bloquees.shape, self._tailles)[-1] is object:
+            raise ValueError("Le nombre de configurations dépasse la capacité des entiers 64 bits.")
+
+        # États et effectifs au début de chaque ligne, puis à la fin de la grille
+        etats, comptes = _profil_initial(self._bloquees.shape, self._tailles)
+        self._debuts_lignes = []
+        for x in range(self._bloquees.shape[0]):
+            self._debuts_lignes.append((etats, comptes))
+            etats, comptes = _avancer_profil(self._bloquees, self._tailles, etats, comptes, x, x + 1)
+
+        # Seuls les états où tous les bateaux sont posés terminent un chemin
+        poids_poses = _codage_profil(self._bloquees.shape, self._tailles)[3]
+        complets = etats // poids_poses == (1 << len(self._tailles)) - 1
+        self._finaux, self._comptes_finaux = etats[complets], comptes[complets]
+        self.total = int(self._comptes_finaux.sum())
+
+    # Méthodes
+    def tirer(self, n: int, rng: np.random.Generator = None, sortie: np.array = None, taille_lot: int = 1 << 16) -> np.array:
+        """
+        Tire 'n' configurations uniformes et indépendantes.
+
+        Parameters
+        ----------
+        n : int
+            Le nombre de configurations à tirer.
+        rng : np.random.Generator, optional
+            Le générateur aléatoire à utiliser. Par défaut, un nouveau générateur initialisé par le système.
+        sortie : np.array, optional
+            Un tableau préalloué de forme (n, lignes, colonnes), rempli en place (ses valeurs sont écrasées).
+            Par défaut, un nouveau tableau d'entiers 8 bits.
+        taille_lot : int, optional
+            Le nombre de tirages traités ensemble à chaque case, pour borner la mémoire de travail.
+
+        Returns
+        -------
+        np.array
+            Le tableau 'sortie' : les cases vides valent 0 et les cases occupées l'indice du bateau.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        if sortie is None:
+            sortie = np.zeros((n, *self.forme), dtype=np.int8)
+        else:
+            sortie[:n] = 0
+
+        if self.total == 0:
+            raise ValueError("Aucune configuration n'est possible sur cette grille.")
+
+        # Les tirages sont écrits dans l'orientation du profil
+        vue = sortie[:n].transpose(0, 2, 1) if self._transposee else sortie[:n]
+
+        # État final de chaque tirage, proportionnellement aux effectifs
+        cumul = np.cumsum(self._comptes_finaux)
+        etats = self._finaux[np.searchsorted(cumul, rng.integers(0, self.total, size=n), side='right')]
+
+        # Remontée ligne par ligne : les états intermédiaires de la ligne sont recalculés depuis son début
+        for x in range(self._bloquees.shape[0] - 1, -1, -1):
+            couches = [self._debuts_lignes[x]]
+            for y in range(self._bloquees.shape[1] - 1):
+                couches.append(_avancer_case(self._bloquees, self._tailles, *couches[-1], x, y))
+
+            for y in range(self._bloquees.shape[1] - 1, -1, -1):
+                for debut in range(0, n, taille_lot):
+                    lot = slice(debut, min(debut + taille_lot, n))
+                    etats[lot] = self._remonter_case(etats[lot], *couches[y], x, y, vue[lot], rng)
+
+        return sortie
+
+    def _remonter_case(self, etats: np.array, precedents: np.array, comptes: np.array, x: int, y: int, vue: np.array, rng: np.random.Generator) -> np.array:
+        """
+        Remonte d'une case (x, y) : pour chaque tirage, choisit un prédécesseur proportionnellement à son effectif
+        et, si la transition choisie pose un bateau, l'écrit dans 'vue'.
+
+        Returns
+        -------
+        np.array
+            Les états des tirages avant la case (x, y).
+        """
+        lignes, colonnes = self._bloquees.shape
+        base, poids_colonnes, poids_horizontal, poids_poses, *_ = _codage_profil(self._bloquees.shape, self._tailles)
+
+        libre = not self._bloquees[x, y]
+        vertical = (etats // poids_colonnes[y]) % base
+        horizontal = (etats // poids_horizontal) % base
+        poses = etats // poids_poses
+
+        # Transitions inverses : (écart entre l'état courant et le prédécesseur, transition possible).
+        # Les cas sont testés par tailles distinctes, car 'vertical' et 'horizontal' ne prennent que quelques valeurs.
+        candidats = [
+            (-poids_colonnes[y], libre & (horizontal == 0) & (vertical + 1 < base)),  # Bateau vertical prolongé
+            (-poids_horizontal, libre & (vertical == 0) & (horizontal + 1 < base)),  # Bateau horizontal prolongé
+            (0, (vertical == 0) & (horizontal == 0)),  # Case laissée vide
+        ]
+        departs = []  # (bateau, est_vertical) pour chaque transition qui pose un bateau
+        if libre:
+            fin_horizontal = {t: (vertical == 0) & (horizontal == t - 1) for t in set(self._tailles)}
+            fin_vertical = {t: (horizontal == 0) & (vertical == t - 1) for t in set(self._tailles)}
+            for i, t in enumerate(self._tailles):
+                pose = (poses >> i) & 1 == 1
+                if y + t <= colonnes:
+                    candidats.append(((poids_poses << i) + (t - 1) * poids_horizontal, pose & fin_horizontal[t]))
+                    departs.append((i, False))
+                if x + t <= lignes:
+                    candidats.append(((poids_poses << i) + (t - 1) * poids_colonnes[y], pose & fin_vertical[t]))
+                    departs.append((i, True))
+
+        # Prédécesseurs des seules transitions possibles, puis leur effectif (0 s'ils ne sont pas atteignables)
+        lignes_p = [np.flatnonzero(possible) for _, possible in candidats]
+        colonnes_p = np.repeat(np.arange(len(candidats)), [len(l) for l in lignes_p])
+        ecarts = np.array([ecart for ecart, _ in candidats], dtype=etats.dtype)[colonnes_p]
+        lignes_p = np.concatenate(lignes_p)
+        valeurs = etats[lignes_p] - ecarts
+
+        # Recherche dichotomique des valeurs triées au préalable : les accès mémoire restent locaux
+        ordre = np.argsort(valeurs)
+        position = np.empty_like(ordre)
+        position[ordre] = np.minimum(np.searchsorted(precedents, valeurs[ordre]), len(precedents) - 1)
+        trouves = precedents[position] == valeurs
+
+        poids = np.zeros((len(etats), len(candidats)), dtype=np.int64)
+        poids[lignes_p[trouves], colonnes_p[trouves]] = comptes[position[trouves]]
+
+        # Choix proportionnel aux effectifs : le total d'une ligne est l'effectif de l'état courant
+        cumul = np.cumsum(poids, axis=1)
+        tirage = rng.integers(0, cumul[:, -1])
+        choix = (cumul > tirage[:, None]).argmax(axis=1)
+
+        # Écriture des bateaux posés à cette case
+        for k, (i, est_vertical) in enumerate(departs, start=3):
+            concernes = np.flatnonzero(choix == k)
+            for d in range(self._tailles[i]):
+                if est_vertical:
+                    vue[concernes, x + d, y] = self.indices[i]
+                else:
+                    vue[concernes, x, y + d] = self.indices[i]
+
+        return etats - np.array([ecart for ecart, _ in candidats], dtype=etats.dtype)[choix]
+
+# Échantillonnage conditionnel (Monte-Carlo) : des configurations complètes de la flotte compatibles avec les
+# coups joués sont tirées par lots, chaque bateau parmi ses placements compatibles ('_placements_compatibles'),
+# et les propositions où deux bateaux se chevauchent sont rejetées par un ET sur des masques de 64 bits.
+
+@lru_cache(maxsize=None)
+def masques_placements(forme: tuple[int, int], taille: int) -> np.array:
+    """
+    Retourne les masques de bits des placements d'un bateau, dans l'ordre de 'tableau_placements', découpés
+    en mots de 64 bits (bit x * colonnes + y) comme dans 'masques_directions'.
+
+    Returns
+    -------
+    np.array
+        Un tableau d'entiers non signés de forme (nombre de placements, mots), en lecture seule.
+    """
+    cases = tableau_placements(forme, taille)
+    mots = (forme[0] * forme[1] + 63) // 64
+
+    masques = np.zeros((len(cases), mots), dtype=np.uint64)
+    for k in range(taille):
+        np.bitwise_or.at(masques, (np.arange(len(cases)), cases[:, k] // 64), np.left_shift(np.uint64(1), (cases[:, k] % 64).astype(np.uint64)))
+    masques.flags.writeable = False
+
+    return masques
+
+def _placements_compatibles(jouees: set[tuple[int, int]], touches: dict[int, list[tuple[int, int]]], config: ConfigurationJeu, forme: tuple[int, int]) -> tuple[list[int], list[int], list[np.array]]:
+    """
+    Retourne les indices et tailles des bateaux restants (non coulés) et, pour chacun, les identifiants
+    (dans l'ordre de 'tableau_placements') de ses placements compatibles avec les coups joués : ceux qui
+    recouvrent toutes ses cases touchées et aucune autre case jouée.
+
+    Lève une ValueError si un bateau n'a aucun placement compatible.
+    """
+    colonnes = forme[1]
+
+    masque_jouees = np.zeros(forme[0] * colonnes, dtype=bool)
+    for x, y in jouees:
+        masque_jouees[x * colonnes + y] = True
+
+    indices, tailles, candidats = [], [], []
+
+    for indice_bateau, taille in config.bateaux.items():
+        cases_touchees = [x * colonnes + y for x, y in touches.get(indice_bateau, ())]
+        if len(cases_touchees) == taille:
+            continue  # Bateau coulé : sa position est connue, ses cases sont jouées
+
+        # Placements qui ne recouvrent aucune case jouée autre que les touches du bateau, et toutes ses touches
+        cases = tableau_placements(forme, taille)
+        interdites = masque_jouees.copy()
+        interdites[cases_touchees] = False
+        compatibles = ~interdites[cases].any(axis=1)
+        if cases_touchees:
+            compatibles &= np.isin(cases, cases_touchees).sum(axis=1) == len(cases_touchees)
+
+        if not compatibles.any():
+            raise ValueError(f"Aucun placement du bateau {indice_bateau} n'est compatible avec les coups joués.")
+
+        indices.append(indice_bateau)
+        tailles.append(taille)
+        candidats.append(np.flatnonzero(compatibles))
+
+    return indices, tailles, candidats
+
+class EchantillonneurConditionnel:
+    """
+    Tirage uniforme de configurations complètes de la flotte compatibles avec les coups déjà joués :
+    aucune case jouée ne porte de bateau, sauf les cases touchées, qui portent le bateau annoncé.
+    Les bateaux dont toutes les cases ont été touchées (coulés) sont fixés et ne sont pas tirés.
+
+    Chaque bateau restant est tiré indépendamment et uniformément parmi ses placements compatibles : ceux qui
+    recouvrent toutes ses cases touchées et aucune autre case jouée. Les propositions où deux bateaux se
+    chevauchent (test ET sur des masques de 64 bits) sont rejetées ; les configurations acceptées sont donc
+    uniformes parmi les configurations compatibles. Tout est vectorisé par lots de propositions.
+    """
+
+    # Attributs
+    forme: tuple[int, int]
+    indices: list[int]
+
+    # Constructeur
+    def __init__(self, jouees: set[tuple[int, int]], touches: dict[int, list[tuple[int, int]]], config: ConfigurationJeu = ConfigurationJeu(), forme: tuple[int, int] = None) -> None:
+        """
+        Prépare les placements compatibles de chaque bateau restant.
+
+        Parameters
+        ----------
+        jouees : set[tuple[int, int]]
+            Les cases déjà jouées (manquées ou touchées).
+        touches : dict[int, list[tuple[int, int]]]
+            Les cases touchées de chaque bateau, indexées par l'indice du bateau.
+        config : ConfigurationJeu, optional
+            La configuration qui donne la flotte. Par défaut, la configuration standard.
+        forme : tuple[int, int], optional
+            Les dimensions de la grille. Par défaut, celles de la configuration.
+        """
+        self.forme = tuple(forme) if forme is not None else config.forme
+        self.indices, self._tailles, self._candidats = _placements_compatibles(jouees, touches, config, self.forme)
+
+    # Méthodes
+    def frequences(self, n: int, rng: np.random.Generator = None, duree_max: float = None, taille_lot: int = 1 << 14) -> tuple[np.array, int]:
+        """
+        Tire des configurations compatibles et compte, pour chaque case, combien d'entre elles la recouvrent
+        par un bateau restant.
+
+        Parameters
+        ----------
+        n : int
+            Le nombre de configurations visé.
+        rng : np.random.Generator, optional
+            Le générateur aléatoire à utiliser. Par défaut, un nouveau générateur initialisé par le système.
+        duree_max : float, optional
+            Le temps maximal (en secondes) consacré au tirage. Au moins un lot est toujours tiré.
+        taille_lot : int, optional
+            Le nombre de propositions par lot.
+
+        Returns
+        -------
+        tuple[np.array, int]
+            Le nombre de configurations recouvrant chaque case (de la forme de la grille) et le nombre
+            de configurations tirées (au plus 'n').
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        cases = self.forme[0] * self.forme[1]
+        comptes = np.zeros(cases, dtype=np.int64)
+        acceptees = 0
+        debut = time.perf_counter()
+
+        while acceptees < n:
+            identifiants = self._proposer(taille_lot, rng)
+            identifiants = [ids[:n - acceptees] for ids in identifiants]
+
+            # Couverture des configurations acceptées, bateau par bateau
+            for taille, ids in zip(self._tailles, identifiants):
+                comptes += np.bincount(tableau_placements(self.forme, taille)[ids].ravel(), minlength=cases)
+            acceptees += len(identifiants[0]) if identifiants else n - acceptees
+
+            if duree_max is not None and time.perf_counter() - debut >= duree_max:
+                break
+
+        return comptes.reshape(self.forme), acceptees
+
+    def _proposer(self, m: int, rng: np.random.Generator) -> list[np.array]:
+        """
+        Tire 'm' propositions et retourne, pour chaque bateau restant, les placements des propositions acceptées.
+        """
+        occupees = None  # Masques des cases occupées, un par proposition
+        valides = np.ones(m, dtype=bool)
+        identifiants = []
+
+        for taille, candidats in zip(self._tailles, self._candidats):
+            ids = candidats[rng.integers(len(candidats), size=m)]
+            masques = masques_placements(self.forme, taille)[ids]
+
+            if occupees is None:
+                occupees = masques.copy()
+            else:
+                valides &= ~(occupees & masques).any(axis=1)
+                occupees |= masques
+            identifiants.append(ids)
+
+        return [ids[valides] for ids in identifiants]
+
+# Probabilités a posteriori exactes : au lieu de tirer des configurations, on les compte toutes.
+# Les placements de chaque bateau sont d'abord élagués par les coups joués ('_placements_compatibles').
+# S'il reste peu de combinaisons, elles sont énumérées sur des masques de bits (entiers Python) ;
+# sinon, le profil de 'compter_placements_bateaux', restreint aux départs compatibles, est parcouru
+# dans les deux sens pour obtenir le nombre de configurations recouvrant chaque case.
+
+class TableTransposition:
+    """
+    Cache LRU de taille bornée, avec statistiques de succès et d'échecs.
+
+    Sert de table de transposition au moteur exact : la clé est l'état observé de la partie
+    (cases manquées, cases touchées de chaque bateau, bateaux coulés), si bien qu'un état déjà
+    rencontré, dans la même partie ou une autre, ne coûte qu'une recherche.
+    """
+
+    # Attributs
+    capacite: int
+    succes: int
+    echecs: int
+
+    # Constructeur
+    def __init__(self, capacite: int = 4096) -> None:
+        self.capacite = capacite
+        self.succes = 0
+        self.echecs = 0
+        self._entrees = OrderedDict()
+
+    # Méthodes
+    def get(self, cle):
+        """
+        Retourne la valeur associée à 'cle' (et la marque comme la plus récente), ou None si elle est absente.
+        """
+        if cle not in self._entrees:
+            self.echecs += 1
+            return None
+
+        self.succes += 1
+        self._entrees.move_to_end(cle)
+        return self._entrees[cle]
+
+    def __setitem__(self, cle, valeur) -> None:
+        self._entrees[cle] = valeur
+        self._entrees.move_to_end(cle)
+        if len(self._entrees) > self.capacite:
+            self._entrees.popitem(last=False)  # Éviction de l'entrée la moins récemment utilisée
+
+    def __len__(self) -> int:
+        return len(self._entrees)
+
+    def taux_succes(self) -> float:
+        """
+        Retourne la proportion de recherches qui ont trouvé leur entrée (0 si aucune recherche).
+        """
+        total = self.succes + self.echecs
+        return self.succes / total if total else 0.0
+
+    def clear(self) -> None:
+        self._entrees.clear()
+        self.succes = self.echecs = 0
+
+    def __repr__(self) -> str:
+        return f"TableTransposition({len(self)}/{self.capacite}, succes={self.succes}, echecs={self.echecs})"
+
+def cle_etat(jouees: set[tuple[int, int]], touches: dict[int, list[tuple[int, int]]], config: ConfigurationJeu, forme: tuple[int, int]) -> tuple:
+    """
+    Retourne la clé de l'état observé d'une partie : la flotte et la grille, les cases manquées,
+    les cases touchées de chaque bateau et les bateaux coulés. L'ordre des coups n'y figure pas.
+    """
+    cases_touchees = {case for cases in touches.values() for case in cases}
+    manquees = frozenset(case for case in jouees if case not in cases_touchees)
+    touchees = frozenset((i, frozenset(cases)) for i, cases in touches.items() if cases)
+    coules = frozenset(i for i, cases in touches.items() if len(cases) == config.taille(i))
+
+    return config.tailles, tuple(forme), manquees, touchees, coules
+
+def probabilites_exactes(jouees: set[tuple[int, int]], touches: dict[int, list[tuple[int, int]]], config: ConfigurationJeu = ConfigurationJeu(), forme: tuple[int, int] = None, table: TableTransposition = None, seuil_enumeration: int = 1 << 16) -> tuple[np.array, int]:
+    """
+    Compte exactement les configurations complètes de la flotte compatibles avec les coups joués
+    (mêmes règles que 'EchantillonneurConditionnel') et, pour chaque case, celles qui la recouvrent
+    par un bateau restant. La probabilité a posteriori d'une case est le quotient des deux.
+
+    Parameters
+    ----------
+    jouees : set[tuple[int, int]]
+        Les cases déjà jouées (manquées ou touchées).
+    touches : dict[int, list[tuple[int, int]]]
+        Les cases touchées de chaque bateau, indexées par l'indice du bateau.
+    config : ConfigurationJeu, optional
+        La configuration qui donne la flotte. Par défaut, la configuration standard.
+    forme : tuple[int, int], optional
+        Les dimensions de la grille. Par défaut, celles de la configuration.
+    table : TableTransposition, optional
+        La table où chercher puis ranger le résultat. Par défaut, aucun cache.
+    seuil_enumeration : int, optional
+        Au-delà de ce nombre de combinaisons de placements compatibles (produit sur les bateaux restants),
+        les configurations sont comptées par le profil plutôt qu'énumérées.
+
+    Returns
+    -------
+    tuple[np.array, int]
+        Le nombre de configurations recouvrant chaque case (de la forme de la grille, en lecture seule)
+        et le nombre total de configurations compatibles.
+    """
+    forme = tuple(forme) if forme is not None else config.forme
+
+    if table is not None:
+        cle = cle_etat(jouees, touches, config, forme)
+        resultat = table.get(cle)
+        if resultat is not None:
+            return resultat
+
+    indices, tailles, candidats = _placements_compatibles(jouees, touches, config, forme)
+
+    if math.prod(len(c) for c in candidats) <= seuil_enumeration:
+        comptes, total = _couverture_enumeree(forme, tailles, candidats)
+    else:
+        # Les cases jouées sont bloquées, sauf les touches des bateaux restants, qui doivent être recouvertes
+        bloquees = np.zeros(forme, dtype=bool)
+        for x, y in jouees:
+            bloquees[x, y] = True
+        for i in indices:
+            for x, y in touches.get(i, ()):
+                bloquees[x, y] = False
+        comptes, total = _couverture_profil(bloquees, tailles, candidats)
+
+    comptes.flags.writeable = False
+    if table is not None:
+        table[cle] = (comptes, total)
+
+    return comptes, total
+
+def _couverture_enumeree(forme: tuple[int, int], tailles: list[int], candidats: list[np.array]) -> tuple[np.array, int]:
+    """
+    Énumère les configurations sans chevauchement par un parcours en profondeur sur des masques de bits.
+
+    À chaque niveau, le bateau posé est celui qui a le moins de placements restants ; les placements des
+    autres bateaux qui le chevauchent sont retirés, et la branche est abandonnée dès qu'un bateau n'en a plus.
+    """
+    placements = []  # Pour chaque bateau, ses placements compatibles (identifiant, masque)
+    for taille, ids in zip(tailles, candidats):
+        masques = [masque for masque, _ in index_placements(forme, taille).values()]
+        placements.append([(p, masques[p]) for p in ids.tolist()])
+
+    utilisations = [Counter() for _ in tailles]  # Nombre de configurations utilisant chaque placement
+    pile = []
+
+    def parcourir(restants: dict[int, list[tuple[int, int]]]) -> None:
+        if not restants:
+            for k, p in pile:
+                utilisations[k][p] += 1
+            return
+
+        k = min(restants, key=lambda j: len(restants[j]))
+        for p, masque in restants[k]:
+            suite = {}
+            for j, liste in restants.items():
+                if j != k:
+                    suite[j] = [(q, m) for q, m in liste if not m & masque]
+                    if not suite[j]:
+                        break  # Élagage : le bateau j ne peut plus être posé
+            else:
+                pile.append((k, p))
+                parcourir(suite)
+                pile.pop()
+
+    parcourir(dict(enumerate(placements)))
+
+    cases = forme[0] * forme[1]
+    comptes = np.zeros(cases, dtype=np.int64)
+    for taille, compteur in zip(tailles, utilisations):
+        if compteur:
+            ids = np.fromiter(compteur.keys(), dtype=np.intp, count=len(compteur))
+            effectifs = np.fromiter(compteur.values(), dtype=np.int64, count=len(compteur))
+            np.add.at(comptes, tableau_placements(forme, taille)[ids], effectifs[:, None])
+
+    total = sum(utilisations[0].values()) if tailles else 1
+    return comptes.reshape(forme), total
+
+def _couverture_profil(bloquees: np.array, tailles: list[int], candidats: list[np.array]) -> tuple[np.array, int]:
+    """
+    Compte les configurations par le profil, restreint aux départs des placements compatibles.
+
+    Un passage avant donne le nombre de façons d'atteindre chaque état avant chaque case, un passage
+    arrière le nombre de façons de terminer depuis chaque état ; la couverture d'une case est la somme,
+    sur les transitions qui l'occupent, du produit des deux. Seuls les états en début de ligne sont
+    conservés : ceux d'une ligne sont recalculés lors du passage arrière.
+    """
+    forme = bloquees.shape
+    tailles = tuple(tailles)
+
+    # Départs autorisés de chaque bateau : (x, y, horizontal / vertical) pour chaque placement compatible
+    autorises = []
+    for taille, ids in zip(tailles, candidats):
+        departs = np.zeros(forme + (2,), dtype=bool)
+        cles = list(index_placements(forme, taille))
+        for p in ids.tolist():
+            x, y, est_vertical = cles[p]
+            departs[x, y, int(est_vertical)] = True
+        autorises.append(departs)
+
+    # Le profil suit la plus petite dimension (cf. '_orienter_profil') ; les directions sont alors échangées
+    transposee = forme[1] > forme[0]
+    if transposee:
+        bloquees = bloquees.T
+        autorises = [a.transpose(1, 0, 2)[:, :, ::-1] for a in autorises]
+    lignes, colonnes = bloquees.shape
+
+    # Passage avant : états en début de chaque ligne
+    etats, comptes = _profil_initial(bloquees.shape, tailles)
+    debuts_lignes = []
+    for x in range(lignes):
+        debuts_lignes.append((etats, comptes))
+        for y in range(colonnes):
+            etats, comptes = _avancer_case(bloquees, tailles, etats, comptes, x, y, autorises)
+
+    # Fin du parcours : seuls les états où tous les bateaux sont posés se terminent
+    poids_poses = _codage_profil(bloquees.shape, tailles)[3]
+    arrivees = (etats // poids_poses == (1 << len(tailles)) - 1).astype(comptes.dtype)
+    total = int((comptes * arrivees).sum())
+
+    couverture = np.zeros(bloquees.shape, dtype=comptes.dtype)
+    for x in reversed(range(lignes)):
+        # Recalcul des états avant chaque case de la ligne
+        couches = [debuts_lignes[x]]
+        for y in range(colonnes - 1):
+            couches.append(_avancer_case(bloquees, tailles, *couches[-1], x, y, autorises))
+
+        for y in reversed(range(colonnes)):
+            etats_avant, comptes_avant = couches[y]
+            sources, destinations, occupe = _transitions_case(bloquees, tailles, etats_avant, x, y, autorises)
+            suites = arrivees[np.searchsorted(etats, destinations)]
+
+            couverture[x, y] = (comptes_avant[sources[occupe]] * suites[occupe]).sum()
+
+            arrivees = np.zeros(len(etats_avant), dtype=comptes_avant.dtype)
+            np.add.at(arrivees, sources, suites)
+            etats = etats_avant
+
+    if transposee:
+        couverture = couverture.T
+
+    return couverture, total
+
+# Le nombre de grilles pour la liste complète de bateau est égale au nombre de façon de placer la liste de bateaux sur une grille vide.
+# Dans le cas où les grille sont equiprobables, le lien entre le nombre de grille "n" et la probabilité de tombé sur une grille donné est P = 1/n.
+# Pour la flotte complète, compter_placements_bateaux([1, 2, 3, 4, 5]) donne n = 30 093 975 536.
+
+def nombre_generations_grille(grille: np.array, mode: str = 'force_brute', rng: np.random.Generator = None, config: ConfigurationJeu = ConfigurationJeu()) -> int | Fraction:
+    """
+    Retourne le nombre de grilles générées aléatoirement avant d'obtenir une grille identique 
+    à celle fournie en paramètre. Par défaut (mode 'force_brute'), utilise une méthode de force brute.
+
+    En mode 'force_brute', la fonction génère des grilles aléatoires jusqu'à ce qu'une grille identique
+    à celle donnée soit générée, en comptant le nombre d'essais.
+
+    Deux autres modes sont disponibles :
+    - 'rapide' : même expérience, mais les grilles sont tirées par lots et comparées par leur code
+      (voir 'nombre_generations_grille_rapide') ;
+    - 'analytique' : retourne directement l'espérance exacte du nombre de tirages
+      (voir 'esperance_generations_grille').
+
+    Parameters
+    ----------
+    grille : np.array
+        La grille de référence à laquelle on veut comparer les grilles générées.
+    mode : str, optional
+        'force_brute' (par défaut), 'rapide' ou 'analytique'.
+    rng : np.random.Generator, optional
+        Le générateur aléatoire du mode 'rapide'.
+    config : ConfigurationJeu, optional
+        La configuration utilisée par le générateur (dimensions de la grille et flotte). Par défaut, la configuration standard.
+
+    Returns
+    -------
+    int | Fraction
+        Le nombre de grilles générées avant d'obtenir une grille identique à celle fournie
+        (son espérance en mode 'analytique').
+    """
+
+    if mode == 'rapide':
+        return nombre_generations_grille_rapide(grille, rng, config=config)
+    if mode == 'analytique':
+        return esperance_generations_grille(grille, config)
+    if mode != 'force_brute':
+        raise ValueError(f"Mode inconnu : {mode}")
+    
+    res = 1  # Initialiser le compteur de générations
+    grille_tmp = generer_grille_aleatoire(config=config)  # Générer la première grille aléatoire
+    
+    # Boucle jusqu'à ce que la grille générée soit identique à la grille de référence
+    while not grilles_egales(grille, grille_tmp):
+        res += 1
+        grille_tmp = generer_grille_aleatoire(config=config)  # Générer une nouvelle grille
+    
+    return res
+
+def code_grille(grille: np.array, config: ConfigurationJeu = ConfigurationJeu()) -> int:
+    """
+    Retourne le code d'une grille : l'entier formé par les identifiants des placements de ses bateaux
+    (indices dans 'tableau_placements'), écrits en base mixte. Deux grilles sont égales si et seulement si
+    leurs codes le sont.
+
+    Parameters
+    ----------
+    grille : np.array
+        Une grille contenant chaque bateau de la flotte exactement une fois.
+    config : ConfigurationJeu, optional
+        La configuration qui donne la flotte. Par défaut, la configuration standard.
+
+    Returns
+    -------
+    int
+        Le code de la grille.
+    """
+    code = 0
+
+    for identifiant, taille in reversed(list(zip(identifiants_placements(grille, config), config.tailles))):
+        code = code * len(tableau_placements(grille.shape, taille)) + identifiant
+
+    return code
+
+def identifiants_placements(grille: np.array, config: ConfigurationJeu = ConfigurationJeu()) -> list[int]:
+    """
+    Retourne l'identifiant du placement de chaque bateau de la grille (indice dans 'tableau_placements'),
+    dans l'ordre de la flotte.
+
+    Parameters
+    ----------
+    grille : np.array
+        Une grille contenant chaque bateau de la flotte exactement une fois.
+    config : ConfigurationJeu, optional
+        La configuration qui donne la flotte. Par défaut, la configuration standard.
+
+    Returns
+    -------
+    list[int]
+        Les identifiants des placements, un par bateau.
+    """
+    forme = grille.shape
+    cases_grille = np.asarray(grille).ravel()
+    identifiants = []
+
+    for indice_bateau, taille in config.bateaux.items():
+        placements = tableau_placements(forme, taille)
+        cases = np.flatnonzero(cases_grille == indice_bateau)
+
+        # Premier placement couvrant exactement les cases du bateau (un bateau de taille 1 en a deux, identiques)
+        trouves = np.flatnonzero((placements == cases).all(axis=1)) if len(cases) == taille else []
+        if len(trouves) == 0:
+            raise ValueError(f"Le bateau {indice_bateau} n'occupe pas un placement admissible.")
+
+        identifiants.append(int(trouves[0]))
+
+    return identifiants
+
+def _codes_placements(identifiants: np.array, config: ConfigurationJeu) -> np.array:
+    """
+    Version vectorisée de 'code_grille', à partir des identifiants retournés par '_tirer_placements'.
+    """
+    code = np.zeros(len(identifiants), dtype=np.int64)
+
+    for k, taille in reversed(list(enumerate(config.tailles))):
+        premier = _premiers_placements(config.forme, taille)
+        code = code * len(premier) + premier[identifiants[:, k]]
+
+    return code
+
+@lru_cache(maxsize=None)
+def _premiers_placements(forme: tuple[int, int], taille: int) -> np.array:
+    """
+    Associe à chaque placement le premier placement couvrant les mêmes cases (les placements horizontal
+    et vertical d'un bateau de taille 1 sont confondus), comme dans 'code_grille'.
+    """
+    placements = tableau_placements(forme, taille)
+    _, premiers, inverse = np.unique(placements, axis=0, return_index=True, return_inverse=True)
+
+    return premiers[inverse.ravel()]
+
+def nombre_generations_grille_rapide(grille: np.array, rng: np.random.Generator = None, taille_lot: int = 1 << 16, config: ConfigurationJeu = ConfigurationJeu()) -> int:
+    """
+    Version rapide de 'nombre_generations_grille' : les grilles sont tirées par lots de 'taille_lot' avec
+    '_tirer_placements' (même loi que 'generer_grille_aleatoire'), réduites à leur code ('code_grille') et
+    comparées d'un coup au code de la grille cible. Le calcul s'arrête au premier lot contenant la cible.
+
+    Parameters
+    ----------
+    grille : np.array
+        La grille de référence.
+    rng : np.random.Generator, optional
+        Le générateur aléatoire à utiliser. Par défaut, un nouveau générateur initialisé par le système.
+    taille_lot : int, optional
+        Le nombre de grilles tirées par lot.
+    config : ConfigurationJeu, optional
+        La configuration qui donne la flotte. Par défaut, la configuration standard.
+
+    Returns
+    -------
+    int
+        Le nombre de grilles générées jusqu'à obtenir (inclus) une grille identique à celle fournie.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    config = config._replace(forme=grille.shape)
+    cible = code_grille(grille, config)
+    res = 0
+
+    while True:
+        identifiants, _ = _tirer_placements(taille_lot, rng, config)
+        egales = np.flatnonzero(_codes_placements(identifiants, config) == cible)
+
+        if len(egales):
+            return res + int(egales[0]) + 1
+        res += taille_lot
+
+def esperance_generations_grille(grille: np.array, config: ConfigurationJeu = ConfigurationJeu()) -> int | Fraction:
+    """
+    Calcule l'espérance exacte du nombre de grilles à générer avec 'generer_grille_aleatoire'
+    pour obtenir la grille fournie.
+
+    Le générateur pose les bateaux dans l'ordre, chacun uniformément parmi ses placements encore libres.
+    La probabilité p d'obtenir la grille est donc le produit, pour chaque bateau, du nombre de placements
+    qui donnent ses cases (1, ou 2 pour un bateau de taille 1) divisé par le nombre de placements libres
+    à ce moment. Le nombre de tirages suit une loi géométrique de paramètre p : son espérance est 1 / p.
+
+    Parameters
+    ----------
+    grille : np.array
+        La grille de référence.
+    config : ConfigurationJeu, optional
+        La configuration qui donne la flotte. Par défaut, la configuration standard.
+
+    Returns
+    -------
+    int | Fraction
+        L'espérance du nombre de tirages (un entier lorsque la division tombe juste).
+    """
+    esperance = Fraction(1)
+    partielle = np.zeros(grille.shape)  # Grille contenant les bateaux déjà posés
+
+    for indice_bateau, taille in config.bateaux.items():
+        libres = compter_placements(indice_bateau, partielle, config=config)
+
+        # Placements donnant exactement les cases du bateau (elles sont libres : une case ne porte qu'un bateau)
+        cases = np.flatnonzero(grille.ravel() == indice_bateau)
+        favorables = int((tableau_placements(grille.shape, taille) == cases).all(axis=1).sum()) if len(cases) == taille else 0
+        if favorables == 0:
+            raise ValueError(f"La grille ne peut pas être produite par le générateur (bateau {indice_bateau}).")
+
+        esperance *= Fraction(libres, favorables)
+        partielle[grille == indice_bateau] = indice_bateau
+
+    return esperance.numerator if esperance.denominator == 1 else esperance
+
+def findLambda(N: int, config: ConfigurationJeu = ConfigurationJeu(), rng: np.random.Generator = None) -> float:
+    """
+    Calcule la proportion de grilles valides où aucun des bateaux ne se chevauche après 
+    avoir placé 5 bateaux dans une grille 10x10.
+
+    La fonction génère N grilles aléatoires et place des bateaux sur chacune en s'assurant
+    que les bateaux sont placés soit horizontalement soit verticalement. Elle calcule ensuite
+    la proportion de grilles dans lesquelles les bateaux ne se chevauchent pas.
+    Le calcul est délégué à 'estimer_lambda', avec exactement N grilles.
+
+    Parameters
+    ----------
+    - N (int): Le nombre de grilles à générer.
+    - config (ConfigurationJeu, optionnel): Les dimensions de la grille et la flotte. Par défaut, la configuration standard.
+    - rng (np.random.Generator, optionnel): Le générateur des tirages. Par défaut, un nouveau générateur initialisé par le système.
+
+    Returns
+    -------
+    - float: La proportion de grilles valides (sans chevauchement de bateaux).
+    """
+    return estimer_lambda(largeur=0, rng=rng, n_max=N, config=config)[0]
+
+@lru_cache(maxsize=None)
+def masques_directions(forme: tuple[int, int], taille: int) -> tuple[np.array, np.array]:
+    """
+    Retourne les masques de bits des placements d'un bateau, rangés par direction et par case de départ.
+
+    Un masque est découpé en mots de 64 bits (bit x * colonnes + y), ce qui permet de tester des chevauchements
+    pour de nombreuses grilles à la fois avec des opérations NumPy sur des entiers non signés.
+
+    Parameters
+    ----------
+    forme : tuple[int, int]
+        Les dimensions (lignes, colonnes) de la grille.
+    taille : int
+        La taille du bateau.
+
+    Returns
+    -------
+    tuple[np.array, np.array]
+        Les masques horizontaux, de forme (lignes, colonnes - taille + 1, mots), puis les masques verticaux,
+        de forme (lignes - taille + 1, colonnes, mots). Les tableaux sont en lecture seule.
+    """
+    lignes, colonnes = forme
+    mots = (lignes * colonnes + 63) // 64
+    resultat = []
+
+    for est_vertical, (n_x, n_y) in ((False, (lignes, colonnes - taille + 1)), (True, (lignes - taille + 1, colonnes))):
+        masques = np.zeros((max(n_x, 0), max(n_y, 0), mots), dtype=np.uint64)
+        for x in range(n_x):
+            for y in range(n_y):
+                masque = index_placements(forme, taille)[(x, y, est_vertical)][0]
+                masques[x, y] = [(masque >> (64 * k)) & (2 ** 64 - 1) for k in range(mots)]
+        masques.flags.writeable = False
+        resultat.append(masques)
+
+    return resultat[0], resultat[1]
+
+def estimer_lambda(largeur: float = 1e-4, confiance: float = 0.95, rng: np.random.Generator = None, taille_lot: int = 1 << 18, n_max: int = None, config: ConfigurationJeu = ConfigurationJeu()) -> tuple[float, tuple[float, float], int]:
+    """
+    Estime la proportion lambda de grilles sans chevauchement lorsque chaque bateau est placé indépendamment
+    (direction tirée à pile ou face, puis position uniforme où le bateau tient dans la grille), comme 'findLambda'.
+
+    Les grilles sont simulées par lots : tous les placements d'un lot sont tirés d'un coup et les chevauchements
+    sont détectés par ET bit à bit entre le masque des cases déjà occupées et celui du bateau ('masques_directions').
+    Les lots s'enchaînent jusqu'à ce que l'intervalle de confiance de Wilson soit assez étroit. Contrairement à
+    l'intervalle de Wald (p +- z * sqrt(p(1 - p) / n)), il ne se réduit pas à un point quand aucune grille, ou
+    toutes, sont valides : une flotte qui tient rarement dans la grille n'arrête pas l'estimation au premier lot.
+
+    Parameters
+    ----------
+    largeur : float, optional
+        La largeur visée de l'intervalle de confiance.
+    confiance : float, optional
+        Le niveau de confiance de l'intervalle (0.95 par défaut).
+    rng : np.random.Generator, optional
+        Le générateur aléatoire à utiliser. Par défaut, un nouveau générateur initialisé par le système.
+    taille_lot : int, optional
+        Le nombre de grilles simulées par lot.
+    n_max : int, optional
+        Le nombre maximal de grilles simulées. Par défaut, aucune limite.
+    config : ConfigurationJeu, optional
+        Les dimensions de la grille et la flotte. Par défaut, la configuration standard.
+
+    Returns
+    -------
+    tuple[float, tuple[float, float], int]
+        L'estimation de lambda, l'intervalle de confiance (bas, haut) et le nombre de grilles simulées.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    z = NormalDist().inv_cdf((1 + confiance) / 2)  # Quantile de la loi normale
+    valides, n = 0, 0
+
+    while True:
+        taille = taille_lot if n_max is None else min(taille_lot, n_max - n)
+        if taille > 0:
+            valides += _simuler_lambda(taille, rng, config)
+            n += taille
+
+        # Intervalle de confiance de Wilson autour de la proportion observée
+        estimation = valides / n if n else 0.0
+        if n:
+            centre = (estimation + z * z / (2 * n)) / (1 + z * z / n)
+            demi_largeur = z / (1 + z * z / n) * math.sqrt(estimation * (1 - estimation) / n + z * z / (4 * n * n))
+        else:
+            centre, demi_largeur = 0.5, math.inf
+
+        if 2 * demi_largeur <= largeur or (n_max is not None and n >= n_max):
+            return estimation, (max(centre - demi_largeur, 0.0), min(centre + demi_largeur, 1.0)), n
+
+def _simuler_lambda(n: int, rng: np.random.Generator, config: ConfigurationJeu) -> int:
+    """
+    Simule 'n' grilles de 'estimer_lambda' et retourne le nombre de grilles sans chevauchement.
+    """
+    lignes, colonnes = config.forme
+    occupees = None  # Masques des cases occupées, un par grille
+    valides = np.ones(n, dtype=bool)
+
+    for taille in config.tailles:
+        horizontaux, verticaux = masques_directions(config.forme, taille)
+
+        # Direction, puis position de départ uniforme parmi celles où le bateau tient dans la grille
+        vertical = rng.integers(0, 2, size=n, dtype=bool)
+        masques = np.where(
+            vertical[:, None],
+            verticaux[rng.integers(0, lignes - taille + 1, size=n), rng.integers(0, colonnes, size=n)],
+            horizontaux[rng.integers(0, lignes, size=n), rng.integers(0, colonnes - taille + 1, size=n)],
+        )
+
+        if occupees is None:
+            occupees = masques
+        else:
+            valides &= ~(occupees & masques).any(axis=1)
+            occupees |= masques
+
+    return int(valides.sum())
+
+# Évaluation en continu d'une stratégie : les statistiques sont tenues à jour partie après partie
+# (algorithme de Welford), si bien que l'évaluation peut s'arrêter dès que la moyenne est assez précise.
+
+class StatistiquesEnLigne:
+    """
+    Moyenne, variance (algorithme de Welford) et histogramme d'une suite de valeurs entières,
+    mis à jour valeur par valeur ou par lots, sans conserver les valeurs.
+    """
+
+    # Attributs
+    n: int
+    moyenne: float
+    histogramme: Counter
+
+    # Constructeur
+    def __init__(self) -> None:
+        self.n = 0
+        self.moyenne = 0.0
+        self._m2 = 0.0  # Somme des carrés des écarts à la moyenne
+        self.histogramme = Counter()
+
+    # Méthodes
+    def ajouter(self, valeur: int) -> None:
+        """
+        Ajoute une valeur.
+        """
+        self.n += 1
+        ecart = valeur - self.moyenne
+        self.moyenne += ecart / self.n
+        self._m2 += ecart * (valeur - self.moyenne)
+        self.histogramme[valeur] += 1
+
+    def ajouter_lot(self, valeurs: np.array) -> None:
+        """
+        Ajoute un lot de valeurs, en fusionnant ses statistiques avec les statistiques courantes (Chan et al.).
+        """
+        valeurs = np.asarray(valeurs)
+        n = len(valeurs)
+        if n == 0:
+            return
+
+        moyenne = float(valeurs.mean())
+        m2 = float(((valeurs - moyenne) ** 2).sum())
+        ecart = moyenne - self.moyenne
+        total = self.n + n
+
+        self.moyenne += ecart * n / total
+        self._m2 += m2 + ecart ** 2 * self.n * n / total
+        self.n = total
+        self.histogramme.update(valeurs.tolist())
+
+    @property
+    def variance(self) -> float:
+        """
+        La variance empirique (non biaisée) des valeurs.
+        """
+        return self._m2 / (self.n - 1) if self.n > 1 else math.inf
+
+    @property
+    def ecart_type(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def erreur_type(self) -> float:
+        """
+        L'erreur type de la moyenne.
+        """
+        return math.sqrt(self.variance / self.n) if self.n > 1 else math.inf
+
+    def __repr__(self) -> str:
+        return f"StatistiquesEnLigne(n={self.n}, moyenne={self.moyenne:.4f}, ecart_type={self.ecart_type:.4f})"
+
+def evaluer_en_continu(jouer, erreur_type_max: float = None, duree_max: float = None, n_max: int = None, n_min: int = 30, periode_rapport: float = 1.0, rapport=print) -> StatistiquesEnLigne:
+    """
+    Joue des parties jusqu'à ce que l'erreur type de la moyenne passe sous 'erreur_type_max', que la durée
+    dépasse 'duree_max' ou que 'n_max' parties aient été jouées (le premier critère atteint l'emporte).
+
+    Parameters
+    ----------
+    jouer : () -> int | np.array
+        Joue une partie et retourne son résultat, ou joue un lot de parties et retourne le tableau des résultats.
+    erreur_type_max : float, optional
+        L'erreur type visée pour la moyenne.
+    duree_max : float, optional
+        Le temps maximal (en secondes).
+    n_max : int, optional
+        Le nombre maximal de parties (un lot entamé est compté en entier).
+    n_min : int, optional
+        Le nombre minimal de parties avant de tester l'erreur type.
+    periode_rapport : float, optional
+        L'intervalle (en secondes) entre deux rapports d'avancement.
+    rapport : str -> None, optional
+        La fonction qui reçoit les rapports d'avancement (nombre de parties, moyenne, erreur type, parties/s).
+        'None' pour ne rien afficher.
+
+    Returns
+    -------
+    StatistiquesEnLigne
+        Les statistiques des parties jouées ; l'histogramme peut être tracé ensuite.
+    """
+    if erreur_type_max is None and duree_max is None and n_max is None:
+        raise ValueError("Il faut au moins un critère d'arrêt : erreur_type_max, duree_max ou n_max.")
+
+    statistiques = StatistiquesEnLigne()
+    debut = dernier_rapport = time.perf_counter()
+
+    while True:
+        resultat = jouer()
+        if np.ndim(resultat):
+            statistiques.ajouter_lot(resultat)
+        else:
+            statistiques.ajouter(int(resultat))
+
+        maintenant = time.perf_counter()
+        termine = (
+            (erreur_type_max is not None and statistiques.n >= n_min and statistiques.erreur_type <= erreur_type_max)
+            or (duree_max is not None and maintenant - debut >= duree_max)
+            or (n_max is not None and statistiques.n >= n_max)
+        )
+
+        if rapport is not None and (termine or maintenant - dernier_rapport >= periode_rapport):
+            dernier_rapport = maintenant
+            rapport(f"{statistiques.n:>10,} parties, moyenne {statistiques.moyenne:.3f} ± {statistiques.erreur_type:.3f}, "
+                    f"{statistiques.n / max(maintenant - debut, 1e-9):,.0f} parties/s")
+
+        if termine:
+            return statistiques
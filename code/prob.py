@@ -1,26 +1,70 @@
+import os
 import numpy as np
-import matplotlib.pyplot as plt
-import random
+from typing import NamedTuple
+from functools import lru_cache
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
-from mod import generer_grille_aleatoire, bateaux
+from mod import generer_grille_aleatoire, generer_grilles_aleatoires, tableau_placements, placements_par_case, carte_couverture, Grille, ConfigurationJeu, \
+    EchantillonneurConditionnel, TableTransposition, probabilites_exactes, StatistiquesEnLigne, evaluer_en_continu, TiragesParLots, tirages_par_lots
+
+# États possibles d'un coup
+MANQUE, TOUCHE, COULE = 0, 1, 2
 
 # Implémentation des classes
 
+class ResultatTir(NamedTuple):
+    """
+    Résultat d'un coup retourné par 'Bataille.joue'.
+
+    Un résultat est vrai si le coup a touché un bateau : 'if b.joue(position)' garde donc le sens
+    de l'ancien retour (numéro du bateau touché, ou 0).
+    """
+    etat: int  # MANQUE, TOUCHE ou COULE (dernière case du bateau)
+    bateau: int  # Indice du bateau touché (0 si le coup est manqué)
+    bateaux_restants: int  # Nombre de bateaux non coulés après le coup
+
+    def __bool__(self) -> bool:
+        return self.etat != MANQUE
+
 class Bataille:
     # Attributs
-    grille: np.array
+    grille: np.ndarray | Grille
+    config: ConfigurationJeu
+    restantes: int  # Nombre de cases de bateaux encore intactes
+    restantes_bateaux: list[int]  # Nombre de cases intactes de chaque bateau (indexé par l'indice du bateau)
+    bateaux_restants: int  # Nombre de bateaux non coulés
+    tirages: TiragesParLots  # Tirages aléatoires de la partie (grilles de 'reset' et décisions aléatoires des stratégies)
 
     # Constructeur
-    def __init__(self)-> None:
-        self.grille = generer_grille_aleatoire()
+    def __init__(self, grille: np.ndarray | Grille = None, config: ConfigurationJeu = ConfigurationJeu(), rng: np.random.Generator | TiragesParLots = None)-> None:
+        # Une grille fournie (tableau NumPy ou 'Grille' compacte) est jouée telle quelle, sinon une grille aléatoire est générée.
+        # Toutes les parties jouées sur cette instance tirent dans 'rng' : un générateur initialisé les rend reproductibles.
+        self.config = config
+        self.tirages = tirages_par_lots(rng)
+        self.grille = generer_grille_aleatoire(config=config, rng=self.tirages) if grille is None else grille
+        self._initialiser_compteurs()
     
+    def _initialiser_compteurs(self) -> None:
+        """
+        Compte, une fois par grille, les cases de chaque bateau. 'joue' tient ensuite ces compteurs à jour,
+        si bien que la victoire se lit sur un seul entier.
+        """
+        if isinstance(self.grille, Grille):
+            self.restantes_bateaux = [plateau.bit_count() for plateau in self.grille.plateaux]
+        else:
+            self.restantes_bateaux = np.bincount(np.asarray(self.grille, dtype=np.int64).ravel(), minlength=len(self.config.tailles) + 1).tolist()
+            self.restantes_bateaux[0] = 0  # Les cases vides ne sont pas comptées
+
+        self.restantes = sum(self.restantes_bateaux)
+        self.bateaux_restants = sum(1 for cases in self.restantes_bateaux if cases)
 
     # Méthodes
-    def joue(self, position: tuple[int, int]) -> int:
+    def joue(self, position: tuple[int, int]) -> ResultatTir:
         """
         Cible la position passée en paramètre et vérifie s'il y a un bateau à cette position.
-        Si un bateau est touché (grille[x][y] != 0), il est retiré de la grille (grille[x][y] = 0) 
-        et la fonction retourne le numéro du bateau touché. Sinon, elle retourne 0 (aucun bateau).
+        Si un bateau est touché (grille[x][y] != 0), il est retiré de la grille (grille[x][y] = 0).
+        Les compteurs de cases restantes sont mis à jour au passage.
 
         Parameters
         ----------
@@ -29,19 +73,28 @@ class Bataille:
 
         Returns
         -------
-        int :
-            Le numéro du bateau touché (si un bateau est à la position donnée) ou 0 si aucun bateau n'est touché.
+        ResultatTir :
+            L'état du coup (MANQUE, TOUCHE, ou COULE si c'était la dernière case du bateau), le numéro du bateau
+            touché (0 si aucun bateau n'est touché) et le nombre de bateaux restants.
         """
         
         x, y = position  # Décompose le tuple en coordonnées x et y
         
+        bateau_touche = int(self.grille[x, y])  # Numéro du bateau présent sur la case (0 si elle est vide)
+
         # Si la position cible contient un bateau (grille[x][y] != 0)
-        if self.grille[x][y] != 0:
-            bateau_touche = self.grille[x][y]  # Sauvegarde le numéro du bateau touché
-            self.grille[x][y] = 0  # Retire le bateau de la grille (marque la case comme vide)
-            return bateau_touche  # Retourne le numéro du bateau touché
+        if bateau_touche:
+            self.grille[x, y] = 0  # Retire le bateau de la grille (marque la case comme vide)
+            self.restantes -= 1
+            self.restantes_bateaux[bateau_touche] -= 1
+
+            # Dernière case du bateau : il est coulé
+            if not self.restantes_bateaux[bateau_touche]:
+                self.bateaux_restants -= 1
+                return ResultatTir(COULE, bateau_touche, self.bateaux_restants)
+            return ResultatTir(TOUCHE, bateau_touche, self.bateaux_restants)
         
-        return 0  # Retourne 0 si aucune partie de bateau n'a été touchée
+        return ResultatTir(MANQUE, 0, self.bateaux_restants)  # Aucune partie de bateau n'a été touchée
     
     def victoire(self) -> bool:
         """
@@ -54,25 +107,152 @@ class Bataille:
             sinon False.
         """
         
-        # Vérifie si la grille est entièrement remplie de zéros (c'est-à-dire qu'il n'y a plus de bateaux).
-        return np.array_equal(self.grille, np.zeros((10, 10)))
+        # Plus aucune case de bateau intacte : le compteur tenu à jour par 'joue' remplace le parcours de la grille
+        return self.restantes == 0
 
     
     def reset(self) -> None:
         """
         Réinitialise le jeu en générant une nouvelle grille de jeu avec des bateaux placés aléatoirement.
-        La grille actuelle est remplacée par une nouvelle grille générée.
+        La grille actuelle est remplacée par une nouvelle grille générée, de la même représentation.
+        """
+        self.grille = generer_grille_aleatoire(compacte=isinstance(self.grille, Grille), config=self.config, rng=self.tirages)
+        self._initialiser_compteurs()
+
+
+class BatailleEnregistree(Bataille):
+    """
+    Partie qui enregistre ses coups (liste 'coups', vidée par 'reset') et sa grille initiale, pour le journal
+    des parties ('journal.EcrivainJournal'). Les parties ordinaires n'en paient pas le coût.
+    """
+    # Attributs
+    coups: list[tuple[int, int]]
+    grille_initiale: np.ndarray | Grille
+
+    def _initialiser_compteurs(self) -> None:
+        super()._initialiser_compteurs()
+        self.coups = []
+        self.grille_initiale = self.grille.copy()
+
+    def joue(self, position: tuple[int, int]) -> ResultatTir:
+        self.coups.append(position)
+        return super().joue(position)
+
+class CarteProbabilites:
+    """
+    Carte de probabilités de 'Joueur.create_prob', tenue à jour coup après coup au lieu d'être reconstruite.
+
+    Pour chaque bateau non coulé, on garde l'ensemble de ses placements encore possibles (ceux qui ne recouvrent
+    aucune case interdite) et la densité, somme de leurs cartes de couverture. Lorsqu'une case devient interdite,
+    seuls les placements qui la recouvrent sont retirés, grâce à l'index inverse 'placements_par_case' ;
+    lorsqu'un bateau est coulé, sa contribution entière est retirée.
+    """
+
+    # Attributs
+    config: ConfigurationJeu
+    forme: tuple[int, int]
+
+    # Constructeur
+    def __init__(self, config: ConfigurationJeu = ConfigurationJeu(), forme: tuple[int, int] = None) -> None:
         """
-        self.grille = generer_grille_aleatoire()
+        Parameters
+        ----------
+        config : ConfigurationJeu, optional
+            La configuration qui donne la flotte. Par défaut, la configuration standard.
+        forme : tuple[int, int], optional
+            Les dimensions de la grille. Par défaut, celles de la configuration.
+        """
+        self.config = config
+        self.forme = tuple(forme) if forme is not None else config.forme
+        cases = self.forme[0] * self.forme[1]
+
+        # Placements encore possibles de chaque bateau non coulé, et densité correspondante (entière)
+        self._vivants = {bateau: np.ones(len(tableau_placements(self.forme, taille)), dtype=bool) for bateau, taille in config.bateaux.items()}
+        self._densite = sum(np.bincount(tableau_placements(self.forme, taille).ravel(), minlength=cases) for taille in config.tailles)
+
+        # Ce qui a déjà été pris en compte : cases interdites, cases jouées, bateaux coulés
+        self._interdites: set[tuple[int, int]] = set()
+        self._jouees: set[tuple[int, int]] = set()
+        self._coules: set[int] = set()
+        self._masque_jouees = np.zeros(cases, dtype=bool)
+
+    def mettre_a_jour(self, ensemble_positions: set[tuple[int, int]], ensemble_positions_bateaux: set[tuple[int, int]], coules: set[int] = frozenset()) -> np.array:
+        """
+        Intègre les nouveaux coups, puis retourne la carte : le résultat est exactement celui de
+        'Joueur.create_prob(forme, ensemble_positions, ensemble_positions_bateaux, coules)'.
+
+        Seules les différences avec l'appel précédent sont traitées ; les ensembles ne peuvent que grandir
+        (une case touchée devient interdite lorsque son bateau est coulé, jamais l'inverse).
+
+        Parameters
+        ----------
+        ensemble_positions : set[tuple[int, int]]
+            Les positions déjà jouées.
+        ensemble_positions_bateaux : set[tuple[int, int]]
+            Les positions des bateaux touchés et non coulés.
+        coules : set[int], optional
+            Les indices des bateaux déjà coulés.
+
+        Returns
+        -------
+        np.array :
+            La carte de probabilités, de la forme de la grille.
+        """
+        colonnes = self.forme[1]
+
+        # Bateaux coulés depuis le dernier appel : leur contribution est retirée en entier
+        for bateau in coules - self._coules:
+            if bateau in self._vivants:
+                self._retirer(bateau, self._vivants.pop(bateau))
+        self._coules |= coules
+
+        # Nouvelles cases interdites : seuls les placements encore possibles qui les recouvrent sont retirés
+        nouvelles = ensemble_positions - ensemble_positions_bateaux - self._interdites
+        if nouvelles:
+            self._interdites |= nouvelles
+            indices = [x * colonnes + y for x, y in nouvelles]
+            for bateau, vivants in self._vivants.items():
+                index = placements_par_case(self.forme, self.config.taille(bateau))
+                candidats = np.concatenate([index[i] for i in indices])
+                retires = np.zeros_like(vivants)
+                retires[candidats] = vivants[candidats]
+                if retires.any():
+                    vivants &= ~retires
+                    self._retirer(bateau, retires)
+
+        # Nouvelles cases jouées : leur probabilité est mise à 0 dans la carte retournée
+        for x, y in ensemble_positions - self._jouees:
+            self._masque_jouees[x * colonnes + y] = True
+        self._jouees |= ensemble_positions
+
+        carte = np.where(self._masque_jouees, 0, self._densite).astype(float)
+        return carte.reshape(self.forme)
+
+    def _retirer(self, bateau: int, placements: np.array) -> None:
+        """
+        Retire de la densité la couverture des placements sélectionnés (masque booléen) d'un bateau.
+        """
+        cases = tableau_placements(self.forme, self.config.taille(bateau))[placements]
+        self._densite -= np.bincount(cases.ravel(), minlength=len(self._densite))
 
 
 class Joueur:
-    
+    # Attributs
+    config: ConfigurationJeu
+    table: TableTransposition
+
+    # Constructeur
+    def __init__(self, config: ConfigurationJeu = ConfigurationJeu(), capacite_table: int = 4096) -> None:
+        # La configuration donne la flotte recherchée par les stratégies probabilistes
+        self.config = config
+        # Table de transposition de 'jouer_exact', partagée par toutes les parties du joueur
+        self.table = TableTransposition(capacite_table)
+
     # Version aléatoire.
     def jouer_alea(self, b: Bataille) -> int:
         """
         Joue aléatoirement des coups sur la grille de la partie 'Bataille' jusqu'à ce que le joueur gagne.
-        Les positions déjà jouées sont stockées pour éviter de tirer plusieurs fois la même position.
+        L'ordre des coups est une permutation aléatoire des cases, tirée en une fois : aucune case n'est jouée deux fois.
 
         Parameters
         ----------
@@ -86,31 +266,22 @@ class Joueur:
         """
         
         res: int = 0  # Compteur du nombre de coups joués
-        ensemble_positions: set[tuple[int, int]] = set()  # Ensemble qui stocke les positions déjà jouées
+        lignes, colonnes = b.grille.shape
+        ordre = iter(b.tirages.permutation(lignes * colonnes))  # Ordre de tir des cases (x * colonnes + y)
         
         # Tant que la victoire n'est pas atteinte (il reste des bateaux sur la grille)
         while not b.victoire():
-            # Tirer aléatoirement une position (ligne et colonne)
-            x = int(random.random() * b.grille.shape[0])  # Ligne aléatoire
-            y = int(random.random() * b.grille.shape[1])  # Colonne aléatoire
-            
-            # Si la position a déjà été jouée, tirer une nouvelle position
-            while (x, y) in ensemble_positions:
-                x = int(random.random() * b.grille.shape[0])  # Nouvelle ligne aléatoire
-                y = int(random.random() * b.grille.shape[1])  # Nouvelle colonne aléatoire
-
-            # Incrémenter le nombre de coups joués
+            # Incrémenter le nombre de coups joués et jouer la case suivante de la permutation
             res += 1
-            b.joue((x, y))  # Jouer à la position (x, y)
-            ensemble_positions.add((x, y))  # Ajouter la position au set des positions jouées
+            b.joue(divmod(next(ordre), colonnes))
 
         return res  # Retourner le nombre total de coups joués
 
     
-    def shout(self, b, ensemble_positions: set[tuple[int, int]], position: tuple[int, int]) -> int:
+    def shout(self, b, ensemble_positions: set[tuple[int, int]], position: tuple[int, int], bateau: int = None) -> int:
         """
         Tente de détruire complètement un bateau à partir d'une position donnée en explorant dans toutes les directions
-        (haut, bas, gauche, droite) jusqu'à épuiser les possibilités.
+        (haut, bas, gauche, droite) jusqu'à épuiser les possibilités, ou jusqu'à ce que le bateau visé soit coulé.
 
         Parameters
         ----------
@@ -120,6 +291,9 @@ class Joueur:
             Ensemble des positions déjà attaquées, pour éviter de tirer plusieurs fois sur les mêmes cases.
         position : tuple[int, int]
             Position initiale (x, y) où un bateau a été détecté.
+        bateau : int, optional
+            L'indice du bateau touché en 'position'. Dès qu'il est coulé, l'exploration s'arrête.
+            Par défaut, toutes les directions sont explorées.
 
         Returns
         -------
@@ -127,94 +301,20 @@ class Joueur:
             Le nombre total de coups effectués (incluant les coups qui n'ont pas touché).
         """
         
-        res = 0  # Nombre de coups effectués
-        x, y = position  # Décompose la position initiale en x et y
-
-        # Initialise les directions possibles : [droite, bas, gauche, haut]
-        directions = [1, 1, 1, 1]
-        
-        # Désactiver certaines directions si elles ne sont pas possibles
-        if x == 0 or (x - 1, y) in ensemble_positions:  # Pas de déplacement vers le haut
-            directions[3] = 0
-        if x == b.grille.shape[0] - 1 or (x + 1, y) in ensemble_positions:  # Pas de déplacement vers le bas
-            directions[1] = 0
-        if y == 0 or (x, y - 1) in ensemble_positions:  # Pas de déplacement vers la gauche
-            directions[2] = 0
-        if y == b.grille.shape[1] - 1 or (x, y + 1) in ensemble_positions:  # Pas de déplacement vers la droite
-            directions[0] = 0
-
-        # Tant qu'il reste des directions à explorer
-        while sum(directions) > 0:
-            # Choisir aléatoirement une direction parmi celles disponibles
-            rand = random.randint(0, 3)
-            while not directions[rand]:  # Si la direction choisie n'est plus valide, en choisir une autre
-                rand = random.randint(0, 3)
-
-            if rand == 0:  # Vers la droite (y augmente)
-                y += 1
-                while y < b.grille.shape[1]:
-                    res += 1
-                    if b.grille[x][y] != 0:  # Si un bateau est touché
-                        b.grille[x][y] = 0  # Détruire la case
-                        ensemble_positions.add((x, y))
-                    else:  # Si la case est vide, on arrête d'explorer cette direction
-                        ensemble_positions.add((x, y))
-                        break
-                    y += 1
-                x, y = position  # Retour à la position initiale
-                directions[rand] = 0  # Désactiver cette direction
-
-            elif rand == 1:  # Vers le bas (x augmente)
-                x += 1
-                while x < b.grille.shape[0]:
-                    res += 1
-                    if b.grille[x][y] != 0:
-                        b.grille[x][y] = 0
-                        ensemble_positions.add((x, y))
-                    else:
-                        ensemble_positions.add((x, y))
-                        break
-                    x += 1
-                x, y = position
-                directions[rand] = 0
-
-            elif rand == 2:  # Vers la gauche (y diminue)
-                y -= 1
-                while y >= 0:
-                    res += 1
-                    if b.grille[x][y] != 0:
-                        b.grille[x][y] = 0
-                        ensemble_positions.add((x, y))
-                    else:
-                        ensemble_positions.add((x, y))
-                        break
-                    y -= 1
-                x, y = position
-                directions[rand] = 0
-
-            else:  # Vers le haut (x diminue)
-                x -= 1
-                while x >= 0:
-                    res += 1
-                    if b.grille[x][y] != 0:
-                        b.grille[x][y] = 0
-                        ensemble_positions.add((x, y))
-                    else:
-                        ensemble_positions.add((x, y))
-                        break
-                    x -= 1
-                x, y = position
-                directions[rand] = 0
-
-        return res  # Retourne le nombre total de coups effectués
+        # Une direction est possible si la case voisine est dans la grille et n'a pas encore été jouée
+        x, y = position
+        rayons_position = rayons_cases(b.grille.shape)[x][y]
+        disponibles = [bool(rayon) and rayon[0] not in ensemble_positions for rayon in rayons_position]
 
+        return self.cibler(b, ensemble_positions, rayons_position, directions_aleatoires(disponibles, b.tirages), bateau)
 
     def jouer_heuristique(self, b: Bataille):
         """
         Cette fonction permet de jouer une partie de bataille navale en suivant une heuristique simple.
         Le joueur tire aléatoirement des coups sur la grille jusqu'à ce que tous les bateaux soient coulés.
 
-        L'algorithme fonctionne en tirant aléatoirement une position (x, y) sur la grille. Si un bateau est touché,
+        L'algorithme fonctionne en tirant aléatoirement une position (x, y) sur la grille (la prochaine case non jouée
+        d'une permutation aléatoire des cases, tirée en une fois en début de partie). Si un bateau est touché,
         il tente de le couler complètement. Le jeu continue jusqu'à ce que la fonction 'victoire' de l'objet 'Bataille'
         renvoie `True`, signifiant que tous les bateaux sont détruits.
 
@@ -235,27 +335,27 @@ class Joueur:
         # Un ensemble pour garder une trace des positions déjà jouées (éviter de rejouer au même endroit)
         ensemble_positions: set[tuple[int, int]] = set()
 
+        # Ordre de chasse : une permutation aléatoire des cases (x * colonnes + y)
+        lignes, colonnes = b.grille.shape
+        ordre = iter(b.tirages.permutation(lignes * colonnes))
+
         # Boucle principale du jeu : continue tant que tous les bateaux ne sont pas coulés
         while not b.victoire():
-            # Tirage aléatoire d'une position sur la grille
-            x = random.randint(0, b.grille.shape[0] - 1)  # Choisit une ligne au hasard
-            y = random.randint(0, b.grille.shape[1] - 1)  # Choisit une colonne au hasard
-
-            # Si la position a déjà été jouée, tirer de nouveau jusqu'à trouver une position non jouée
+            # Prochaine case de la permutation, en sautant celles déjà jouées par 'shout'
+            x, y = divmod(next(ordre), colonnes)
             while (x, y) in ensemble_positions:
-                x = random.randint(0, b.grille.shape[0] - 1)
-                y = random.randint(0, b.grille.shape[1] - 1)
+                x, y = divmod(next(ordre), colonnes)
 
             # Ajouter cette position à l'ensemble des positions jouées
             ensemble_positions.add((x, y))
 
-            # Jouer à la position (x, y) et obtenir l'Id du bateau touché (i > 0 si un bateau est touché)
+            # Jouer à la position (x, y) et obtenir le résultat du coup (vrai si un bateau est touché)
             i = b.joue((x, y))
 
-            # Si un bateau est touché, tenter de le couler complètement
-            if i > 0:
+            # Si un bateau est touché sans être coulé, tenter de le couler complètement
+            if i and i.etat != COULE:
                 # La méthode `shout` est appelée pour couler le bateau autour de la position touchée (x, y)
-                res += self.shout(b, ensemble_positions, (x, y))
+                res += self.shout(b, ensemble_positions, (x, y), i.bateau)
 
             # Incrémenter le nombre total de coups joués (coup initial + tentatives de couler le bateau)
             res += 1
@@ -277,7 +377,7 @@ class Joueur:
         prob : np.array
             Un tableau numpy 2D représentant la grille où chaque cellule contient une probabilité.
         bateau : int 
-            Un entier représentant l'index du bateau à placer. Sa longueur est déterminée par le tableau global `bateaux`.
+            Un entier représentant l'index du bateau à placer. Sa longueur est déterminée par la configuration du joueur.
         position : tuple[int, int]
             Un tuple (x, y) indiquant la position de départ du bateau sur la grille.
         direction : bool
@@ -297,8 +397,8 @@ class Joueur:
         # Extraire les coordonnées initiales (x, y) du tuple `position`
         x, y = position
         
-        # Déterminer la longueur du bateau à partir du tableau global `bateaux`
-        length = bateaux[bateau]
+        # Déterminer la longueur du bateau à partir de la configuration
+        length = self.config.taille(bateau)
         
         # Cas où le bateau est placé verticalement
         if direction:
@@ -341,12 +441,13 @@ class Joueur:
         # Si toutes les cellules sont valides, retour True
         return True
     
-    def create_prob(self, shape: tuple[int, int], ensemble_positions: set[tuple[int, int]], ensemble_positions_bateaux: set[tuple[int, int]]) -> np.array:
+    def create_prob(self, shape: tuple[int, int], ensemble_positions: set[tuple[int, int]], ensemble_positions_bateaux: set[tuple[int, int]], coules: set[int] = frozenset()) -> np.array:
         """
             Génère une grille de probabilités pour le placement des bateaux, en tenant compte des positions interdites.
 
             Cette fonction crée une matrice de probabilités indiquant la faisabilité de placer un bateau dans chaque cellule. 
             Les cellules interdites, c'est-à-dire celles où un bateau ne peut pas être placé, ont une probabilité de 0.
+            Le calcul est vectorisé ('carte_couverture') et s'applique à une grille de dimensions quelconques.
 
             Parameters
             ----------
@@ -359,6 +460,8 @@ class Joueur:
             ensemble_positions_bateaux : set[tuple[int, int]])
                 Un ensemble de tuples (x, y) représentant les positions des bateaux déjà touchés 
             ou en cours de placement.
+            coules : set[int], optional
+                Les indices des bateaux déjà coulés : leurs tailles ne sont plus prises en compte.
 
             Returns
             -------
@@ -367,26 +470,19 @@ class Joueur:
             endroit, en tenant compte des positions interdites et des bateaux déjà placés.
         """
         
-        # Initialiser un tableau numpy de probabilités, de dimensions `shape`, avec toutes les cellules à 0
-        prob = np.zeros(shape)
-
-        # Parcourir chaque bateau à placer (les longueurs des bateaux sont stockées dans le tableau global `bateaux`)
-        for x in bateaux:
-            # Initialiser un tableau temporaire pour les probabilités de placement du bateau actuel
-            tmp = np.zeros(shape)
-
-            # Parcourir chaque cellule de la grille
-            for i in range(shape[0]):
-                for j in range(shape[1]):
-                    # Si la cellule (i, j) est dans les positions interdites ou déjà occupées par un bateau, on l'ignore
-                    if (i, j) not in (ensemble_positions - ensemble_positions_bateaux):
-                        # Mise à jour des probabilités pour un placement vertical du bateau
-                        self.update_prob(tmp, x, (i, j), True, ensemble_positions - ensemble_positions_bateaux)
-                        # Mise à jour des probabilités pour un placement horizontal du bateau
-                        self.update_prob(tmp, x, (i, j), False, ensemble_positions - ensemble_positions_bateaux)
-
-            # Ajouter les probabilités calculées pour ce bateau à la grille globale de probabilités
-            prob += tmp
+        # Aucune case jouée : la carte de la grille vide est précalculée une fois par configuration
+        if not ensemble_positions and not coules and tuple(shape) == self.config.forme:
+            return self.config.carte_vide().copy()
+
+        # Masque des cases interdites : jouées sans toucher de bateau encore à couler
+        bloquees = np.zeros(shape, dtype=bool)
+        for i, j in ensemble_positions - ensemble_positions_bateaux:
+            bloquees[i, j] = True
+
+        # Couverture de tous les bateaux restants à la fois, par fenêtres libres (les longueurs des bateaux
+        # sont données par la configuration)
+        tailles = tuple(taille for x, taille in self.config.bateaux.items() if x not in coules)
+        prob = carte_couverture(bloquees, tailles).astype(float)
 
         # Assurer que toutes les cellules interdites ou déjà occupées aient une probabilité de 0
         for x, y in ensemble_positions:
@@ -421,7 +517,38 @@ class Joueur:
         
         return max_position  # Retourne les coordonnées (i, j)
 
-    def shoot_probabiliste(self, b: Bataille, prob: np.array, ensemble_positions: set[tuple[int, int]], ensemble_positions_bateaux: set[tuple[int, int]], position: tuple[int, int]):
+    def enregistrer_touche(self, resultat: ResultatTir, position: tuple[int, int], ensemble_positions_bateaux: set[tuple[int, int]], touches: dict[int, list[tuple[int, int]]]) -> bool:
+        """
+        Enregistre une case touchée : elle est ajoutée aux cases des bateaux touchés et aux cases connues du bateau.
+        Lorsque le bateau est coulé, toutes ses cases sont retirées de 'ensemble_positions_bateaux' : elles ne
+        peuvent plus accueillir de bateau et deviennent des cases interdites pour 'create_prob'.
+
+        Parameters
+        ----------
+        resultat : ResultatTir
+            Le résultat du coup (qui doit avoir touché un bateau).
+        position : tuple[int, int]
+            La case touchée.
+        ensemble_positions_bateaux : set[tuple[int, int]]
+            L'ensemble des positions des bateaux touchés et non coulés.
+        touches : dict[int, list[tuple[int, int]]]
+            Les cases touchées de chaque bateau, indexées par l'indice du bateau.
+
+        Returns
+        -------
+        bool :
+            'True' si le coup a coulé le bateau.
+        """
+        touches.setdefault(resultat.bateau, []).append(position)
+        ensemble_positions_bateaux.add(position)
+
+        if resultat.etat == COULE:
+            ensemble_positions_bateaux.difference_update(touches[resultat.bateau])
+            return True
+
+        return False
+
+    def shoot_probabiliste(self, b: Bataille, prob: np.array, ensemble_positions: set[tuple[int, int]], ensemble_positions_bateaux: set[tuple[int, int]], position: tuple[int, int], bateau: int = None, touches: dict[int, list[tuple[int, int]]] = None):
         """
         Effectue des tirs probabilistes sur une grille de jeu pour tenter de couler un bateau.
 
@@ -438,96 +565,77 @@ class Joueur:
             Un ensemble pour stocker les positions des bateaux touchés.
         position : tuple[int, int] 
             Un tuple (x, y) représentant la position actuelle de tir.
+        bateau : int, optional
+            L'indice du bateau touché en 'position'. Dès qu'il est coulé, les tirs s'arrêtent.
+        touches : dict[int, list[tuple[int, int]]], optional
+            Les cases touchées de chaque bateau (voir 'enregistrer_touche'), complétées au fil des tirs.
 
         Returns
         -------
         int :
             Le nombre total de coups effectués durant le tir.
         """
-        res = 0  # Initialisation du nombre de coups effectués
-        x, y = position  # Décomposition de la position initiale
-
-        # Calcule des directions possibles (droite, bas, gauche, haut) avec les probabilités
-        directions = {}  # Dictionnaire pour stocker les directions et leurs probabilités
-        directions[0] = 0 if y == b.grille.shape[1] - 1 else prob[x, y + 1]  # Vers la droite
-        directions[1] = 0 if x == b.grille.shape[0] - 1 else prob[x + 1, y]  # Vers le bas
-        directions[2] = 0 if y == 0 else prob[x, y - 1]  # Vers la gauche
-        directions[3] = 0 if x == 0 else prob[x - 1, y]  # Vers le haut
-
-        # Continue tant qu'il reste des directions à explorer
-        while sum(directions.values()) > 0:  
-            # Sélectionne la meilleure direction selon la probabilité
-            best: int = max(directions, key=directions.get)
-
-            # Traite chaque direction possible
-            if best == 0:  # Vers la droite (y augmente)
-                y += 1
-                while y < b.grille.shape[1]:  # Parcourt les cases vers la droite
-                    res += 1  # Incrémente le compteur de coups
-                    if b.grille[x][y] != 0:  # Si un bateau est touché
-                        b.grille[x][y] = 0  # Marque la case comme détruite
-                        ensemble_positions.add((x, y))  # Ajoute à l'ensemble des positions
-                        ensemble_positions_bateaux.add((x, y))  # Ajoute à l'ensemble des bateaux
-                    else:  # Si aucune touche
-                        ensemble_positions.add((x, y))  # Ajoute à l'ensemble des positions
-                        break  # Quitte la boucle
-                    y += 1  # Avance vers la droite
-                x, y = position  # Retourne à la position initiale
-                directions[best] = 0  # Désactive cette direction
-
-            elif best == 1:  # Vers le bas (x augmente)
-                x += 1
-                while x < b.grille.shape[0]:  # Parcourt les cases vers le bas
-                    res += 1
-                    if b.grille[x][y] != 0:
-                        b.grille[x][y] = 0
-                        ensemble_positions.add((x, y))
-                        ensemble_positions_bateaux.add((x, y))
-                    else:
-                        ensemble_positions.add((x, y))
-                        break
-                    x += 1
-                x, y = position
-                directions[best] = 0
-
-            elif best == 2:  # Vers la gauche (y diminue)
-                y -= 1
-                while y >= 0:  # Parcourt les cases vers la gauche
-                    res += 1
-                    if b.grille[x][y] != 0:
-                        b.grille[x][y] = 0
-                        ensemble_positions.add((x, y))
-                        ensemble_positions_bateaux.add((x, y))
-                    else:
-                        ensemble_positions.add((x, y))
-                        break
-                    y -= 1
-                x, y = position
-                directions[best] = 0
-
-            else:  # Vers le haut (x diminue)
-                x -= 1
-                while x >= 0:  # Parcourt les cases vers le haut
-                    res += 1
-                    if b.grille[x][y] != 0:
-                        b.grille[x][y] = 0
-                        ensemble_positions.add((x, y))
-                        ensemble_positions_bateaux.add((x, y))
-                    else:
-                        ensemble_positions.add((x, y))
-                        break
-                    x -= 1
-                x, y = position
-                directions[best] = 0
+        touches = {} if touches is None else touches
+        x, y = position
+
+        # Directions (droite, bas, gauche, haut) explorées par probabilité décroissante de la case voisine ;
+        # une direction qui sort de la grille ou dont la voisine est de probabilité nulle n'est pas explorée
+        rayons_position = rayons_cases(b.grille.shape)[x][y]
+        poids = [prob[rayon[0]] if rayon else 0 for rayon in rayons_position]
+        ordre = sorted((d for d in range(4) if poids[d] > 0), key=lambda d: -poids[d])
+
+        return self.cibler(b, ensemble_positions, rayons_position, ordre, bateau, ensemble_positions_bateaux, touches)
+
+    def cibler(self, b: Bataille, ensemble_positions: set[tuple[int, int]], rayons_position: tuple, directions, bateau: int = None, ensemble_positions_bateaux: set[tuple[int, int]] = None, touches: dict[int, list[tuple[int, int]]] = None) -> int:
+        """
+        Phase de ciblage commune à 'shout' et 'shoot_probabiliste' : tire le long de chaque direction, dans
+        l'ordre donné, depuis la case voisine de la case touchée jusqu'au premier tir manqué ou au bord de la
+        grille, et s'arrête dès que le bateau visé est coulé.
 
-        return res  # Retourne le nombre total de coups effectués
+        Parameters
+        ----------
+        b : Bataille
+            La partie en cours.
+        ensemble_positions : set[tuple[int, int]]
+            Les positions déjà jouées, complétées au fil des tirs.
+        rayons_position : tuple
+            Les cases de chaque direction depuis la case touchée, lues dans la table précalculée
+            ('rayons_cases(forme)[x][y]').
+        directions : Iterable[int]
+            Les directions à explorer (0 : droite, 1 : bas, 2 : gauche, 3 : haut), dans l'ordre. Un générateur
+            n'est avancé qu'une fois la direction précédente épuisée.
+        bateau : int, optional
+            L'indice du bateau visé. Par défaut, toutes les directions sont explorées.
+        ensemble_positions_bateaux, touches : optional
+            Si 'touches' est fourni, chaque touche est enregistrée par 'enregistrer_touche'.
+
+        Returns
+        -------
+        int :
+            Le nombre de coups effectués.
+        """
+        res = 0
+
+        for direction in directions:
+            for case in rayons_position[direction]:
+                res += 1
+                resultat = b.joue(case)
+                ensemble_positions.add(case)
+                if not resultat:  # Tir manqué : on passe à la direction suivante
+                    break
+                if touches is not None:
+                    self.enregistrer_touche(resultat, case, ensemble_positions_bateaux, touches)
+                if resultat.etat == COULE and resultat.bateau == bateau:  # Le bateau visé est coulé : inutile de continuer
+                    return res
 
+        return res
 
     def jouer_probabiliste_simple(self, b: Bataille) -> int:
         """
         Joue au jeu de la bataille navale en utilisant une approche probabiliste simple.
 
-        Cette fonction génère un tableau de probabilités, et sélectionne la position ayant la plus grande probabilité. 
+        Cette fonction génère un tableau de probabilités (tenu à jour de façon incrémentale par 'CarteProbabilites'),
+        et sélectionne la position ayant la plus grande probabilité. 
         Une fois un bateau touché, l'algorithme tente de le détruire en appelant shout_probabiliste.
         Le processus continue jusqu'à ce que tous les bateaux soient coulés.
 
@@ -543,12 +651,17 @@ class Joueur:
         """
         res: int = 0  # Nombre total de coups effectués
         ensemble_positions: set[tuple[int, int]] = set()  # Ensemble des positions déjà jouées
-        ensemble_positions_bateaux: set[tuple[int, int]] = set()  # Ensemble des positions où des bateaux ont été touchés
+        ensemble_positions_bateaux: set[tuple[int, int]] = set()  # Ensemble des positions où des bateaux ont été touchés (et non coulés)
+        touches: dict[int, list[tuple[int, int]]] = {}  # Cases touchées de chaque bateau
+        carte = CarteProbabilites(self.config, b.grille.shape)  # Carte de probabilités tenue à jour coup après coup
 
         # Tant qu'il reste des bateaux à détruire
         while not b.victoire():
-            # Crée un tableau de probabilités pour les positions à jouer
-            prob = self.create_prob(b.grille.shape, ensemble_positions, ensemble_positions_bateaux)
+            # Bateaux coulés : toutes leurs cases ont été touchées, leurs tailles sont retirées du calcul
+            coules = {bateau for bateau, cases in touches.items() if len(cases) == self.config.taille(bateau)}
+
+            # Met à jour le tableau de probabilités pour les positions à jouer (même résultat que 'create_prob')
+            prob = carte.mettre_a_jour(ensemble_positions, ensemble_positions_bateaux, coules)
             
             # Sélectionne la position ayant la plus grande probabilité
             x, y = self.select_max_prob(prob)
@@ -556,11 +669,10 @@ class Joueur:
             # Joue à la position (x, y)
             i = b.joue((x, y))
 
-            # Si un bateau est touché
-            if i > 0:
+            # Si un bateau est touché : on enregistre la touche, puis on tente de le couler s'il ne l'est pas déjà
+            if i and not self.enregistrer_touche(i, (x, y), ensemble_positions_bateaux, touches):
                 # Tente de détruire le bateau et met à jour le nombre de coups
-                res += self.shoot_probabiliste(b, prob, ensemble_positions, ensemble_positions_bateaux, (x, y))
-                ensemble_positions_bateaux.add((x, y))  # Ajoute la position du bateau touché à l'ensemble
+                res += self.shoot_probabiliste(b, prob, ensemble_positions, ensemble_positions_bateaux, (x, y), i.bateau, touches)
 
             ensemble_positions.add((x, y))  # Ajoute la position jouée à l'ensemble
 
@@ -569,7 +681,320 @@ class Joueur:
 
         return res  # Retourne le nombre total de coups effectués
 
-def estimation_de_la_distribution(N: int, function):
+    # Version probabiliste a posteriori (Monte-Carlo).
+    def jouer_monte_carlo(self, b: Bataille, nb_echantillons: int = 10000, duree_max: float = None, rng: np.random.Generator = None) -> int:
+        """
+        Joue en estimant, avant chaque coup, la probabilité a posteriori que chaque case porte un bateau.
+
+        Des configurations complètes de la flotte, uniformes parmi celles compatibles avec tous les coups joués
+        (cases manquées, cases touchées avec le bateau annoncé, bateaux coulés), sont tirées par
+        'EchantillonneurConditionnel' ; le joueur tire sur la case non jouée recouverte par le plus grand nombre
+        d'entre elles. Contrairement à 'jouer_probabiliste_simple', les bateaux ne sont pas traités indépendamment
+        et les cases touchées sont prises en compte : il n'y a pas de phase de ciblage séparée.
+
+        Parameters
+        ----------
+        b : Bataille
+            Un objet de la classe 'Bataille' qui contient la grille de jeu.
+        nb_echantillons : int, optional
+            Le nombre de configurations tirées avant chaque coup.
+        duree_max : float, optional
+            Le temps maximal (en secondes) de tirage avant chaque coup. Par défaut, aucune limite.
+        rng : np.random.Generator, optional
+            Le générateur aléatoire à utiliser. Par défaut, celui de la partie ('b.tirages.rng').
+
+        Returns
+        -------
+        int :
+            Le nombre total de coups nécessaires pour couler tous les bateaux.
+        """
+        rng = rng if rng is not None else b.tirages.rng
+        res: int = 0  # Nombre total de coups effectués
+        ensemble_positions: set[tuple[int, int]] = set()  # Ensemble des positions déjà jouées
+        touches: dict[int, list[tuple[int, int]]] = {}  # Cases touchées de chaque bateau
+
+        while not b.victoire():
+            # Estimation de la probabilité a posteriori de chaque case
+            echantillonneur = EchantillonneurConditionnel(ensemble_positions, touches, self.config, b.grille.shape)
+            prob, _ = echantillonneur.frequences(nb_echantillons, rng, duree_max)
+
+            # Les cases déjà jouées sont exclues, puis on tire sur la plus probable
+            prob = prob.astype(float)
+            for x, y in ensemble_positions:
+                prob[x, y] = -1
+            x, y = self.select_max_prob(prob)
+
+            i = b.joue((x, y))
+            if i:
+                touches.setdefault(i.bateau, []).append((x, y))
+            ensemble_positions.add((x, y))
+            res += 1
+
+        return res  # Retourne le nombre total de coups effectués
+
+    def jouer_exact(self, b: Bataille) -> int:
+        """
+        Joue en calculant, avant chaque coup, la probabilité a posteriori exacte que chaque case porte un bateau.
+
+        Mêmes règles que 'jouer_monte_carlo', mais toutes les configurations de la flotte compatibles avec
+        les coups joués sont comptées par 'probabilites_exactes' au lieu d'être échantillonnées. Les résultats
+        sont rangés dans la table de transposition du joueur ('self.table'), indexée par l'état observé :
+        les premiers coups, qui se répètent d'une partie à l'autre, ne sont calculés qu'une fois.
+
+        Parameters
+        ----------
+        b : Bataille
+            Un objet de la classe 'Bataille' qui contient la grille de jeu.
+
+        Returns
+        -------
+        int :
+            Le nombre total de coups nécessaires pour couler tous les bateaux.
+        """
+        res: int = 0  # Nombre total de coups effectués
+        ensemble_positions: set[tuple[int, int]] = set()  # Ensemble des positions déjà jouées
+        touches: dict[int, list[tuple[int, int]]] = {}  # Cases touchées de chaque bateau
+
+        while not b.victoire():
+            comptes, _ = probabilites_exactes(ensemble_positions, touches, self.config, b.grille.shape, self.table)
+
+            # Les cases déjà jouées sont exclues, puis on tire sur la plus probable
+            prob = comptes.astype(float)
+            for x, y in ensemble_positions:
+                prob[x, y] = -1
+            x, y = self.select_max_prob(prob)
+
+            i = b.joue((x, y))
+            if i:
+                touches.setdefault(i.bateau, []).append((x, y))
+            ensemble_positions.add((x, y))
+            res += 1
+
+        return res  # Retourne le nombre total de coups effectués
+
+# Simulation par lots : N parties jouées ensemble sur un tableau (N, lignes, colonnes).
+# Chaque itération fait avancer toutes les parties en cours d'une étape par des opérations sur tableaux ;
+# les parties terminées sont masquées. Les lois des coups sont celles des stratégies scalaires, si bien
+# que la distribution du nombre de coups est la même (à l'aléa près, le générateur n'étant pas le même).
+
+DIRECTIONS = np.array([(0, 1), (1, 0), (0, -1), (-1, 0)])  # Droite, bas, gauche, haut (ordre de 'shout')
+
+@lru_cache(maxsize=None)
+def rayons(forme: tuple[int, int]) -> np.array:
+    """
+    Retourne, pour chaque case et chaque direction de 'DIRECTIONS', les cases (x * colonnes + y) rencontrées
+    en s'éloignant de la case, complétées par -1 au-delà du bord. Le tableau est en lecture seule.
+
+    Returns
+    -------
+    np.array
+        Un tableau d'entiers de forme (lignes * colonnes, 4, max(lignes, colonnes)).
+    """
+    lignes, colonnes = forme
+    x, y = np.divmod(np.arange(lignes * colonnes), colonnes)
+    distances = np.arange(1, max(lignes, colonnes) + 1)
+
+    rx = x[:, None, None] + DIRECTIONS[None, :, 0, None] * distances
+    ry = y[:, None, None] + DIRECTIONS[None, :, 1, None] * distances
+    table = np.where((rx >= 0) & (rx < lignes) & (ry >= 0) & (ry < colonnes), rx * colonnes + ry, -1)
+    table.flags.writeable = False
+
+    return table
+
+@lru_cache(maxsize=None)
+def rayons_cases(forme: tuple[int, int]) -> tuple:
+    """
+    Version de 'rayons' pour le jeu case par case : 'rayons_cases(forme)[x][y][d]' est le tuple des cases (i, j)
+    rencontrées depuis (x, y) dans la direction d, jusqu'au bord de la grille (exclu).
+    """
+    colonnes = forme[1]
+    table = rayons(forme)
+
+    return tuple(
+        tuple(tuple(tuple(divmod(int(case), colonnes) for case in rayon if case >= 0) for rayon in table[x * colonnes + y]) for y in range(colonnes))
+        for x in range(forme[0])
+    )
+
+def directions_aleatoires(disponibles: list[bool], tirages: TiragesParLots):
+    """
+    Génère les directions disponibles dans un ordre aléatoire, comme 'shout' : chaque direction est tirée
+    uniformément parmi les quatre ('tirages.entier'), avec rejet des directions indisponibles ou déjà données.
+    La liste 'disponibles' est consommée.
+    """
+    restantes = sum(disponibles)
+    while restantes:
+        direction = tirages.entier(4)
+        while not disponibles[direction]:
+            direction = tirages.entier(4)
+        disponibles[direction] = False
+        restantes -= 1
+        yield direction
+
+def simuler_parties(n: int, strategie: str = 'heuristique', rng: np.random.Generator = None, config: ConfigurationJeu = ConfigurationJeu(), taille_lot: int = 1 << 14) -> np.array:
+    """
+    Joue 'n' parties par lots et retourne le nombre de coups de chacune.
+
+    Parameters
+    ----------
+    n : int
+        Le nombre de parties à jouer.
+    strategie : str, optional
+        'alea' (loi de 'Joueur.jouer_alea') ou 'heuristique' (loi de 'Joueur.jouer_heuristique').
+    rng : np.random.Generator, optional
+        Le générateur aléatoire à utiliser (grilles et coups). Par défaut, un nouveau générateur initialisé par le système.
+    config : ConfigurationJeu, optional
+        La configuration des parties. Par défaut, la configuration standard.
+    taille_lot : int, optional
+        Le nombre de parties jouées simultanément.
+
+    Returns
+    -------
+    np.array
+        Un tableau d'entiers de taille 'n' : le nombre de coups de chaque partie. Sa distribution
+        s'obtient par 'np.bincount'.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    simuler = {'alea': _simuler_alea_lot, 'heuristique': _simuler_heuristique_lot}[strategie]
+    coups = np.empty(n, dtype=np.int64)
+
+    for debut in range(0, n, taille_lot):
+        m = min(taille_lot, n - debut)
+        coups[debut:debut + m] = simuler(generer_grilles_aleatoires(m, rng, config), rng)
+
+    return coups
+
+def _simuler_alea_lot(grilles: np.array, rng: np.random.Generator) -> np.array:
+    """
+    'jouer_alea' tire les cases dans un ordre uniforme, sans remise : la partie s'arrête au rang de la
+    dernière case de bateau dans une permutation aléatoire des cases, ce qui se calcule d'un seul coup.
+    """
+    n = len(grilles)
+    rangs = np.argsort(rng.random((n, grilles[0].size)), axis=1).argsort(axis=1)  # Rang de tir de chaque case
+    rangs[grilles.reshape(n, -1) == 0] = -1  # Les cases vides ne terminent pas la partie
+
+    return rangs.max(axis=1) + 1
+
+@lru_cache(maxsize=None)
+def _rayons_bout_a_bout(forme: tuple[int, int]) -> tuple:
+    """
+    Met bout à bout les quatre rayons de chaque case ('rayons'), sans les -1 : toute case en compte
+    (lignes - 1) + (colonnes - 1). Retourne les cases de chaque séquence, la direction et le début de rayon
+    de chaque position, et la position de la première case de chaque direction (0 pour un rayon vide).
+    """
+    table = rayons(forme)
+    valides = table >= 0
+    cases = len(table)
+
+    sequence = table[valides].reshape(cases, -1)
+    direction = np.broadcast_to(np.arange(4)[:, None], table.shape)[valides].reshape(cases, -1)
+    debut = np.broadcast_to(np.arange(table.shape[2]) == 0, table.shape)[valides].reshape(cases, -1)
+    longueurs = valides.sum(axis=2)
+    premiere = np.where(longueurs > 0, np.cumsum(longueurs, axis=1) - longueurs, 0)
+
+    return sequence, direction, debut, premiere, longueurs > 0
+
+def _simuler_heuristique_lot(grilles: np.array, rng: np.random.Generator) -> np.array:
+    """
+    Joue 'jouer_heuristique' par événements synchronisés : à chaque pas, chaque partie en cours joue d'un coup
+    toute une phase de chasse, jusqu'à la prochaine case de bateau, puis tout le ciblage ('shout') qui la suit.
+
+    La chasse tire les cases dans l'ordre de clés aléatoires uniformes (loi uniforme sur les cases non jouées,
+    comme la version scalaire) : la prochaine case touchée est, parmi les cases de bateau de clé supérieure au
+    seuil de chasse, celle de plus petite clé, qui devient le seuil. Une case est donc jouée si sa clé ne
+    dépasse pas le seuil ; les cases jouées par le ciblage reçoivent la clé -1, et les coups de chasse (clés
+    positives sous le seuil) se comptent une seule fois, en fin de partie.
+
+    Les rayons d'une case ne se recoupent pas et ne dépendent que des cases jouées avant le ciblage : ils sont
+    parcourus ensemble, mis bout à bout ('_rayons_bout_a_bout'). Chaque rayon disponible est tiré jusqu'au
+    premier tir manqué (inclus), une case déjà jouée comptant comme manquée ; les directions sont prises dans
+    un ordre aléatoire, et le ciblage s'arrête au tir qui coule le bateau visé. Les tableaux sont indexés à
+    plat (partie * cases + case), et les parties terminées en sont retirées dès qu'elles en représentent le quart.
+    """
+    n, lignes, colonnes = grilles.shape
+    cases = lignes * colonnes
+    sequence, direction, debut, premiere, non_vides = _rayons_bout_a_bout((lignes, colonnes))
+
+    # Toutes les grilles d'un lot partagent la flotte : cases restantes de chaque bateau
+    grilles = grilles.reshape(n, cases)
+    tailles = np.bincount(grilles[0])
+    tailles[0] = 0
+    nb_bateaux = len(tailles)
+    restantes_bateaux = np.tile(tailles, (n, 1))
+    cellules = (np.flatnonzero(grilles) % cases).reshape(n, -1)  # Cases de bateau de chaque partie
+
+    # Clé de chaque case dans l'ordre de chasse, et clé de la dernière case chassée (seuil)
+    cle = rng.random((n, cases))
+    seuil = np.full(n, -1.)
+    tirs_ciblage = np.zeros(n, dtype=np.int64)
+
+    resultat = np.zeros(n, dtype=np.int64)
+    ids = np.arange(n)  # Indice d'origine des parties conservées dans les tableaux
+    en_cours = np.ones(n, dtype=bool)
+
+    while len(ids):
+        cle_plat, grilles_plat = cle.reshape(-1), grilles.reshape(-1)
+        p = np.flatnonzero(en_cours)
+
+        # Chasse : case de bateau non jouée de plus petite clé
+        base = p * cases
+        cles = cle_plat[base[:, None] + cellules[p]]
+        cles[cles <= seuil[p, None]] = 2.
+        k = cles.argmin(axis=1)
+        case = cellules[p, k]
+        seuil[p] = cles[np.arange(len(p)), k]
+        cible = grilles_plat[base + case]
+        restantes_bateaux[p, cible] -= 1
+
+        # Un bateau touché sans être coulé déclenche le ciblage, vers les directions dont la voisine n'est pas jouée
+        h = restantes_bateaux[p, cible] > 0
+        p, base, case, cible = p[h], base[h], case[h], cible[h]
+        m = len(p)
+        plat = base[:, None] + sequence[case]
+        directions, debuts = direction[case], debut[case]
+        nouvelles = cle_plat[plat] > seuil[p, None]
+        disponibles = non_vides[case] & np.take_along_axis(nouvelles, premiere[case], axis=1)
+
+        # Tirs de chaque rayon disponible : les cases qui ne suivent aucun arrêt (tir manqué) dans leur rayon,
+        # le décompte des arrêts précédents étant ramené à celui du début du rayon
+        bateau = np.where(nouvelles, grilles_plat[plat], 0)
+        arret = bateau == 0
+        avant = np.cumsum(arret, axis=1, dtype=np.int16) - arret
+        tires = (avant == np.maximum.accumulate(np.where(debuts, avant, 0), axis=1)) \
+            & np.take_along_axis(disponibles, directions, axis=1)
+
+        # Ordre aléatoire des directions : un rayon n'est tiré que jusqu'à ce que ses touches sur le bateau visé,
+        # ajoutées à celles des rayons qui le précèdent, atteignent les cases restantes de ce bateau
+        rang = rng.random((m, 4))
+        sur_cible = tires & (bateau == cible[:, None])
+        touches_rayons = np.bincount((np.arange(m)[:, None] * 4 + directions)[sur_cible], minlength=4 * m).reshape(m, 4)
+        precedentes = (touches_rayons[:, None, :] * (rang[:, None, :] < rang[:, :, None])).sum(axis=2)
+        besoin = restantes_bateaux[p, cible][:, None] - precedentes
+        avant = np.cumsum(sur_cible, axis=1, dtype=np.int16) - sur_cible
+        avant -= np.maximum.accumulate(np.where(debuts, avant, 0), axis=1)
+        tires &= avant < np.take_along_axis(besoin, directions, axis=1)
+        tirs_ciblage[p] += np.count_nonzero(tires, axis=1)
+
+        # Mise à jour des cases tirées : touches décomptées, cases nouvellement jouées marquées
+        touches = tires & (bateau > 0)
+        restantes_bateaux -= np.bincount((p[:, None] * nb_bateaux + bateau)[touches],
+                                         minlength=restantes_bateaux.size).reshape(restantes_bateaux.shape)
+        cle_plat[plat[tires & nouvelles]] = -1.
+
+        # Parties terminées : coups de chasse (clés positives sous le seuil) et de ciblage, puis retrait des
+        # tableaux dès qu'elles en représentent le quart
+        en_cours = restantes_bateaux.any(axis=1)
+        if 4 * (len(ids) - np.count_nonzero(en_cours)) >= len(ids):
+            f = np.flatnonzero(~en_cours)
+            jouees = (cle[f] >= 0) & (cle[f] <= seuil[f, None])
+            resultat[ids[f]] = np.count_nonzero(jouees, axis=1) + tirs_ciblage[f]
+
+            ids, grilles, cle, cellules, restantes_bateaux, seuil, tirs_ciblage, en_cours = \
+                ids[en_cours], grilles[en_cours], cle[en_cours], cellules[en_cours], restantes_bateaux[en_cours], \
+                seuil[en_cours], tirs_ciblage[en_cours], en_cours[en_cours]
+
+    return resultat
+
+def estimation_de_la_distribution(N: int, function, config: ConfigurationJeu = ConfigurationJeu(), afficher: bool = True, journal=None, rng: np.random.Generator = None):
     """
     Réalise N simulations de parties aléatoires et calcule la distribution empirique du nombre de coups nécessaires 
     pour couler tous les bateaux. La distribution est retournée sous forme d'un dictionnaire où chaque clé représente 
@@ -581,25 +1006,171 @@ def estimation_de_la_distribution(N: int, function):
         Le nombre de simulations à réaliser.
     function : Bataille-> int 
         Retourne le nombre de coups joués jusqu'à ce que tout les bateaux soient coulés.
+    config : ConfigurationJeu, optional
+        La configuration des parties simulées (celle du joueur). Par défaut, la configuration standard.
+    afficher : bool, optional
+        Affiche l'histogramme à la fin (bloquant). 'False' pour un calcul sans affichage.
+    journal : journal.EcrivainJournal, optional
+        Un journal où enregistrer chaque partie (flotte initiale et coups joués), sous le nom de la stratégie.
+    rng : np.random.Generator, optional
+        Le générateur des parties (grilles et coups aléatoires). Par défaut, 'tirages_defaut'.
     
     Returns
     -------
     dict[int, int] :
         Un dictionnaire associant à chaque nombre de coups joués sa fréquence d'apparition sur les N simulations.
     """
-    b: Bataille = Bataille()  # Initialisation d'une instance du jeu Bataille.
+    # Initialisation d'une instance du jeu Bataille (qui enregistre ses coups si les parties sont journalisées).
+    b: Bataille = (Bataille if journal is None else BatailleEnregistree)(config=config, rng=rng)
     res: dict[int, int] = dict()  # Dictionnaire pour stocker la distribution du nombre de coups joués.
+    strategie = getattr(function, '__name__', str(function))
 
     for i in range(N):
         tmp = function(b)  # Calcul du nombre de coups joués pour cette partie.
         res[tmp] = res.get(tmp, 0) + 1  # Mise à jour de la fréquence pour ce nombre de coups.
+        if journal is not None:
+            journal.ecrire_partie(b.grille_initiale, b.coups, strategie)
         b.reset()  # Réinitialisation de la grille pour une nouvelle partie.
     
-    # Affichage de l'histogramme
-    plt.bar(res.keys(), res.values(), color='blue')
-    plt.xlabel('Nombre de coups joués')
-    plt.ylabel('Fréquence')
-    plt.title(f'Distribution du nombre de coups joués sur {N} simulations')
-    plt.show()
+    if afficher:
+        afficher_distribution(res, N)
 
     return sum(c * val for c, val in res.items()) / N
+
+def estimation_de_la_distribution_lot(N: int, strategie: str = 'heuristique', config: ConfigurationJeu = ConfigurationJeu(), rng: np.random.Generator = None, afficher: bool = True) -> float:
+    """
+    Comme 'estimation_de_la_distribution', avec le simulateur par lots ('simuler_parties') : 'strategie' vaut
+    'alea' ou 'heuristique'. Affiche l'histogramme du nombre de coups (si 'afficher') et retourne sa moyenne.
+    """
+    coups = simuler_parties(N, strategie, rng, config)
+    frequences = np.bincount(coups)
+    res = {int(c): int(f) for c, f in enumerate(frequences) if f}
+
+    if afficher:
+        afficher_distribution(res, N)
+
+    return coups.mean()
+
+def estimation_de_la_distribution_parallele(N: int, function, graine: int = 0, nb_processus: int = None, taille_bloc: int = 10000, config: ConfigurationJeu = ConfigurationJeu()) -> tuple[float, dict[int, int]]:
+    """
+    Version multi-processus et reproductible de 'estimation_de_la_distribution'.
+
+    Les N parties sont découpées en blocs de 'taille_bloc' parties ; le bloc k reçoit sa propre graine, le k-ième
+    enfant de 'np.random.SeedSequence(graine)', et sa propre 'Bataille'. Les blocs sont joués dans un pool de
+    processus, puis leurs histogrammes sont additionnés. Le découpage et les graines ne dépendant que de N,
+    'taille_bloc' et 'graine', le résultat est le même quel que soit le nombre de processus.
+
+    Parameters
+    ----------
+    N : int
+        Le nombre de simulations à réaliser.
+    function : Bataille -> int, ou str
+        Une stratégie (fonction ou méthode d'un 'Joueur', qui doit pouvoir être envoyée à un autre processus),
+        ou le nom d'une stratégie du simulateur par lots ('alea' ou 'heuristique', cf. 'simuler_parties').
+    graine : int, optional
+        La graine de la simulation.
+    nb_processus : int, optional
+        Le nombre de processus du pool. Par défaut, le nombre de cœurs de la machine ; avec 1, les blocs
+        sont joués dans le processus courant.
+    taille_bloc : int, optional
+        Le nombre de parties par bloc.
+    config : ConfigurationJeu, optional
+        La configuration des parties simulées. Par défaut, la configuration standard.
+
+    Returns
+    -------
+    tuple[float, dict[int, int]]
+        Le nombre moyen de coups et l'histogramme (nombre de coups -> fréquence, par nombre de coups croissant).
+    """
+    nb_processus = nb_processus or os.cpu_count() or 1
+    graines = np.random.SeedSequence(graine).spawn(-(-N // taille_bloc))
+    blocs = [(function, min(taille_bloc, N - k * taille_bloc), g, config) for k, g in enumerate(graines)]
+
+    if nb_processus == 1:
+        histogrammes = list(map(_jouer_bloc, blocs))
+    else:
+        with ProcessPoolExecutor(max_workers=nb_processus) as pool:
+            histogrammes = list(pool.map(_jouer_bloc, blocs))
+
+    res = dict(sorted(sum(histogrammes, Counter()).items()))
+
+    return sum(c * val for c, val in res.items()) / N, res
+
+def _jouer_bloc(bloc: tuple) -> Counter:
+    """
+    Joue un bloc de parties dans un processus du pool et retourne l'histogramme du nombre de coups.
+    Toutes les parties du bloc (grilles et coups aléatoires) tirent dans un générateur initialisé par la graine du bloc.
+    """
+    function, nombre, graine, config = bloc
+    rng = np.random.default_rng(graine)
+
+    if isinstance(function, str):
+        return Counter(simuler_parties(nombre, function, rng, config).tolist())
+
+    b = Bataille(config=config, rng=rng)
+    res = Counter()
+    for _ in range(nombre):
+        res[function(b)] += 1
+        b.reset()
+
+    return res
+
+def evaluer_strategie(function, erreur_type_max: float = 0.1, duree_max: float = None, n_max: int = None, config: ConfigurationJeu = ConfigurationJeu(), afficher: bool = False, rng: np.random.Generator = None, taille_lot: int = 4096, rapport=print) -> StatistiquesEnLigne:
+    """
+    Évalue une stratégie en continu ('evaluer_en_continu') : les parties s'enchaînent jusqu'à ce que l'erreur type
+    du nombre moyen de coups passe sous 'erreur_type_max', ou que 'duree_max' secondes ou 'n_max' parties soient
+    atteintes. La moyenne, l'écart type et l'histogramme sont mis à jour à chaque partie, et le débit est
+    rapporté régulièrement.
+
+    Parameters
+    ----------
+    function : Bataille -> int, ou str
+        Une stratégie, ou le nom d'une stratégie du simulateur par lots ('alea' ou 'heuristique'),
+        jouée alors par lots de 'taille_lot' parties.
+    erreur_type_max : float, optional
+        L'erreur type visée pour le nombre moyen de coups ('None' pour ne s'arrêter que sur la durée ou le nombre).
+    duree_max : float, optional
+        Le temps maximal (en secondes).
+    n_max : int, optional
+        Le nombre maximal de parties.
+    config : ConfigurationJeu, optional
+        La configuration des parties simulées. Par défaut, la configuration standard.
+    afficher : bool, optional
+        Affiche l'histogramme une fois l'évaluation terminée (bloquant). Par défaut, aucun affichage.
+    rng : np.random.Generator, optional
+        Le générateur des parties (simulateur par lots, ou grilles et coups aléatoires des parties jouées une à une).
+        Par défaut, un nouveau générateur initialisé par le système (par lots) ou 'tirages_defaut'.
+    taille_lot : int, optional
+        Le nombre de parties par lot du simulateur par lots.
+    rapport : str -> None, optional
+        La fonction qui reçoit les rapports d'avancement ('None' pour ne rien afficher).
+
+    Returns
+    -------
+    StatistiquesEnLigne
+        Les statistiques des parties jouées.
+    """
+    if isinstance(function, str):
+        rng = rng if rng is not None else np.random.default_rng()
+        jouer = lambda: simuler_parties(taille_lot, function, rng, config)
+    else:
+        b = Bataille(config=config, rng=rng)
+
+        def jouer() -> int:
+            coups = function(b)
+            b.reset()
+            return coups
+
+    statistiques = evaluer_en_continu(jouer, erreur_type_max, duree_max, n_max, rapport=rapport)
+
+    if afficher:
+        afficher_distribution(statistiques.histogramme, statistiques.n)
+
+    return statistiques
+
+def afficher_distribution(res: dict[int, int], N: int) -> None:
+    """
+    Affiche l'histogramme d'une distribution du nombre de coups joués sur N simulations.
+    """
+    import graphiques  # Import paresseux : matplotlib n'est chargé qu'au premier tracé
+    graphiques.afficher_distribution(res, N, "nombre de coups joués")
@@ -1,9 +1,9 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import random
 import math
 
-def generate_grid(N: int) -> np.array:
+from mod import StatistiquesEnLigne, evaluer_en_continu, TiragesParLots, tirages_par_lots
+
+def generate_grid(N: int, rng: np.random.Generator | TiragesParLots = None) -> np.array:
     """
     Génère une grille carrée de dimensions N x N remplie de zéros, avec un point unique positionné à 1 
     basé sur une distribution normale centrée autour du milieu de la grille.
@@ -12,6 +12,8 @@ def generate_grid(N: int) -> np.array:
     ----------
     N : int
         Taille de la grille NxN à générer.
+    rng : np.random.Generator | TiragesParLots, optional
+        Le générateur des tirages. Par défaut, 'tirages_defaut'.
 
     Returns
     -------
@@ -21,15 +23,15 @@ def generate_grid(N: int) -> np.array:
         une distribution normale.
     """
 
-    x = int(random.normalvariate(N / 2, 1))
-    y = int(random.normalvariate(N / 2, 1))
+    # Les deux coordonnées sont tirées en un seul appel au générateur
+    x, y = tirages_par_lots(rng).rng.normal(N / 2, 1, size=2).astype(int).tolist()
 
     grid = np.zeros((N, N))
     grid[x][y] = 1
     
     return grid
 
-def generate_random_probability_grid(N: int) -> np.array:
+def generate_random_probability_grid(N: int, rng: np.random.Generator | TiragesParLots = None) -> np.array:
     """
     Génère une grille de probabilités aléatoires de dimensions N x N, où 
     les valeurs au centre de la grille sont plus probables que celles des bords. 
@@ -39,6 +41,7 @@ def generate_random_probability_grid(N: int) -> np.array:
     ----------
         N (int): La taille de la grille à générer. La grille aura la dimension 
                   N x N.
+        rng (np.random.Generator | TiragesParLots, optionnel): Le générateur des tirages. Par défaut, 'tirages_defaut'.
 
     Returns
     -------
@@ -47,7 +50,7 @@ def generate_random_probability_grid(N: int) -> np.array:
     """
 
     # Génération d'une grille de taille N x N avec des valeurs aléatoires
-    grid: np.array = np.random.rand(N, N)
+    grid: np.array = tirages_par_lots(rng).rng.random((N, N))
 
     # Calcule du centre de la grille
     center = (N - 1) // 2
@@ -87,7 +90,7 @@ def maximise(grid: np.array) -> tuple[int, int]:
     """
     return np.unravel_index(np.argmax(grid), (grid.shape))
 
-def check(grid: np.array, position: tuple[int, int], ps) -> bool:
+def check(grid: np.array, position: tuple[int, int], ps, rng: np.random.Generator | TiragesParLots = None) -> bool:
     """
     Vérifie si un capteur détecte correctement un point de la grille (marqué par la valeur 1), avec une probabilité d'exactitude donnée.
 
@@ -103,6 +106,11 @@ def check(grid: np.array, position: tuple[int, int], ps) -> bool:
         La probabilité (entre 0 et 1) que le capteur détecte correctement la présence du point d'intérêt à la position donnée.
         La valeur par défaut est 0.8, ce qui signifie que le capteur détecte correctement dans 80% des cas.
 
+    rng : np.random.Generator | TiragesParLots, optionnel
+        Le générateur des tirages. Un 'np.random.Generator' tire directement un nombre uniforme, sans lot ;
+        'TiragesParLots' le sert depuis un lot pré-tiré, ce qui est préférable pour des appels répétés (voir
+        'scorpion'). Par défaut, 'tirages_defaut'.
+
     Returns
     -------
     bool
@@ -113,14 +121,15 @@ def check(grid: np.array, position: tuple[int, int], ps) -> bool:
     x, y = position
 
     if(grid[x][y] == 1):
-        rand = random.random()
+        # Un générateur simple n'est pas enveloppé : un nouveau lot serait tiré à chaque appel pour un seul nombre
+        rand = rng.random() if isinstance(rng, np.random.Generator) else tirages_par_lots(rng).random()
 
         if(rand < ps):
             return True
     
     return False
 
-def scorpion(grid: np.array, ps: float = 0.8) -> int:
+def scorpion(grid: np.array, ps: float = 0.8, rng: np.random.Generator | TiragesParLots = None) -> int:
     """
     Implémente l'algorithme du scorpion pour optimiser une grille probabiliste.
     
@@ -136,14 +145,19 @@ def scorpion(grid: np.array, ps: float = 0.8) -> int:
     ps : float, optionnel (par défaut = 1.0)
         La probabilité de sélection pour le scorpion. Il influence la mise à jour des probabilités dans la grille.
 
+    rng : np.random.Generator | TiragesParLots, optionnel
+        Le générateur des tirages (grille de probabilités et capteur). Par défaut, 'tirages_defaut'.
+
     Returns
     -------
     int
         Le nombre d'itérations nécessaires pour remplir la condition `check`.
     """
     
+    tirages = tirages_par_lots(rng)
+
     # Génération de la grille de probabilités aléatoires
-    random_probability_grid: np.array = generate_random_probability_grid(grid.shape[0])
+    random_probability_grid: np.array = generate_random_probability_grid(grid.shape[0], tirages)
 
     # Nombre d'itérations
     iterations = 1
@@ -152,7 +166,7 @@ def scorpion(grid: np.array, ps: float = 0.8) -> int:
     x, y = maximise(random_probability_grid)
 
     # Boucle jusqu'à ce que la condition soit remplie
-    while not check(grid, (x, y), ps):
+    while not check(grid, (x, y), ps, tirages):
         pi_k = random_probability_grid[x][y]
 
         # Mise à jour de la probabilité pour la case sélectionnée
@@ -170,7 +184,7 @@ def scorpion(grid: np.array, ps: float = 0.8) -> int:
 
     return iterations
 
-def estimation_de_la_distribution_sco(N: int, p: float):
+def estimation_de_la_distribution_sco(N: int, p: float, afficher: bool = True, rng: np.random.Generator = None):
     """
     Réalise N simulations de parties aléatoires et calcule la distribution empirique du nombre d'itérations nécessaires 
     pour trouver l'objet égaré. La distribution est représentée sous la forme d'un dictionnaire, où chaque clé 
@@ -188,6 +202,10 @@ def estimation_de_la_distribution_sco(N: int, p: float):
         Le nombre de simulations à réaliser.
     p : float
         La précision du senseur.
+    afficher : bool, optional
+        Affiche l'histogramme (bloquant). 'False' pour un calcul sans affichage.
+    rng : np.random.Generator, optional
+        Le générateur des simulations. Par défaut, 'tirages_defaut'.
         
     Returns
     -------
@@ -195,17 +213,14 @@ def estimation_de_la_distribution_sco(N: int, p: float):
         Les résultats (moyenne et écart-type) sont affichés à l'écran.
     """
     res = {}
+    tirages = tirages_par_lots(rng)
     for i in range(N):
-        grid = generate_grid(10)
-        tmp = scorpion(grid, p)  # Calcul du nombre de coups joués pour cette partie.
+        grid = generate_grid(10, tirages)
+        tmp = scorpion(grid, p, tirages)  # Calcul du nombre de coups joués pour cette partie.
         res[tmp] = res.get(tmp, 0) + 1  # Mise à jour de la fréquence pour ce nombre de coups.
 
-    # Affichage de l'histogramme
-    plt.bar(res.keys(), res.values(), color='blue')
-    plt.xlabel('Nombre d\'itérations')
-    plt.ylabel('Fréquence')
-    plt.title(f'Distribution du nombre d\'itérations sur {N} simulations')
-    plt.show()
+    if afficher:
+        afficher_distribution_sco(res, N)
 
     # Calcul de la somme des fréquences
     total_freq = sum(res.values())
@@ -221,3 +236,48 @@ def estimation_de_la_distribution_sco(N: int, p: float):
     print("Moyenne :", mean)
     print("Écart-type :", std_dev)
 
+
+def evaluer_sco(p: float, erreur_type_max: float = 0.1, duree_max: float = None, n_max: int = None, N: int = 10, afficher: bool = False, rapport=print, rng: np.random.Generator = None) -> StatistiquesEnLigne:
+    """
+    Évalue l'algorithme du scorpion en continu ('evaluer_en_continu') : les simulations s'enchaînent jusqu'à ce que
+    l'erreur type du nombre moyen d'itérations passe sous 'erreur_type_max', ou que 'duree_max' secondes ou
+    'n_max' simulations soient atteintes.
+
+    Parameters
+    ----------
+    p : float
+        La précision du senseur.
+    erreur_type_max : float, optional
+        L'erreur type visée pour le nombre moyen d'itérations.
+    duree_max : float, optional
+        Le temps maximal (en secondes).
+    n_max : int, optional
+        Le nombre maximal de simulations.
+    N : int, optional
+        La taille de la grille NxN.
+    afficher : bool, optional
+        Affiche l'histogramme une fois l'évaluation terminée (bloquant). Par défaut, aucun affichage.
+    rapport : str -> None, optional
+        La fonction qui reçoit les rapports d'avancement ('None' pour ne rien afficher).
+    rng : np.random.Generator, optional
+        Le générateur des simulations. Par défaut, 'tirages_defaut'.
+
+    Returns
+    -------
+    StatistiquesEnLigne
+        Les statistiques des simulations.
+    """
+    tirages = tirages_par_lots(rng)
+    statistiques = evaluer_en_continu(lambda: scorpion(generate_grid(N, tirages), p, tirages), erreur_type_max, duree_max, n_max, rapport=rapport)
+
+    if afficher:
+        afficher_distribution_sco(statistiques.histogramme, statistiques.n)
+
+    return statistiques
+
+def afficher_distribution_sco(res: dict[int, int], N: int) -> None:
+    """
+    Affiche l'histogramme d'une distribution du nombre d'itérations sur N simulations.
+    """
+    import graphiques  # Import paresseux : matplotlib n'est chargé qu'au premier tracé
+    graphiques.afficher_distribution(res, N, "nombre d'itérations")
@@ -0,0 +1,196 @@
+# Les imports
+import os
+import tempfile
+import numpy as np
+
+from mod import generer_grille_aleatoire, compter_placements_bateaux, compter_placements_bateaux_force_brute, \
+    tableau_placements, tirages_defaut, ConfigurationJeu, probabilites_exactes, StatistiquesEnLigne
+from prob import Bataille, Joueur, CarteProbabilites, simuler_parties, estimation_de_la_distribution, estimation_de_la_distribution_parallele
+from journal import EcrivainJournal, Journal
+from bench import create_prob_naif, temps_import
+
+# Tests de non-régression (python -m pytest). Les mesures de performance sont dans 'bench.py'.
+
+def test_compter_placements_bateaux():
+    """
+    Le moteur par programmation dynamique doit retrouver exactement les résultats de l'énumération récursive
+    sur tous les cas que celle-ci peut traiter (grilles vides ou partiellement occupées, bateaux de même
+    taille, grilles non carrées).
+    """
+    tirages_defaut.initialiser(0)
+    listes = [[1], [5], [1, 2], [2, 3], [1, 1], [4, 5], [1, 2, 3], [5, 4, 3]]
+
+    grilles = [np.zeros((10, 10)), np.zeros((6, 9)), np.zeros((9, 4))]
+    grille = generer_grille_aleatoire()
+    grille[:, ::2] = 0  # Grille partiellement occupée
+    grilles.append(grille)
+
+    for grille in grilles:
+        for liste in listes:
+            attendu = compter_placements_bateaux_force_brute(liste, grille)
+            obtenu = compter_placements_bateaux(liste, grille)
+            assert obtenu == attendu, f"{liste} sur {grille.shape} : {obtenu} au lieu de {attendu}"
+
+def test_carte_probabilites(nombre: int = 20, config: ConfigurationJeu = ConfigurationJeu()):
+    """
+    Des parties de 'jouer_probabiliste_simple' sont rejouées en calculant, avant chaque coup, la carte
+    incrémentale de 'CarteProbabilites' et celle de 'create_prob', qui doivent être identiques.
+    """
+    tirages_defaut.initialiser(0)
+    joueur = Joueur(config)
+
+    for _ in range(nombre):
+        b = Bataille(config=config)
+        ensemble_positions, ensemble_positions_bateaux, touches = set(), set(), {}
+        carte = CarteProbabilites(config, b.grille.shape)
+
+        while not b.victoire():
+            coules = {bateau for bateau, cases in touches.items() if len(cases) == config.taille(bateau)}
+            prob = carte.mettre_a_jour(ensemble_positions, ensemble_positions_bateaux, coules)
+            reference = joueur.create_prob(b.grille.shape, ensemble_positions, ensemble_positions_bateaux, coules)
+            assert np.array_equal(prob, reference), "La carte incrémentale diffère de 'create_prob'"
+
+            x, y = joueur.select_max_prob(prob)
+            i = b.joue((x, y))
+            if i and not joueur.enregistrer_touche(i, (x, y), ensemble_positions_bateaux, touches):
+                joueur.shoot_probabiliste(b, prob, ensemble_positions, ensemble_positions_bateaux, (x, y), i.bateau, touches)
+            ensemble_positions.add((x, y))
+
+def test_create_prob(nombre: int = 200):
+    """
+    Le noyau vectorisé de 'create_prob' doit retrouver exactement la carte de 'create_prob_naif', sur des
+    ensembles de coups aléatoires (manqués, touchés, bateaux coulés) et sur des grilles et flottes de formes variées.
+    """
+    rng = np.random.default_rng(0)
+    configurations = [ConfigurationJeu(), ConfigurationJeu((7, 13), (1, 2, 2, 6)), ConfigurationJeu((15, 4), (3, 4, 5))]
+
+    for k in range(nombre):
+        config = configurations[k % len(configurations)]
+        joueur = Joueur(config)
+        lignes, colonnes = config.forme
+
+        cases = [(int(i), int(j)) for i, j in zip(rng.integers(lignes, size=lignes * colonnes // 2), rng.integers(colonnes, size=lignes * colonnes // 2))]
+        ensemble_positions = set(cases[:rng.integers(len(cases) + 1)])
+        ensemble_positions_bateaux = {case for case in ensemble_positions if rng.random() < 0.3}
+        coules = {bateau for bateau in config.bateaux if rng.random() < 0.2}
+
+        attendu = create_prob_naif(joueur, config.forme, ensemble_positions, ensemble_positions_bateaux, coules)
+        obtenu = joueur.create_prob(config.forme, ensemble_positions, ensemble_positions_bateaux, coules)
+        assert np.array_equal(obtenu, attendu), f"create_prob diffère de la référence sur {config}"
+
+def test_probabilites_exactes(nombre: int = 30, config: ConfigurationJeu = ConfigurationJeu((6, 6), (2, 3, 3, 4))):
+    """
+    Les deux méthodes de 'probabilites_exactes' (énumération sur masques de bits et profil restreint) doivent
+    donner les mêmes comptes sur des états de parties tirés au hasard, et le total sur la grille vide doit être
+    celui de 'compter_placements_bateaux'.
+    """
+    tirages_defaut.initialiser(0)
+    rng = np.random.default_rng(0)
+    cases = [(x, y) for x in range(config.forme[0]) for y in range(config.forme[1])]
+
+    for _ in range(nombre):
+        grille = np.asarray(generer_grille_aleatoire(config=config))
+        jouees, touches = set(), {}
+        for k in rng.permutation(len(cases))[:rng.integers(len(cases) // 2)]:
+            x, y = cases[k]
+            jouees.add((x, y))
+            if grille[x, y]:
+                touches.setdefault(int(grille[x, y]), []).append((x, y))
+
+        enumeres, total_enumere = probabilites_exactes(jouees, touches, config, seuil_enumeration=1 << 62)
+        profil, total_profil = probabilites_exactes(jouees, touches, config, seuil_enumeration=0)
+        assert total_enumere == total_profil and np.array_equal(enumeres, profil)
+
+    _, total = probabilites_exactes(set(), {}, config, seuil_enumeration=0)
+    assert total == compter_placements_bateaux(list(config.bateaux), config=config)
+
+def test_simulation_lot(nombre: int = 2000):
+    """
+    La distribution du nombre de coups du simulateur par lots doit être celle des stratégies scalaires
+    (test de Kolmogorov-Smirnov à deux échantillons, seuil 0,1 %).
+    """
+    tirages_defaut.initialiser(0)
+    rng = np.random.default_rng(0)
+    joueur = Joueur()
+    partie = Bataille()
+
+    for strategie, jouer in (('alea', joueur.jouer_alea), ('heuristique', joueur.jouer_heuristique)):
+        scalaires = []
+        for _ in range(nombre):
+            scalaires.append(jouer(partie))
+            partie.reset()
+        lot = simuler_parties(50 * nombre, strategie, rng)
+
+        # Écart maximal entre les deux fonctions de répartition empiriques
+        bornes = np.arange(max(max(scalaires), lot.max()) + 1)
+        ecart = np.abs(np.searchsorted(np.sort(scalaires), bornes, side='right') / nombre
+                       - np.searchsorted(np.sort(lot), bornes, side='right') / len(lot)).max()
+        assert ecart < 1.95 * np.sqrt((nombre + len(lot)) / (nombre * len(lot))), strategie
+
+def test_estimation_parallele(nombre: int = 2000):
+    """
+    'estimation_de_la_distribution_parallele' doit donner le même histogramme avec 1, 2 ou 3 processus,
+    pour une stratégie scalaire comme pour le simulateur par lots.
+    """
+    joueur = Joueur()
+    for strategie in (joueur.jouer_heuristique, 'heuristique'):
+        resultats = [estimation_de_la_distribution_parallele(nombre, strategie, 0, nb_processus=p, taille_bloc=nombre // 4)
+                     for p in (1, 2, 3)]
+        assert all(resultat == resultats[0] for resultat in resultats)
+
+def test_statistiques_en_ligne(nombre: int = 10000):
+    """
+    'StatistiquesEnLigne' (valeur par valeur ou par lots) doit retrouver la moyenne, la variance et
+    l'histogramme calculés sur toutes les valeurs.
+    """
+    valeurs = np.random.default_rng(0).integers(17, 100, size=nombre)
+    une_a_une, par_lots = StatistiquesEnLigne(), StatistiquesEnLigne()
+    for valeur in valeurs.tolist():
+        une_a_une.ajouter(valeur)
+    for lot in np.array_split(valeurs, 7):
+        par_lots.ajouter_lot(lot)
+
+    for statistiques in (une_a_une, par_lots):
+        assert statistiques.n == nombre and statistiques.histogramme == dict(zip(*np.unique(valeurs, return_counts=True)))
+        assert np.isclose(statistiques.moyenne, valeurs.mean()) and np.isclose(statistiques.variance, valeurs.var(ddof=1))
+
+def test_journal(nombre: int = 200):
+    """
+    Un journal écrit par 'estimation_de_la_distribution' doit se relire à l'identique : histogramme de chaque
+    stratégie, et issues des coups recalculées par 'Journal.etats' égales à celles d'une partie rejouée.
+    """
+    tirages_defaut.initialiser(0)
+    joueur = Joueur()
+    moyennes = {}
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, 'parties.bin')
+        with EcrivainJournal(chemin, taille_tampon=64) as ecrivain:
+            for strategie in (joueur.jouer_alea, joueur.jouer_heuristique, joueur.jouer_probabiliste_simple):
+                moyennes[strategie.__name__] = estimation_de_la_distribution(nombre, strategie, afficher=False, journal=ecrivain)
+
+        journal = Journal(chemin)
+        assert len(journal) == 3 * nombre and journal.strategies == list(moyennes)
+        for nom, moyenne in moyennes.items():
+            assert np.isclose(journal.comparer_strategies()[nom]['moyenne'], moyenne)
+
+        etats, premiers = journal.etats(), journal.premiers_touches()
+        colonnes = journal.config.forme[1]
+        for i in range(0, len(journal), 11):
+            grille = np.zeros(journal.config.forme)
+            for k, (indice_bateau, taille) in enumerate(journal.config.bateaux.items()):
+                grille.flat[tableau_placements(journal.config.forme, taille)[journal.placements[i, k]]] = indice_bateau
+            b = Bataille(grille)
+
+            rejoues = [b.joue(divmod(int(case), colonnes)).etat for case in journal.coups[i, :journal.nb_coups[i]]]
+            assert b.victoire() and rejoues == etats[i, :len(rejoues)].tolist() and (etats[i, len(rejoues):] == -1).all()
+            assert premiers[i] == next(k for k, etat in enumerate(rejoues) if etat) + 1
+        del journal, etats  # Libère le fichier projeté avant la suppression du dossier
+
+def test_temps_import(budget: float = 0.5):
+    """
+    L'import à froid de 'main', 'prob' et 'sco' doit tenir dans 'budget' secondes, sans charger matplotlib.
+    """
+    for module in ('main', 'prob', 'sco'):
+        duree, charges = temps_import(module)
+        assert not any(nom.split('.')[0] == 'matplotlib' for nom in charges), f"{module} charge matplotlib"
+        assert duree <= budget, f"{module} : {duree:.3f} s d'import"